@@ -1,21 +1,50 @@
 import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
-import google.generativeai as genai
-from pydantic import BaseModel
+import sys
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 import os
 from dotenv import load_dotenv
 
+from llm_backends import create_llm_backend
+from analysis_jobs import AnalysisJobQueue
+from document_store import DocumentStore
+from llm_executor import LLMExecutor
+from llm_resilience import ResilientBackend
+from llm_scheduler import LLMOverloaded, LLMScheduler
+from metrics import (
+    FALLBACKS_TOTAL, REPLAYED_TURNS_TOTAL, RESPONSE_CACHE_TOTAL, SESSION_RESUMES_TOTAL, SESSION_TOKENS, TURN_SCORES_TOTAL, TOKENS_TOTAL,
+    Trace, current_trace, estimate_tokens, observe, span,
+)
+from session_records import Turn
+from session_store import create_session_store
+from speculation import Speculation, SpeculationManager
+from turn_scoring import add_to_totals, aggregate_scores, build_scoring_prompt, compose_feedback, parse_turn_score, score_schema
+
+# NumPy, SQLAlchemy 를 쓰는 모듈은 import 가 느려 InterviewOrchestrator() 생성 시점에 가져옴
+# (backend_api_lite 를 import 만 하는 테스트 수집, 워커 기동이 빨라지도록)
+if TYPE_CHECKING:
+    from response_cache import CacheLookup
+
 # 환경 변수 로드
 load_dotenv()
 
+# 대화 요약, 답변 채점, 면접 분석 등 사용자 요청이 아닌 LLM 호출의 스케줄러 사용자 ID
+BACKGROUND_USER = "__background__"
+
 class UploadedFile(BaseModel):
-    id: Optional[str] = None
+    id: Optional[str] = None  # POST /api/interview/files 가 돌려준 파일 ID
     name: str
-    type: str
-    content: str
-    size: int
+    type: str = ""
+    size: int = 0
+    chars: int = 0  # 추출된 텍스트 길이
+    preview: str = ""  # 추출된 텍스트 앞부분
+    content: Optional[str] = None  # (호환용) 본문에 직접 담은 파일 내용 - 저장 시 문서로 옮기고 비움
 
 class InterviewProfile(BaseModel):
     id: Optional[str] = None
@@ -26,6 +55,7 @@ class InterviewProfile(BaseModel):
     additionalStyle: str  # 추가 요청사항
     uploadedFiles: List[UploadedFile] = []
     difficulty: Optional[str] = None  # 면접 난이도 ('elementary', 'middle', 'high', 'professional', 'public')
+    responseCache: bool = False  # 반복 연습 모드 - 비슷한 답변에는 저장된 면접관 응답 재사용
     createdAt: Optional[datetime] = None
 
 class InterviewSession(BaseModel):
@@ -33,16 +63,49 @@ class InterviewSession(BaseModel):
     user_id: str
     interview_type: str
     stage: str = "opening"
-    conversation_history: List[Dict] = []
+    conversation_history: List[Turn] = []  # 저장 형식은 턴마다 [역할, 내용, 시각(epoch 초)]
     user_profile: Dict = {}
-    personalized_profile: Optional[Dict] = None
-    gemini_chat: Optional[Any] = None  # Gemini chat session
-    created_at: datetime = datetime.now()
+    profile_key: Optional[str] = None  # 공유 개인화 프로필 키 (세션 저장소의 attach_profile 로 연결)
+    context_summary: str = ""  # 컨텍스트 창 밖으로 밀려난 이전 대화의 요약
+    summarized_exchanges: int = 0  # context_summary 에 반영된 질의응답 수
+    tokens_in: int = 0  # LLM 입력 토큰 누적 (추정치)
+    tokens_out: int = 0  # LLM 출력 토큰 누적 (추정치)
+    trace_enabled: bool = False  # 턴별 단계 소요 시간을 {TRACE_DIR}/{session_id}.jsonl 에 기록
+    turn_scores: List[Dict] = []  # 답변별 채점 결과 {"turn": 답변 순서, "scores": {영역: 점수}, "comment": 평}
+    score_totals: Dict[str, List[float]] = {}  # 평가 영역별 누적 [합계, 채점 수]
+    scored_answers: int = 0  # 채점을 마친 (질문, 답변) 쌍 수
+    created_at: datetime = Field(default_factory=datetime.now)
+    
+    # 같은 내용의 세션끼리 공유하는 프로필 dict (저장하지 않음 - 수정 금지)
+    _profile: Optional[Dict] = PrivateAttr(default=None)
+    
+    @field_validator("interview_type", "stage")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        # 몇 가지 값만 반복되므로 세션마다 문자열을 따로 두지 않음
+        return sys.intern(value)
+    
+    @property
+    def personalized_profile(self) -> Optional[Dict]:
+        return self._profile
+    
+    def attach_profile(self, profile_key: str, profile: Dict):
+        self.profile_key = profile_key
+        self._profile = profile
 
 class PersonalizedPromptManager:
     """개인화된 프롬프트 관리자 - Gemini 최적화"""
     
-    def __init__(self):
+    def __init__(self, cache_size: Optional[int] = None):
+        # 평가 영역이 정해지지 않은 면접 유형(other, quiz 등)의 채점 기준
+        self.default_focus_areas = ["논리성", "구체성", "의사소통", "자기주도성"]
+        
+        # 렌더링된 프롬프트 캐시 (프로필 내용 해시 -> 프롬프트, LRU)
+        self.cache_size = cache_size or int(os.getenv('PROMPT_CACHE_SIZE', 512))
+        self._prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         # 난이도별 가이드라인
         self.difficulty_guidelines = {
             "elementary": {
@@ -152,22 +215,215 @@ class PersonalizedPromptManager:
                 "focus_areas": ["전공적합성", "학업계획", "자기주도성", "사회적책임감"]
             }
         }
+        
+        # LLM 호출이 재시도 후에도 실패했을 때 쓰는 기본 질문 (유형/난이도별, 면접 흐름 순서)
+        self.fallback_questions = {
+            "gifted_center": {
+                "elementary": [
+                    "방금 이야기한 것 중에서 제일 재미있었던 부분은 뭐였어요? 왜 재미있었는지도 알려줄래요?",
+                    "궁금한 게 생겼을 때 스스로 답을 찾아본 적이 있나요? 어떻게 찾아봤는지 이야기해줄래요?",
+                    "만약 그 실험이나 관찰을 다시 한다면 무엇을 바꿔보고 싶어요?",
+                    "친구들과 함께 무언가를 만들거나 해결해 본 경험이 있나요? 그때 어떤 역할을 했어요?",
+                    "영재교육원에서 꼭 해보고 싶은 탐구나 활동이 있다면 무엇인가요?",
+                ],
+                "default": [
+                    "방금 말씀하신 내용에서 가장 흥미롭게 느낀 점과 그 이유를 조금 더 설명해주시겠어요?",
+                    "그 궁금증을 해결하기 위해 스스로 어떤 방법을 시도했는지 구체적으로 말씀해주세요.",
+                    "같은 문제를 전혀 다른 방법으로 접근한다면 어떻게 해볼 수 있을까요?",
+                    "탐구 과정에서 예상과 다른 결과가 나왔던 경험이 있나요? 그때 어떻게 대처했나요?",
+                    "영재교육원에서 탐구해보고 싶은 주제와 그 이유를 말씀해주세요.",
+                ],
+            },
+            "science_high": {
+                "elementary": [
+                    "방금 말한 내용을 과학적으로 설명해본다면 어떻게 말할 수 있을까요?",
+                    "가장 좋아하는 과학 실험이나 수학 문제가 있나요? 어떤 점이 좋았어요?",
+                    "실험 결과가 생각과 다르게 나온 적이 있나요? 그때 어떻게 했어요?",
+                    "과학고에 가면 어떤 공부를 가장 해보고 싶어요?",
+                ],
+                "default": [
+                    "방금 말씀하신 내용의 과학적 원리를 조금 더 깊이 설명해주시겠어요?",
+                    "그 탐구에서 가설을 어떻게 세우고 검증했는지 구체적으로 말씀해주세요.",
+                    "실험이나 문제 풀이에서 오류를 발견하고 수정했던 경험이 있다면 소개해주세요.",
+                    "수학적 사고가 과학 탐구에 도움이 되었던 사례를 들어주시겠어요?",
+                    "과학고 진학 후 연구하고 싶은 주제와 이를 위한 준비 과정을 말씀해주세요.",
+                ],
+            },
+            "university": {
+                "default": [
+                    "방금 말씀하신 경험이 지원 전공에 대한 관심으로 어떻게 이어졌는지 구체적으로 설명해주세요.",
+                    "그 과정에서 스스로 찾아서 공부한 내용이나 읽은 자료가 있다면 소개해주시겠어요?",
+                    "전공 분야에서 최근 관심 있게 본 이슈와 그에 대한 본인의 생각을 말씀해주세요.",
+                    "팀 활동에서 의견 충돌이 있었던 경험과 이를 해결한 방법을 말씀해주세요.",
+                    "입학 후 학업 계획과 졸업 이후의 진로 목표를 구체적으로 말씀해주세요.",
+                ],
+            },
+            "other": {
+                "elementary": [
+                    "방금 이야기한 것을 조금 더 자세히 들려줄 수 있어요?",
+                    "그때 어떤 생각이 들었는지 말해줄래요?",
+                    "그 경험에서 새롭게 알게 된 점은 무엇인가요?",
+                    "앞으로 꼭 해보고 싶은 일이 있다면 무엇인가요?",
+                ],
+                "default": [
+                    "좀 더 구체적인 예시를 들어주실 수 있을까요?",
+                    "그 경험에서 가장 중요하게 배운 점은 무엇인가요?",
+                    "어려움을 겪었던 순간과 그것을 극복한 방법을 말씀해주세요.",
+                    "본인의 강점이 잘 드러났던 경험을 하나 소개해주시겠어요?",
+                    "앞으로의 계획이나 목표에 대해 말씀해주세요.",
+                ],
+                "professional": [
+                    "방금 말씀하신 프로젝트에서 본인이 맡은 역할과 성과를 수치나 사례로 설명해주시겠어요?",
+                    "업무 중 예상치 못한 문제가 생겼을 때 어떻게 원인을 찾고 해결했는지 말씀해주세요.",
+                    "이해관계가 다른 동료나 부서와 협업했던 경험을 소개해주세요.",
+                    "그 경험을 지원하신 직무에 어떻게 적용할 수 있을지 말씀해주세요.",
+                    "앞으로 전문성을 키우기 위한 계획을 말씀해주세요.",
+                ],
+                "public": [
+                    "방금 말씀하신 내용을 공공의 이익이라는 관점에서 다시 설명해주시겠어요?",
+                    "원칙과 현실 사이에서 판단해야 했던 경험이 있다면 말씀해주세요.",
+                    "정책이나 제도가 시민에게 미치는 영향을 고려했던 사례를 들어주시겠어요?",
+                    "다양한 이해관계자의 의견이 충돌할 때 어떻게 조정하시겠습니까?",
+                    "공직자로서 지키고 싶은 가치와 그 이유를 말씀해주세요.",
+                ],
+            },
+        }
+        self.closing_fallback = {
+            "elementary": "마지막으로 더 하고 싶은 이야기가 있으면 편하게 말해주세요!",
+            "default": "마지막으로 하고 싶은 말씀이 있다면 자유롭게 해주세요.",
+        }
+    
+    def get_fallback_question(self, interview_type: str, difficulty: Optional[str], asked: List[str]) -> str:
+        """유형/난이도에 맞는 기본 질문 중 아직 하지 않은 첫 질문 (모두 했으면 마무리 질문)"""
+        difficulty = difficulty or "high"
+        bank = self.fallback_questions.get(interview_type, self.fallback_questions["other"])
+        questions = bank.get(difficulty)
+        if questions is None:
+            questions = self.fallback_questions["other"]["elementary"] if difficulty == "elementary" else bank["default"]
+        
+        # 질문 -> 마지막으로 한 순서
+        last_asked = {question: index for index, question in enumerate(asked)}
+        for question in questions:
+            if question not in last_asked:
+                return question
+        closing = self.closing_fallback["elementary" if difficulty == "elementary" else "default"]
+        if closing not in last_asked:
+            return closing
+        # 기본 질문을 모두 썼으면 가장 오래전에 한 질문부터 다시 사용
+        return min(questions, key=last_asked.get)
+    
+    def get_focus_areas(self, interview_type: str) -> List[str]:
+        """면접 유형별 답변 채점 영역"""
+        return self.base_prompts.get(interview_type, {}).get("focus_areas") or self.default_focus_areas
     
     def generate_personalized_system_prompt(self, profile: InterviewProfile) -> str:
-        """개인화된 시스템 프롬프트 생성"""
-        base_prompt = self.base_prompts.get(profile.type, {}).get("system", "")
+        """개인화된 시스템 프롬프트 생성 (같은 내용의 프로필이면 캐시 사용)"""
+        key = self._cache_key(
+            "system", profile.type, profile.difficulty or "", profile.institution,
+            *profile.fields, "|", *profile.keywords, "|", profile.additionalStyle,
+            *(f"{file.name}\x1f{file.preview}" for file in profile.uploadedFiles)
+        )
+        return self._cached(key, self._render_system_prompt, profile)
+    
+    def generate_opening_question(self, profile: InterviewProfile) -> str:
+        """개인화된 오프닝 질문 생성 (기관/유형/난이도가 같으면 캐시 사용)"""
+        key = self._cache_key("opening", profile.type, profile.difficulty or "", profile.institution)
+        return self._cached(key, self._render_opening_question, profile)
+    
+    def precompile(self, profile: InterviewProfile):
+        """프로필 저장 시점에 프롬프트를 미리 렌더링해 캐시에 적재"""
+        self.generate_personalization(profile)
+        self.generate_personalized_system_prompt(profile)
+        self.generate_opening_question(profile)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """프롬프트 캐시 적중/실패 통계"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._prompt_cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total, 4) if total else 0.0
+        }
+    
+    def _cache_key(self, *parts: str) -> str:
+        """프롬프트에 영향을 주는 값들로 만든 내용 해시"""
+        return hashlib.sha256("\x1e".join(parts).encode("utf-8")).hexdigest()
+    
+    def _cached(self, key: str, render, profile: InterviewProfile) -> str:
+        """캐시 조회 후 없으면 렌더링해서 저장 (가장 오래 안 쓴 항목부터 제거)"""
+        prompt = self._prompt_cache.get(key)
+        if prompt is not None:
+            self.cache_hits += 1
+            self._prompt_cache.move_to_end(key)
+            return prompt
+        
+        self.cache_misses += 1
+        prompt = render(profile)
+        self._prompt_cache[key] = prompt
+        if len(self._prompt_cache) > self.cache_size:
+            self._prompt_cache.popitem(last=False)
+        return prompt
+    
+    def generate_static_prefix(self, interview_type: str, difficulty: Optional[str]) -> str:
+        """면접 유형/난이도별 고정 프롬프트 (지원자마다 달라지지 않는 부분)
+        
+        같은 (유형, 난이도)의 모든 세션이 공유하므로 system instruction 으로 한 번만
+        등록해 두고 재사용합니다. 템플릿이 바뀌면 텍스트 해시도 바뀌어 새로 등록됩니다.
+        """
+        base_prompt = self.base_prompts.get(interview_type, {}).get("system", "")
         
         # 난이도별 가이드라인 추가
-        difficulty = profile.difficulty or "high"  # 기본값: 고등 수준
+        difficulty = difficulty or "high"  # 기본값: 고등 수준
         difficulty_guide = self.difficulty_guidelines.get(difficulty, self.difficulty_guidelines["high"])
         
+        guidelines = f"""
+        
+        === 난이도별 면접 가이드라인 ===
+        **면접 난이도:** {difficulty_guide['level']}
+        **언어 사용:** {difficulty_guide['language']}
+        **내용 복잡도:** {difficulty_guide['complexity']}
+        **상호작용 방식:** {difficulty_guide['interaction']}
+        **질문 예시 수준:** {difficulty_guide['examples']}
+        
+        === 면접 진행 가이드라인 ===
+        1. **개인화 반영**: 개인화 정보를 바탕으로 맞춤형 질문 진행
+        2. **난이도 조절**: 위 난이도 설정에 맞춰 질문의 수준과 언어를 조절
+        3. **자연스러운 키워드 활용**: 억지로 언급하지 말고 대화 흐름에 맞게만 활용
+        4. **멀티턴 대화**: 이전 답변을 기억하고 자연스럽게 이어가기
+        5. **적절한 피드백**: "좋은 답변이네요", "흥미롭군요" 등으로 격려
+        6. **깊이 있는 탐구**: 표면적 답변에서 더 깊은 사고로 유도
+        7. **자연스러운 마무리**: 적절한 시점에서 면접 종료 신호
+        
+        **중요**: 매번 답변을 듣고 나서 해당 답변에 대한 간단한 피드백을 준 후, 
+        설정된 난이도 수준에 맞는 언어와 내용으로 자연스럽게 후속 질문을 이어가세요.
+        키워드는 참고사항일 뿐, 무조건 언급할 필요는 없습니다.
+        """
+        
+        return base_prompt + guidelines
+    
+    def generate_personalization(self, profile: InterviewProfile) -> str:
+        """지원자별 개인화 정보 (고정 프롬프트와 분리된 부분, 캐시 사용)"""
+        key = self._cache_key(
+            "personalization", profile.institution,
+            *profile.fields, "|", *profile.keywords, "|", profile.additionalStyle,
+            *(f"{file.name}\x1f{file.preview}" for file in profile.uploadedFiles)
+        )
+        return self._cached(key, self._render_personalization, profile)
+    
+    def _render_system_prompt(self, profile: InterviewProfile) -> str:
+        """개인화된 시스템 프롬프트 렌더링 (고정 프롬프트 + 개인화 정보)"""
+        return self.generate_static_prefix(profile.type, profile.difficulty) + self.generate_personalization(profile)
+    
+    def _render_personalization(self, profile: InterviewProfile) -> str:
+        """개인화 정보 렌더링"""
         # 업로드 파일 정보 요약
         file_info = ""
         if profile.uploadedFiles:
             file_summaries = []
             for file in profile.uploadedFiles:
-                content_preview = file.content[:200] + "..." if len(file.content) > 200 else file.content
-                file_summaries.append(f"- {file.name}: {content_preview}")
+                file_summaries.append(f"- {file.name}: {file.preview}")
             file_info = f"""
             **업로드된 자료:** 
             {chr(10).join(file_summaries)}
@@ -190,7 +446,7 @@ class PersonalizedPromptManager:
         - 모든 키워드를 다룰 필요 없음, 대화 흐름에 맞는 것만 선택적 활용
             """
         
-        personalization = f"""
+        return f"""
         
         === 개인화 정보 ===
         **지원 기관:** {profile.institution}
@@ -198,31 +454,9 @@ class PersonalizedPromptManager:
         **추가 요청사항:** {profile.additionalStyle}
         {file_info}
         {keyword_guidance}
-        
-        === 난이도별 면접 가이드라인 ===
-        **면접 난이도:** {difficulty_guide['level']}
-        **언어 사용:** {difficulty_guide['language']}
-        **내용 복잡도:** {difficulty_guide['complexity']}
-        **상호작용 방식:** {difficulty_guide['interaction']}
-        **질문 예시 수준:** {difficulty_guide['examples']}
-        
-        === 면접 진행 가이드라인 ===
-        1. **개인화 반영**: 위 정보를 바탕으로 맞춤형 질문 진행
-        2. **난이도 조절**: 위 난이도 설정에 맞춰 질문의 수준과 언어를 조절
-        3. **자연스러운 키워드 활용**: 억지로 언급하지 말고 대화 흐름에 맞게만 활용
-        4. **멀티턴 대화**: 이전 답변을 기억하고 자연스럽게 이어가기
-        5. **적절한 피드백**: "좋은 답변이네요", "흥미롭군요" 등으로 격려
-        6. **깊이 있는 탐구**: 표면적 답변에서 더 깊은 사고로 유도
-        7. **자연스러운 마무리**: 적절한 시점에서 면접 종료 신호
-        
-        **중요**: 매번 답변을 듣고 나서 해당 답변에 대한 간단한 피드백을 준 후, 
-        설정된 난이도 수준에 맞는 언어와 내용으로 자연스럽게 후속 질문을 이어가세요.
-        키워드는 참고사항일 뿐, 무조건 언급할 필요는 없습니다.
         """
-        
-        return base_prompt + personalization
     
-    def generate_opening_question(self, profile: InterviewProfile) -> str:
+    def _render_opening_question(self, profile: InterviewProfile) -> str:
         """개인화된 오프닝 질문 생성 - 난이도별 조절"""
         institution = profile.institution
         interview_type_kr = {
@@ -254,192 +488,988 @@ class PersonalizedPromptManager:
 {question}"""
 
 class InterviewOrchestrator:
-    """면접 진행 총괄 관리자 - Gemini 1.5 Pro 최적화"""
+    """면접 진행 총괄 관리자 - LLM 백엔드(Gemini/OpenAI/Anthropic/로컬 가짜) 공통"""
     
     def __init__(self):
+        from answer_analysis import AnswerAnalyzer
+        from persistence import create_repository
+        from response_cache import SemanticResponseCache
+        from retrieval_index import RetrievalIndex
+        
         self.personalized_prompt_manager = PersonalizedPromptManager()
-        self.sessions: Dict[str, InterviewSession] = {}
-        self.profiles: Dict[str, InterviewProfile] = {}
         
-        # Gemini API 초기화
-        google_api_key = os.getenv('GOOGLE_API_KEY')
-        if not google_api_key:
-            print("경고: GOOGLE_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
-            return
-            
-        genai.configure(api_key=google_api_key)
-        
-        # Gemini 모델 설정
-        self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            generation_config={
-                "temperature": 0.7,
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 1000,
-            }
+        # 세션/프로필 저장소 (SESSION_STORE=memory|redis)
+        self.session_store = create_session_store(InterviewSession, InterviewProfile)
+        self.session_store.on_evict = self._release_session
+        
+        # 프로필, 대화록, 분석 결과 영구 저장소 (DATABASE_URL)
+        self.repository = create_repository()
+        
+        # 컨텍스트 정책: 최근 K번의 질의응답만 그대로 보내고 그 이전은 요약으로 대체
+        self.context_window_turns = int(os.getenv('CONTEXT_WINDOW_TURNS', 6))
+        self.context_summary_enabled = os.getenv('CONTEXT_SUMMARY', 'true').lower() == 'true'
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
+        
+        # 답변마다 평가 영역별 점수를 백그라운드로 매기고 종료 시에는 누적값만 집계 (TURN_SCORING)
+        self.turn_scoring_enabled = os.getenv('TURN_SCORING', 'true').lower() == 'true'
+        self._scoring_tasks: Dict[str, asyncio.Task] = {}
+        
+        # 면접 종료 분석 작업 큐
+        self.analysis_jobs = AnalysisJobQueue(
+            self.analyze_interview, self._analysis_failed, self.session_store,
+            on_finished=self.repository.save_analysis
         )
         
-        print("✅ Gemini 1.5 Pro 모델이 성공적으로 초기화되었습니다.")
+        # 유휴 세션 정리 주기 (초) 및 백그라운드 태스크
+        self.sweep_interval = float(os.getenv('SESSION_SWEEP_INTERVAL_SECONDS', 60))
+        self._sweeper_task: Optional[asyncio.Task] = None
+        
+        # LLM 호출 동시 실행/속도 제한과 사용자 간 공정 스케줄링 (LLM_MAX_CONCURRENCY, LLM_RPM, LLM_TPM)
+        self.llm_scheduler = LLMScheduler()
+        # 블로킹 SDK 호출을 이벤트 루프 밖에서 실행할 스레드 풀과 LLM 백엔드 (LLM_BACKEND)
+        # 시간 초과/헤지 패배로 버려진 호출은 스레드에서 끝날 때까지 스케줄러 슬롯을 점유
+        self.llm_executor = LLMExecutor()
+        self.llm_executor.on_abandon = self.llm_scheduler.hold
+        # (재시도, 헤지 요청, 회로 차단기를 거친 뒤에도 실패할 때만 기본 질문 사용 - 헤지 요청도 스케줄러를 거침)
+        self.llm = ResilientBackend(create_llm_backend(self.llm_executor), scheduler=self.llm_scheduler)
+        
+        # 업로드 문서 저장소와 문서 검색 인덱스 (매 턴 답변과 관련된 문서 조각만 프롬프트에 포함)
+        self.document_store = DocumentStore()
+        self.retrieval = RetrievalIndex()
+        self.retrieval_enabled = os.getenv('RETRIEVAL_ENABLED', 'true').lower() == 'true'
+        
+        # 답변 작성 중(typing_partial) 다음 턴 추측 실행 (SPECULATIVE_ENABLED)
+        self.speculation = SpeculationManager(self._prepare_speculation)
+        
+        # 답변 사전 분석 (길이, 구체성, 키워드 언급, 질문 관련도) - 짧거나 막연한 답변이면 구체적인 예시를 묻도록 안내
+        self.answer_analyzer = AnswerAnalyzer()
+        
+        # 반복 연습용 면접관 응답 의미 캐시 (프로필에서 responseCache 를 켠 세션만 사용)
+        self.response_cache = SemanticResponseCache(lambda texts: self.retrieval.embedder.encode(texts))
+        
+        # 세션별 턴 추적 기록 (TRACE_SESSIONS=true 면 모든 세션, 아니면 추적을 켠 세션만)
+        self.trace_all_sessions = os.getenv('TRACE_SESSIONS', 'false').lower() == 'true'
+        self.trace_dir = os.getenv('TRACE_DIR', 'traces')
     
-    def save_profile(self, profile_id: str, profile: InterviewProfile):
+    async def warm_up(self) -> Dict[str, float]:
+        """첫 요청 전에 느린 준비 작업을 미리 실행 - 단계별 소요 시간(ms) 반환
+        
+        유형/난이도별 고정 프롬프트 렌더링과 백엔드 등록(Gemini 모델 생성), 문서 검색 임베딩 모델과
+        답변 분석 벡터화 도구 로드를 합니다. 모델 로드는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        timings = {}
+        loop = asyncio.get_running_loop()
+        manager = self.personalized_prompt_manager
+        
+        started = time.perf_counter()
+        for interview_type in dict.fromkeys([*manager.base_prompts, *manager.fallback_questions]):
+            for difficulty in manager.difficulty_guidelines:
+                self.llm.prewarm(manager.generate_static_prefix(interview_type, difficulty))
+        timings["prompts_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        if self.retrieval_enabled:
+            started = time.perf_counter()
+            await loop.run_in_executor(None, lambda: self.retrieval.embedder)
+            timings["embedder_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        if self.answer_analyzer.enabled:
+            started = time.perf_counter()
+            await loop.run_in_executor(None, lambda: self.answer_analyzer.vectorizer)
+            timings["answer_analyzer_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return timings
+    
+    async def save_profile(self, profile_id: str, profile: InterviewProfile, user_id: str = "anonymous"):
         """프로필 저장"""
-        self.profiles[profile_id] = profile
+        await self.session_store.save_profile(profile_id, profile)
+        await self.repository.save_profile(profile_id, user_id, profile.model_dump(mode="json"))
+        # 이 프로필로 시작하는 면접들이 바로 캐시를 쓰도록 프롬프트 미리 렌더링
+        self.personalized_prompt_manager.precompile(profile)
+        # 업로드 문서 검색 인덱스도 저장 시점에 한 번 생성
+        await self.build_retrieval_index(profile.model_dump())
         print(f"프로필 저장됨: {profile_id} - {profile.institution}")
     
-    def get_profile(self, profile_id: str) -> Optional[InterviewProfile]:
-        """프로필 조회"""
-        return self.profiles.get(profile_id)
+    async def get_profile(self, profile_id: str) -> Optional[InterviewProfile]:
+        """프로필 조회 (세션 저장소에 없으면 영구 저장소에서 읽어 다시 적재)"""
+        profile = await self.session_store.get_profile(profile_id)
+        if profile is None:
+            data = await self.repository.get_profile(profile_id)
+            if data is not None:
+                profile = InterviewProfile(**data)
+                await self.session_store.save_profile(profile_id, profile)
+        return profile
     
     async def start_personalized_interview(self, session_id: str, user_id: str, 
                                          profile: InterviewProfile) -> str:
-        """개인화된 면접 시작 - Gemini Chat Session 활용"""
-        
-        # Gemini Chat Session 시작 (시스템 프롬프트는 나중에 전송)
-        chat = self.model.start_chat(history=[])
+        """개인화된 면접 시작"""
         
         session = InterviewSession(
             session_id=session_id,
             user_id=user_id,
-            interview_type=profile.type,
-            personalized_profile=profile.model_dump(),
-            gemini_chat=chat
+            interview_type=profile.type
         )
-        self.sessions[session_id] = session
+        # 같은 프로필로 시작한 세션끼리는 프로필 객체 하나를 공유
+        await self.session_store.attach_profile(session, profile.model_dump(mode="json"))
         
         # 개인화된 오프닝 질문 생성 (기존 방식 사용)
         opening_question = self.personalized_prompt_manager.generate_opening_question(profile)
         
-        # 오프닝 질문을 대화 이력에 추가
-        session.conversation_history.append({
-            "role": "assistant",
-            "content": opening_question,
-            "timestamp": datetime.now().isoformat()
-        })
+        # 면접 기록을 먼저 남긴 뒤 오프닝 질문을 대화 이력에 추가
+        await self.repository.record_interview_start(session_id, user_id, session.personalized_profile, session.created_at)
+        self._append_turn(session, "assistant", opening_question)
+        await self.session_store.save_session(session)
+        
+        # 저장된 프로필을 거치지 않았거나 다른 워커가 만든 인덱스면 첫 답변 전까지 백그라운드로 생성
+        self._schedule_retrieval_index(session.personalized_profile)
         
         print(f"✅ 개인화된 면접 시작: {session_id} - {profile.institution}")
         print(f"오프닝 질문: {opening_question[:100]}...")
         return opening_question
     
-    async def process_response(self, session_id: str, user_response: str) -> str:
-        """사용자 응답 처리 및 다음 질문 생성 - Gemini 멀티턴 대화"""
-        session = self.sessions.get(session_id)
+    async def process_response(self, session_id: str, user_response: str,
+                               on_queued: Optional[Callable[[int], Awaitable[None]]] = None) -> str:
+        """사용자 응답 처리 및 다음 질문 생성 - 멀티턴 대화 (다음 질문 텍스트만 반환)"""
+        turn = await self.process_turn(session_id, user_response, on_queued)
+        return turn["content"]
+    
+    async def process_turn(self, session_id: str, user_response: str,
+                           on_queued: Optional[Callable[[int], Awaitable[None]]] = None) -> Dict:
+        """사용자 응답 처리 - {"content": 다음 질문, "seq": 대화 이력에서 그 질문의 순번}
+        
+        seq 는 대화 이력의 1부터 시작하는 턴 순번으로, 다시 연결한 클라이언트가 마지막으로 받은
+        순번을 보내면 get_turns_since() 로 그 뒤의 턴만 다시 보낼 수 있습니다. (세션이 없으면 None)
+        LLM 호출 차례를 기다리는 동안 대기 순번이 바뀌면 on_queued(순번)을 호출하고,
+        대기열이 가득 차 받아들일 수 없으면 이력을 바꾸지 않은 채 LLMOverloaded 를 올립니다.
+        """
+        session = await self.session_store.get_session(session_id)
         if not session:
-            return "❌ 세션을 찾을 수 없습니다. 면접을 다시 시작해주세요."
+            return {"content": "❌ 세션을 찾을 수 없습니다. 면접을 다시 시작해주세요.", "seq": None}
         
+        # 작성 중에 미리 준비한 결과가 이번 답변에 맞으면 재사용
+        speculation, reuse = self.speculation.resolve(
+            session_id, len(session.conversation_history), session.summarized_exchanges, user_response
+        )
+        trace, token = self._begin_trace(session)
         try:
-            # 사용자 응답을 이력에 추가
-            session.conversation_history.append({
-                "role": "user",
-                "content": user_response,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Gemini Chat Session을 통해 응답 생성
-            if not session.gemini_chat:
-                return "❌ 면접 세션이 초기화되지 않았습니다. 면접을 다시 시작해주세요."
-            
-            # 첫 번째 사용자 응답인 경우: 시스템 프롬프트와 함께 대화 시작
-            if len(session.conversation_history) == 2:  # 오프닝 질문 + 첫 번째 사용자 응답
-                # 개인화된 시스템 프롬프트 생성
-                profile = InterviewProfile(**session.personalized_profile)
-                system_prompt = self.personalized_prompt_manager.generate_personalized_system_prompt(profile)
-                
-                # 시스템 프롬프트와 첫 번째 응답을 함께 전송
-                gemini_response = session.gemini_chat.send_message(
-                    f"[시스템] {system_prompt}\n\n[지원자 첫 번째 답변] {user_response}\n\n위 답변을 바탕으로 자연스러운 후속 질문이나 피드백을 해주세요. 개인화된 정보를 고려하여 면접을 이어가주세요."
-                )
+            # 저장된 대화 이력과 답변 관련 문서 조각으로 요청을 구성 (어느 워커가 처리해도 같은 요청)
+            if reuse:
+                context = speculation.context or ""
             else:
-                # 일반적인 후속 응답
-                gemini_response = session.gemini_chat.send_message(
-                    f"[지원자 답변] {user_response}\n\n위 답변을 바탕으로 자연스러운 후속 질문이나 피드백을 해주세요. 이전 대화 맥락을 고려하여 면접을 이어가주세요."
-                )
+                with span("retrieval"):
+                    context = await self._retrieve_context(session, user_response)
+            context = await self._with_answer_guidance(session, user_response, context)
+            with span("prompt_build"):
+                messages = self._build_messages(session, user_response, context)
+                system_instruction = self._system_instruction(session)
+            tokens_in = self._estimate_input_tokens(messages, system_instruction)
             
-            next_question = gemini_response.text.strip()
+            # 미리 생성한 응답이 없으면 (응답 캐시를 켠 프로필만) 비슷한 답변에 저장된 응답 조회
+            cache_query = None
+            reply = await self.speculation.reply(speculation) if reuse == "reply" else None
+            if reply is not None:
+                self._count_tokens(session, tokens_in, estimate_tokens(reply.strip()))
+            else:
+                cache_query, reply = await self._cached_reply(session, system_instruction, user_response)
+            if reply is not None:
+                with span("history_append"):
+                    self._append_turn(session, "user", user_response)
+                next_question = reply.strip()
+            else:
+                async with self._llm_slot(session.user_id, tokens_in, on_queued):
+                    # 사용자 응답을 이력에 추가
+                    with span("history_append"):
+                        self._append_turn(session, "user", user_response)
+                    
+                    # LLM 백엔드를 통해 응답 생성
+                    started = time.perf_counter()
+                    response = await self.llm.generate(messages, system_instruction=system_instruction)
+                    observe("llm_total", time.perf_counter() - started, started)
+                    
+                    next_question = response.strip()
+                    self._count_tokens(session, tokens_in, self._record_llm_usage(tokens_in, next_question))
+                if cache_query is not None and next_question:
+                    self.response_cache.store(cache_query, next_question)
             
             # AI 응답을 대화 이력에 추가
-            session.conversation_history.append({
-                "role": "assistant",
-                "content": next_question,
-                "timestamp": datetime.now().isoformat()
-            })
+            with span("history_append"):
+                self._append_turn(session, "assistant", next_question)
+            self._prepare_next_turn(session)
             
             print(f"✅ 면접 대화 진행: {session_id} - {len(session.conversation_history)}번째 교환")
-            return next_question
+            return {"content": next_question, "seq": len(session.conversation_history)}
             
+        except LLMOverloaded:
+            raise
         except Exception as e:
-            print(f"❌ Gemini API 호출 오류: {e}")
-            return self._get_fallback_question(session)
-    
-    def _get_fallback_question(self, session: InterviewSession) -> str:
-        """Gemini API 실패 시 사용할 기본 질문"""
-        fallback_questions = [
-            "좀 더 구체적인 예시를 들어주실 수 있을까요?",
-            "그 경험에서 가장 중요하게 배운 점은 무엇인가요?",
-            "앞으로의 계획이나 목표에 대해 말씀해주세요.",
-            "마지막으로 하고 싶은 말씀이 있다면 자유롭게 해주세요."
+            print(f"❌ LLM API 호출 오류: {e}")
+            question = self._fallback_turn(session, user_response, reason=type(e).__name__)
+            return {"content": question, "seq": len(session.conversation_history)}
+        finally:
+            with span("session_save"):
+                await self.session_store.save_session(session)
+            await self._end_trace(session, trace, token)
+    
+    async def process_response_stream(self, session_id: str, user_response: str) -> AsyncIterator[Dict]:
+        """사용자 응답 처리 - 생성되는 토큰을 순서대로 전달하는 스트리밍 버전
+        
+        {"type": "delta", "content": ...} 이벤트를 토큰 조각마다 내보낸 뒤,
+        대화 이력에 기록된 전체 텍스트와 턴 순번을 {"type": "final", "content": ..., "seq": ...} 로 마지막에 전달합니다.
+        LLM 호출 차례를 기다리는 동안에는 {"type": "queued", "position": 순번} 을, 대기열이 가득 차
+        받아들일 수 없으면 {"type": "overloaded", "content": 안내 문구, "retry_after": 초} 를 전달합니다.
+        """
+        session = await self.session_store.get_session(session_id)
+        if not session:
+            yield {"type": "final", "content": "❌ 세션을 찾을 수 없습니다. 면접을 다시 시작해주세요.", "seq": None}
+            return
+        
+        speculation, reuse = self.speculation.resolve(
+            session_id, len(session.conversation_history), session.summarized_exchanges, user_response
+        )
+        trace, token = self._begin_trace(session)
+        try:
+            if reuse:
+                context = speculation.context or ""
+            else:
+                with span("retrieval"):
+                    context = await self._retrieve_context(session, user_response)
+            context = await self._with_answer_guidance(session, user_response, context)
+            with span("prompt_build"):
+                messages = self._build_messages(session, user_response, context)
+                system_instruction = self._system_instruction(session)
+            tokens_in = self._estimate_input_tokens(messages, system_instruction)
+            
+            cache_query = None
+            reply = await self.speculation.reply(speculation) if reuse == "reply" else None
+            if reply is not None:
+                self._count_tokens(session, tokens_in, estimate_tokens(reply.strip()))
+            else:
+                cache_query, reply = await self._cached_reply(session, system_instruction, user_response)
+            if reply is not None:
+                # 미리 생성했거나 캐시에 있던 응답은 한 번에 전달
+                with span("history_append"):
+                    self._append_turn(session, "user", user_response)
+                next_question = reply.strip()
+                yield {"type": "delta", "content": next_question}
+            else:
+                ticket = self.llm_scheduler.submit(session.user_id, self.llm.key_id, tokens_in)
+                try:
+                    async for position in self.llm_scheduler.wait(ticket):
+                        yield {"type": "queued", "position": position}
+                    with span("history_append"):
+                        self._append_turn(session, "user", user_response)
+                    
+                    chunks = []
+                    started = time.perf_counter()
+                    async for text in self.llm.stream(messages, system_instruction=system_instruction):
+                        if text:
+                            if not chunks:
+                                observe("llm_ttft", time.perf_counter() - started, started)
+                            chunks.append(text)
+                            yield {"type": "delta", "content": text}
+                    observe("llm_total", time.perf_counter() - started, started)
+                    
+                    next_question = "".join(chunks).strip()
+                    self._count_tokens(session, tokens_in, self._record_llm_usage(tokens_in, next_question))
+                finally:
+                    self.llm_scheduler.release(ticket)
+                if cache_query is not None and next_question:
+                    self.response_cache.store(cache_query, next_question)
+            with span("history_append"):
+                self._append_turn(session, "assistant", next_question)
+            self._prepare_next_turn(session)
+            
+            print(f"✅ 면접 대화 진행 (스트리밍): {session_id} - {len(session.conversation_history)}번째 교환")
+            yield {"type": "final", "content": next_question, "seq": len(session.conversation_history)}
+            
+        except LLMOverloaded as e:
+            print(f"경고: LLM 대기열 초과로 응답 보류: {session_id} - {e}")
+            yield {"type": "overloaded", "content": str(e), "retry_after": e.retry_after}
+        except Exception as e:
+            print(f"❌ LLM API 스트리밍 오류: {e}")
+            question = self._fallback_turn(session, user_response, reason=type(e).__name__)
+            yield {"type": "final", "content": question, "seq": len(session.conversation_history)}
+        finally:
+            with span("session_save"):
+                await self.session_store.save_session(session)
+            await self._end_trace(session, trace, token)
+    
+    async def _cached_reply(self, session: InterviewSession, system_instruction: str,
+                            user_response: str) -> Tuple[Optional["CacheLookup"], Optional[str]]:
+        """응답 캐시를 켠 프로필이면 (캐시 조회, 저장된 응답) 반환 - 끈 프로필은 (None, None)"""
+        profile = session.personalized_profile or {}
+        if not profile.get("responseCache"):
+            return None, None
+        trace = current_trace.get()
+        with span("response_cache"):
+            # 답변을 비운 요청(고정 프롬프트 + 대화 이력 + 턴 안내문)과 업로드 문서 조합이 같아야 같은 흐름
+            prefix = self.response_cache.prefix_key(
+                system_instruction, self._build_messages(session, ""), self._retrieval_key(profile)
+            )
+            try:
+                query, reply = await self.response_cache.lookup(prefix, user_response)
+            except Exception as e:
+                # 임베딩 실패 등 캐시 오류로 턴을 망치지 않도록 캐시 없이 LLM 호출
+                print(f"경고: 응답 캐시 조회 실패, LLM 으로 응답 생성: {session.session_id} - {e}")
+                RESPONSE_CACHE_TOTAL.inc(outcome="error")
+                if trace is not None:
+                    trace.attributes["response_cache"] = "error"
+                return None, None
+        if trace is not None:
+            trace.attributes["response_cache"] = "hit" if reply is not None else "miss"
+        return query, reply
+    
+    @asynccontextmanager
+    async def _llm_slot(self, user_id: str, tokens_in: int,
+                        on_queued: Optional[Callable[[int], Awaitable[None]]] = None):
+        """스케줄러에서 LLM 호출 차례를 받아 블록이 끝날 때까지 슬롯을 점유"""
+        ticket = self.llm_scheduler.submit(user_id, self.llm.key_id, tokens_in)
+        try:
+            await self.llm_scheduler.acquire(ticket, on_queued)
+            yield
+        finally:
+            self.llm_scheduler.release(ticket)
+    
+    @staticmethod
+    def _estimate_input_tokens(messages: List[Dict], system_instruction: Optional[str] = None) -> int:
+        return estimate_tokens(system_instruction or "") + sum(estimate_tokens(m["content"]) for m in messages)
+    
+    def _record_llm_usage(self, tokens_in: int, response: str) -> int:
+        """실제로 보낸 LLM 호출의 입력/출력 토큰 수(추정치)를 지표와 TPM 한도에 반영하고 출력 토큰 수 반환"""
+        tokens_out = estimate_tokens(response)
+        self.llm_scheduler.charge(self.llm.key_id, tokens_out)
+        TOKENS_TOTAL.inc(tokens_in, direction="in")
+        TOKENS_TOTAL.inc(tokens_out, direction="out")
+        return tokens_out
+    
+    def _count_tokens(self, session: InterviewSession, tokens_in: int, tokens_out: int):
+        """이번 턴의 입력/출력 토큰 수(추정치)를 세션 누적값에 반영"""
+        session.tokens_in += tokens_in
+        session.tokens_out += tokens_out
+        trace = current_trace.get()
+        if trace is not None:
+            trace.attributes.update(tokens_in=tokens_in, tokens_out=tokens_out)
+    
+    def _prepare_next_turn(self, session: InterviewSession):
+        """면접관 턴이 끝난 뒤 다음 턴 준비 - 요약 갱신과 답변 채점을 예약하고, 추측 실행 모드면 다음 호출을 미리 준비"""
+        self._schedule_summary(session)
+        self._schedule_scoring(session)
+        if self.speculation.enabled:
+            self.llm.prewarm(self._system_instruction(session))
+            self._schedule_retrieval_index(session.personalized_profile)
+    
+    def submit_draft(self, session_id: str, draft: str):
+        """작성 중인 답변 초안(typing_partial) 등록 - 추측 실행 모드가 아니면 무시"""
+        self.speculation.submit_draft(session_id, draft)
+    
+    async def _prepare_speculation(self, session_id: str, draft: str) -> Optional[Speculation]:
+        """초안 기준으로 문서 검색과 (SPECULATIVE_GENERATE 면) 면접관 응답 생성을 미리 시작"""
+        session = await self.session_store.get_session(session_id)
+        if not session or not session.conversation_history or session.conversation_history[-1].role != "assistant":
+            return None
+        speculation = Speculation(draft, len(session.conversation_history), session.summarized_exchanges)
+        speculation.context = await self._retrieve_context(session, draft)
+        if self.speculation.generate:
+            context = await self._with_answer_guidance(session, draft, speculation.context)
+            messages = self._build_messages(session, draft, context)
+            speculation.reply = asyncio.create_task(
+                self._speculative_reply(session.user_id, messages, self._system_instruction(session))
+            )
+        return speculation
+    
+    async def _speculative_reply(self, user_id: str, messages: List[Dict], system_instruction: str) -> str:
+        """초안에 대한 면접관 응답 - 일반 호출과 같은 스케줄러/한도를 거침"""
+        tokens_in = self._estimate_input_tokens(messages, system_instruction)
+        async with self._llm_slot(user_id, tokens_in):
+            response = (await self.llm.generate(messages, system_instruction=system_instruction)).strip()
+        self._record_llm_usage(tokens_in, response)
+        return response
+    
+    def _begin_trace(self, session: InterviewSession):
+        """이번 턴의 추적 기록 시작 - 추적하지 않는 세션은 지표만 기록"""
+        if not (session.trace_enabled or self.trace_all_sessions):
+            return None, None
+        turn = sum(1 for msg in session.conversation_history if msg.role == "user") + 1
+        trace = Trace(session.session_id, turn)
+        return trace, current_trace.set(trace)
+    
+    async def _end_trace(self, session: InterviewSession, trace: Optional[Trace], token):
+        """이번 턴의 추적 기록을 {TRACE_DIR}/{session_id}.jsonl 에 한 줄로 추가"""
+        if trace is None:
+            return
+        try:
+            current_trace.reset(token)
+        except ValueError:
+            # 스트리밍 응답이 다른 태스크에서 닫힌 경우
+            current_trace.set(None)
+        line = json.dumps(trace.to_dict(), ensure_ascii=False)
+        path = self._trace_path(session.session_id)
+        
+        def write():
+            os.makedirs(self.trace_dir, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, write)
+        except OSError as e:
+            print(f"경고: 턴 추적 기록 저장 실패: {session.session_id} - {e}")
+    
+    def _trace_path(self, session_id: str) -> str:
+        return os.path.join(self.trace_dir, f"{os.path.basename(session_id)}.jsonl")
+    
+    async def set_trace(self, session_id: str, enabled: bool) -> bool:
+        """세션의 턴 추적 기록 켜기/끄기 (세션이 없으면 False)"""
+        session = await self.session_store.get_session(session_id)
+        if not session:
+            return False
+        session.trace_enabled = enabled
+        await self.session_store.save_session(session)
+        return True
+    
+    async def get_trace(self, session_id: str) -> List[Dict]:
+        """세션의 턴 추적 기록 조회 (기록이 없으면 빈 목록)"""
+        path = self._trace_path(session_id)
+        
+        def read():
+            with open(path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, read)
+        except FileNotFoundError:
+            return []
+    
+    async def get_turns_since(self, session_id: str, last_seq: int = 0) -> Optional[Dict]:
+        """다시 연결한 클라이언트가 놓친 턴 - 마지막으로 받은 순번(last_seq) 뒤의 턴만 세션 저장소에서 읽어 반환
+        
+        {"seq": 마지막 턴 순번, "turns": [{"seq", "role", "content", "timestamp"}, ...], "reset": bool}
+        클라이언트의 순번이 이력과 맞지 않으면(이력보다 큼 등) 전체 이력을 reset=True 로 보냅니다.
+        세션이 없으면(만료, 면접 종료) None.
+        """
+        session = await self.session_store.get_session(session_id)
+        if not session:
+            SESSION_RESUMES_TOTAL.inc(outcome="not_found")
+            return None
+        
+        history = session.conversation_history
+        reset = not 0 <= last_seq <= len(history)
+        start = 0 if reset else last_seq
+        turns = [{"seq": index + 1, **history[index].to_dict()} for index in range(start, len(history))]
+        SESSION_RESUMES_TOTAL.inc(outcome="reset" if reset else "delta")
+        REPLAYED_TURNS_TOTAL.inc(len(turns))
+        return {"seq": len(history), "turns": turns, "reset": reset}
+    
+    def _append_turn(self, session: InterviewSession, role: str, content: str):
+        """대화 이력에 한 턴 추가 (영구 저장소에는 쓰기 버퍼를 거쳐 일괄 저장)"""
+        turn = Turn(role, content)
+        session.conversation_history.append(turn)
+        self.repository.record_turn(
+            session.session_id, len(session.conversation_history) - 1, role, content, turn.timestamp
+        )
+    
+    def _build_turn_message(self, session: InterviewSession, user_response: str, context: str = "") -> str:
+        """이번 턴에 LLM으로 보낼 메시지 구성 (검색된 문서 조각은 이번 턴에만 포함)"""
+        # 오프닝 질문 외에 면접관 응답이 아직 없으면 첫 번째 답변
+        is_first = sum(1 for msg in session.conversation_history if msg.role == "assistant") <= 1
+        message = self._format_user_message(session, user_response, is_first)
+        if context:
+            message = f"{message}\n\n{context}"
+        return message
+    
+    def _format_user_message(self, session: InterviewSession, user_response: str, is_first: bool) -> str:
+        """지원자 답변을 LLM 메시지 형식으로 변환"""
+        # 첫 번째 사용자 응답인 경우: 개인화 정보와 함께 대화 시작
+        if is_first:
+            return f"{self._personalization_header(session)}\n\n[지원자 첫 번째 답변] {user_response}\n\n위 답변을 바탕으로 자연스러운 후속 질문이나 피드백을 해주세요. 개인화된 정보를 고려하여 면접을 이어가주세요."
+        
+        # 일반적인 후속 응답
+        return f"[지원자 답변] {user_response}\n\n위 답변을 바탕으로 자연스러운 후속 질문이나 피드백을 해주세요. 이전 대화 맥락을 고려하여 면접을 이어가주세요."
+    
+    def _personalization_header(self, session: InterviewSession) -> str:
+        """첫 메시지에 붙이는 개인화 정보 (고정 프롬프트는 system instruction 으로 따로 전달)"""
+        profile = InterviewProfile(**session.personalized_profile)
+        return f"[개인화 정보] {self.personalized_prompt_manager.generate_personalization(profile)}"
+    
+    def _system_instruction(self, session: InterviewSession) -> str:
+        """세션의 (유형, 난이도)별 고정 프롬프트 - 백엔드가 해시별로 한 번만 등록해 재사용"""
+        return self.personalized_prompt_manager.generate_static_prefix(
+            session.interview_type, (session.personalized_profile or {}).get("difficulty")
+        )
+    
+    def _build_messages(self, session: InterviewSession, user_response: str, context: str = "") -> List[Dict]:
+        """컨텍스트 창이 적용된 대화 이력 + 이번 답변으로 요청 메시지 구성"""
+        return self._build_chat_history(session) + [
+            {"role": "user", "content": self._build_turn_message(session, user_response, context)}
         ]
+    
+    def _retrieval_key(self, profile: Optional[Dict]) -> Optional[str]:
+        """프로필의 업로드 파일 조합으로 검색 인덱스 키 계산"""
+        files = (profile or {}).get("uploadedFiles") or []
+        return self.retrieval.index_key([file.get("id") for file in files])
+    
+    async def build_retrieval_index(self, profile: Optional[Dict]):
+        """업로드 문서로 검색 인덱스 생성 (같은 파일 조합이면 기존 인덱스 재사용)"""
+        key = self._retrieval_key(profile)
+        if not self.retrieval_enabled or key is None or self.retrieval.has(key):
+            return
+        documents = []
+        for file in profile["uploadedFiles"]:
+            text = await self.document_store.get_text(file["id"])
+            if text:
+                documents.append((file["name"], text))
+        try:
+            await self.retrieval.build(key, documents)
+        except Exception as e:
+            print(f"문서 검색 인덱스 생성 오류: {e}")
+    
+    def _schedule_retrieval_index(self, profile: Optional[Dict]):
+        key = self._retrieval_key(profile)
+        if self.retrieval_enabled and key is not None and not self.retrieval.has(key):
+            task = asyncio.ensure_future(self.build_retrieval_index(profile))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    
+    async def _retrieve_context(self, session: InterviewSession, user_response: str) -> str:
+        """지원자의 최근 답변과 관련된 업로드 문서 조각을 프롬프트용 텍스트로 구성"""
+        if not self.retrieval_enabled:
+            return ""
+        key = self._retrieval_key(session.personalized_profile)
+        if key is None:
+            return ""
+        try:
+            if not self.retrieval.has(key):
+                await self.build_retrieval_index(session.personalized_profile)
+            results = await self.retrieval.query(key, user_response)
+        except Exception as e:
+            print(f"문서 검색 오류: {e}")
+            return ""
+        if not results:
+            return ""
+        excerpts = "\n".join(f"- ({result['name']}) {result['text']}" for result in results)
+        return f"[지원자 제출 자료 중 이번 답변과 관련된 부분]\n{excerpts}\n\n필요하면 위 자료 내용과 답변을 연결해 질문하되, 자료를 그대로 읽어주지는 마세요."
+    
+    @staticmethod
+    def _profile_keywords(session_profile: Optional[Dict]) -> List[str]:
+        profile = session_profile or {}
+        return list(profile.get("keywords") or []) + list(profile.get("fields") or [])
+    
+    async def _with_answer_guidance(self, session: InterviewSession, user_response: str, context: str) -> str:
+        """답변 사전 분석 결과 안내가 있으면 이번 턴에만 덧붙일 내용(context)에 추가"""
+        if not self.answer_analyzer.enabled or not session.conversation_history:
+            return context
+        with span("answer_analysis"):
+            features = await self.answer_analyzer.analyze(
+                session.conversation_history[-1].content, user_response,
+                self._profile_keywords(session.personalized_profile)
+            )
+        trace = current_trace.get()
+        if trace is not None:
+            trace.attributes["answer_flags"] = features["flags"]
+        guidance = self.answer_analyzer.guidance(features)
+        return f"{context}\n\n{guidance}" if context and guidance else context or guidance
+    
+    def _answer_summary(self, session: InterviewSession) -> Dict:
+        """면접 전체 답변의 사전 분석 요약 (한 번의 배치로 계산)"""
+        keywords = self._profile_keywords(session.personalized_profile)
+        items = [(question, answer, keywords) for question, answer in self._scoring_pairs(session.conversation_history)]
+        return self.answer_analyzer.summarize(self.answer_analyzer.features(items))
+    
+    def _release_session(self, session_id: str):
+        """세션이 종료/축출되면 진행 중인 요약 갱신, 답변 채점과 추측 실행도 취소"""
+        summary_task = self._summary_tasks.pop(session_id, None)
+        if summary_task:
+            summary_task.cancel()
+        scoring_task = self._scoring_tasks.pop(session_id, None)
+        if scoring_task:
+            scoring_task.cancel()
+        self.speculation.discard(session_id)
+    
+    def start_background_tasks(self):
+        """유휴 세션 정리, 분석 작업 워커 등 백그라운드 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweep_sessions())
+        self.analysis_jobs.start()
+        self.repository.start()
+    
+    async def stop_background_tasks(self):
+        """백그라운드 태스크 종료"""
+        await self.analysis_jobs.stop()
+        await self.repository.stop()
+        if self._sweeper_task:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+        for task in list(self._summary_tasks.values()) + list(self._scoring_tasks.values()):
+            task.cancel()
+        self._summary_tasks.clear()
+        self._scoring_tasks.clear()
+    
+    async def _sweep_sessions(self):
+        """sweep_interval 마다 유휴 세션 정리 (오래 사용하지 않은 업로드 문서도 함께 정리)"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await self.session_store.sweep()
+                if removed:
+                    print(f"🧹 유휴 세션 {removed}개 정리")
+            except Exception as e:
+                print(f"세션 정리 오류: {e}")
+            try:
+                removed = await self.document_store.sweep()
+                if removed:
+                    print(f"🧹 오래된 업로드 문서 {removed}개 정리")
+            except Exception as e:
+                print(f"문서 정리 오류: {e}")
+    
+    def _exchanges(self, session: InterviewSession) -> List[Tuple[str, str]]:
+        """완료된 (지원자 답변, 면접관 응답) 쌍 목록
         
-        conversation_count = len([msg for msg in session.conversation_history if msg["role"] == "user"])
-        if conversation_count < len(fallback_questions):
-            return fallback_questions[conversation_count - 1]
-        else:
-            return fallback_questions[-1]
+        오프닝 질문은 LLM에 보내지 않았으므로 제외하고, 면접관 응답이 뒤따르지 않은
+        (API 오류로 실패한) 지원자 턴도 제외합니다.
+        """
+        exchanges = []
+        turns = session.conversation_history
+        for i, msg in enumerate(turns):
+            if msg.role != "user":
+                continue
+            if i + 1 < len(turns) and turns[i + 1].role == "assistant":
+                exchanges.append((msg.content, turns[i + 1].content))
+        return exchanges
     
-    async def end_interview(self, session_id: str) -> Dict:
-        """면접 종료 및 결과 분석"""
-        session = self.sessions.get(session_id)
+    def _window_start(self, session: InterviewSession, total_exchanges: int) -> int:
+        """그대로 보낼 질의응답의 시작 위치 (그 이전은 요약으로 대체)"""
+        window = self.context_window_turns
+        if window <= 0 or total_exchanges <= window:
+            return 0
+        if not self.context_summary_enabled:
+            return total_exchanges - window
+        # 요약이 아직 따라잡지 못한 구간은 그대로 보내되, 요약이 계속 실패해도 창이 무한히 커지지 않도록 제한
+        return max(session.summarized_exchanges, total_exchanges - 2 * window)
+    
+    def _build_chat_history(self, session: InterviewSession) -> List[Dict]:
+        """conversation_history를 LLM 메시지 형식으로 변환 (컨텍스트 창 적용)"""
+        exchanges = self._exchanges(session)
+        start = self._window_start(session, len(exchanges))
+        
+        history = []
+        if start > 0:
+            # 창 밖으로 밀려난 첫 메시지의 개인화 정보와 이전 대화 요약을 대신 전달
+            summary = session.context_summary or "(요약 없음)"
+            history.append({
+                "role": "user",
+                "content": f"{self._personalization_header(session)}\n\n[이전 대화 요약] {summary}\n\n위 정보를 참고하여 면접을 이어가주세요."
+            })
+            history.append({"role": "assistant", "content": "네, 이전 대화 내용을 참고하여 면접을 이어가겠습니다."})
+        
+        for index, (user_content, assistant_content) in enumerate(exchanges[start:], start):
+            history.append({
+                "role": "user",
+                "content": self._format_user_message(session, user_content, is_first=index == 0)
+            })
+            history.append({"role": "assistant", "content": assistant_content})
+        return history
+    
+    def _schedule_summary(self, session: InterviewSession):
+        """창 밖으로 밀려난 질의응답이 생기면 요약 갱신을 백그라운드로 예약 (응답 경로를 막지 않음)"""
+        if not self.context_summary_enabled or self.context_window_turns <= 0:
+            return
+        target = len(self._exchanges(session)) - self.context_window_turns
+        if target <= session.summarized_exchanges:
+            return
+        
+        session_id = session.session_id
+        running = self._summary_tasks.get(session_id)
+        if running and not running.done():
+            return
+        
+        task = asyncio.create_task(self._update_summary(session_id))
+        self._summary_tasks[session_id] = task
+        task.add_done_callback(
+            lambda t: self._summary_tasks.pop(session_id, None) if self._summary_tasks.get(session_id) is t else None
+        )
+    
+    async def _update_summary(self, session_id: str):
+        """이전 요약에 새로 밀려난 질의응답만 더해 요약을 점진적으로 갱신"""
+        session = await self.session_store.get_session(session_id)
         if not session:
-            return {"error": "세션을 찾을 수 없습니다."}
+            return
+        
+        exchanges = self._exchanges(session)
+        target = len(exchanges) - self.context_window_turns
+        if target <= session.summarized_exchanges:
+            return
+        
+        new_turns = "\n\n".join(
+            f"지원자: {user_content}\n면접관: {assistant_content}"
+            for user_content, assistant_content in exchanges[session.summarized_exchanges:target]
+        )
+        prompt = f"""
+        다음은 진행 중인 면접의 기존 요약과 그 이후에 이어진 대화입니다.
         
+        [기존 요약]
+        {session.context_summary or "(없음)"}
+        
+        [이어진 대화]
+        {new_turns}
+        
+        두 내용을 합쳐 면접관이 이후 질문에 참고할 수 있도록 지원자의 경험, 관심사, 강점과 약점,
+        이미 다룬 질문을 10문장 이내로 요약해주세요.
+        """
+        
+        messages = [{"role": "user", "content": prompt}]
         try:
-            # Gemini를 활용한 면접 분석 및 피드백 생성
-            if session.gemini_chat:
-                conversation_summary = self._format_conversation_for_analysis(session.conversation_history)
-                
-                analysis_prompt = f"""
-                다음은 방금 진행된 면접의 전체 대화입니다:
-                
-                {conversation_summary}
-                
-                이 면접을 바탕으로 다음 형식으로 분석해주세요:
-                
-                **면접 분석 결과**
-                1. **답변 품질**: 전반적인 답변의 구체성과 성의
-                2. **전공 적합성**: 지원 분야에 대한 이해도와 열정
-                3. **성장 가능성**: 잠재력과 발전 가능성
-                4. **개선 제안**: 향후 면접이나 준비 시 고려사항
-                5. **총평**: 한줄 요약
-                
-                객관적이고 건설적인 피드백을 제공해주세요.
-                """
-                
-                analysis_response = session.gemini_chat.send_message(analysis_prompt)
-                ai_feedback = analysis_response.text.strip()
-            else:
-                ai_feedback = "면접 세션에 문제가 있어 AI 분석을 생성할 수 없습니다."
+            # 요약은 사용자 응답보다 급하지 않으므로 백그라운드 사용자로 공정 스케줄링
+            async with self._llm_slot(BACKGROUND_USER, self._estimate_input_tokens(messages)):
+                summary = (await self.llm.generate(messages)).strip()
+        except Exception as e:
+            print(f"대화 요약 갱신 오류: {e}")
+            return
         
+        # 요약하는 동안 다른 턴이 저장되었을 수 있으므로 최신 세션에 반영
+        latest = await self.session_store.get_session(session_id)
+        if not latest or latest.summarized_exchanges >= target:
+            return
+        latest.context_summary = summary
+        latest.summarized_exchanges = target
+        await self.session_store.save_session(latest)
+        print(f"📝 대화 요약 갱신: {session_id} - {target}번째 질의응답까지")
+    
+    @staticmethod
+    def _scoring_pairs(conversation_history: List[Dict]) -> List[Tuple[str, str]]:
+        """채점할 (면접관 질문, 지원자 답변) 쌍 목록 - 오프닝 질문에 대한 답변부터 포함"""
+        pairs = []
+        for i, msg in enumerate(conversation_history):
+            if msg["role"] == "user" and i > 0 and conversation_history[i - 1]["role"] == "assistant":
+                pairs.append((conversation_history[i - 1]["content"], msg["content"]))
+        return pairs
+    
+    def _schedule_scoring(self, session: InterviewSession):
+        """아직 채점하지 않은 답변이 있으면 채점을 백그라운드로 예약 (응답 경로를 막지 않음)"""
+        if not self.turn_scoring_enabled:
+            return
+        if len(self._scoring_pairs(session.conversation_history)) <= session.scored_answers:
+            return
+        
+        session_id = session.session_id
+        running = self._scoring_tasks.get(session_id)
+        if running and not running.done():
+            return
+        
+        task = asyncio.create_task(self._update_scores(session_id))
+        self._scoring_tasks[session_id] = task
+        task.add_done_callback(
+            lambda t: self._scoring_tasks.pop(session_id, None) if self._scoring_tasks.get(session_id) is t else None
+        )
+    
+    async def _score_answer(self, focus_areas: List[str], question: str, answer: str) -> Dict:
+        """질문과 답변 한 쌍을 평가 영역별로 채점 (JSON 출력)
+        
+        LLM 호출 자체가 실패하면 예외를 올리고(나중에 다시 채점), 출력이 형식에 맞지 않으면
+        모든 영역을 None 으로 둔 결과를 돌려줘 같은 답변에서 계속 멈추지 않게 합니다.
+        """
+        messages = [{"role": "user", "content": build_scoring_prompt(focus_areas, question, answer)}]
+        async with self._llm_slot(BACKGROUND_USER, self._estimate_input_tokens(messages)):
+            text = await self.llm.generate_json(messages, score_schema(focus_areas))
+        try:
+            result = parse_turn_score(text, focus_areas)
+        except ValueError as e:
+            print(f"경고: 답변 채점 결과를 해석하지 못했습니다: {e}")
+            TURN_SCORES_TOTAL.inc(outcome="invalid")
+            return {"scores": {area: None for area in focus_areas}, "comment": ""}
+        TURN_SCORES_TOTAL.inc(outcome="ok")
+        return result
+    
+    async def _score_pending(self, conversation_history: List[Dict], interview_type: str, start: int,
+                             turn_scores: List[Dict], score_totals: Dict[str, List[float]]) -> int:
+        """start 번째 이후의 답변을 순서대로 채점해 turn_scores, score_totals 에 반영 - 채점한 쌍 수 반환
+        
+        호출이 실패하면 그 앞까지 반영한 채로 예외를 올립니다.
+        """
+        focus_areas = self.personalized_prompt_manager.get_focus_areas(interview_type)
+        pairs = self._scoring_pairs(conversation_history)
+        scored = start
+        for question, answer in pairs[start:]:
+            result = await self._score_answer(focus_areas, question, answer)
+            scored += 1
+            turn_scores.append({"turn": scored, **result})
+            add_to_totals(score_totals, result["scores"])
+        return scored
+    
+    async def _update_scores(self, session_id: str):
+        """새로 들어온 답변만 채점해 세션의 답변별 점수와 영역별 누적값을 갱신"""
+        session = await self.session_store.get_session(session_id)
+        if not session:
+            return
+        
+        start = session.scored_answers
+        turn_scores: List[Dict] = []
+        score_totals: Dict[str, List[float]] = {}
+        try:
+            scored = await self._score_pending(
+                session.conversation_history, session.interview_type, start, turn_scores, score_totals
+            )
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"AI 피드백 생성 오류: {e}")
-            ai_feedback = "AI 피드백 생성 중 오류가 발생했습니다."
+            print(f"답변 채점 오류: {e}")
+            TURN_SCORES_TOTAL.inc(outcome="error")
+            scored = start + len(turn_scores)
+        if scored == start:
+            return
         
-        # 면접 결과 분석
-        analysis = {
+        # 채점하는 동안 다른 턴이 저장되었을 수 있으므로 최신 세션에 반영
+        latest = await self.session_store.get_session(session_id)
+        if not latest or latest.scored_answers != start:
+            return
+        latest.turn_scores.extend(turn_scores)
+        for area, (total, count) in score_totals.items():
+            current = latest.score_totals.setdefault(area, [0.0, 0])
+            current[0] += total
+            current[1] += count
+        latest.scored_answers = scored
+        await self.session_store.save_session(latest)
+        print(f"📝 답변 채점: {session_id} - {scored}번째 답변까지")
+        # 채점하는 동안 들어온 답변이 있으면 이어서 채점
+        self._schedule_scoring(latest)
+    
+    def _get_fallback_question(self, session: InterviewSession, reason: str = "error") -> str:
+        """LLM API 실패 시 사용할 기본 질문 (유형/난이도별 질문 중 이 면접에서 아직 하지 않은 것)"""
+        FALLBACKS_TOTAL.inc(reason=reason)
+        asked = [msg.content for msg in session.conversation_history if msg.role == "assistant"]
+        return self.personalized_prompt_manager.get_fallback_question(
+            session.interview_type, (session.personalized_profile or {}).get("difficulty"), asked
+        )
+    
+    def _fallback_turn(self, session: InterviewSession, user_response: str, reason: str) -> str:
+        """기본 질문을 이번 턴의 응답으로 대화 이력에 기록 (다음 턴에서 같은 질문을 반복하지 않도록)"""
+        if not session.conversation_history or session.conversation_history[-1].role != "user":
+            self._append_turn(session, "user", user_response)
+        question = self._get_fallback_question(session, reason)
+        self._append_turn(session, "assistant", question)
+        return question
+    
+    async def end_interview(self, session_id: str) -> Dict:
+        """면접 종료 및 결과 분석 (분석이 끝날 때까지 기다림)"""
+        snapshot = await self.finish_interview(session_id)
+        if snapshot is None:
+            return {"error": "세션을 찾을 수 없습니다."}
+        
+        try:
+            return await self.analyze_interview(snapshot)
+        except Exception as e:
+            return self._analysis_failed(snapshot, e)
+    
+    async def submit_end_interview(self, session_id: str) -> Optional[Dict]:
+        """면접 종료 후 분석을 작업 큐에 등록 - 작업 정보를 바로 반환"""
+        snapshot = await self.finish_interview(session_id, delete=False)
+        if snapshot is None:
+            return None
+        
+        # 작업이 저장소에 기록된 뒤에 세션을 지워야 결과가 유실되지 않음
+        job = await self.analysis_jobs.submit(snapshot)
+        await self._delete_session(session_id)
+        return job
+    
+    async def finish_interview(self, session_id: str, delete: bool = True) -> Optional[Dict]:
+        """세션을 닫고 분석에 필요한 대화 스냅샷 생성"""
+        session = await self.session_store.get_session(session_id)
+        if not session:
+            return None
+        
+        answer_summary = self._answer_summary(session)
+        snapshot = {
             "session_id": session_id,
             "interview_type": session.interview_type,
             "institution": session.personalized_profile.get("institution", "미상") if session.personalized_profile else "미상",
             "duration_minutes": (datetime.now() - session.created_at).seconds // 60,
-            "total_exchanges": len([msg for msg in session.conversation_history if msg["role"] == "user"]),
-            "conversation_log": session.conversation_history,
-            "ai_feedback": ai_feedback,
-            "basic_feedback": self._generate_basic_feedback(session)
+            "total_exchanges": len([msg for msg in session.conversation_history if msg.role == "user"]),
+            "conversation_log": [turn.to_dict() for turn in session.conversation_history],
+            "basic_feedback": self._generate_basic_feedback(session, answer_summary),
+            "answer_analysis": answer_summary,
+            "tokens": {"in": session.tokens_in, "out": session.tokens_out},
+            "turn_scores": session.turn_scores,
+            "score_totals": session.score_totals,
+            "scored_answers": session.scored_answers
         }
+        SESSION_TOKENS.observe(session.tokens_in, direction="in")
+        SESSION_TOKENS.observe(session.tokens_out, direction="out")
+        await self.repository.record_interview_end(snapshot)
         
-        # 세션 정리
-        del self.sessions[session_id]
-        print(f"✅ 면접 종료: {session_id}")
+        if delete:
+            await self._delete_session(session_id)
+        return snapshot
+    
+    async def analyze_interview(self, snapshot: Dict) -> Dict:
+        """대화 스냅샷 분석 - 실패하면 예외를 그대로 올려 재시도할 수 있게 함
         
-        return analysis
+        답변 채점(TURN_SCORING)을 쓰면 아직 채점하지 않은 마지막 답변만 채점한 뒤 누적값을 집계하고,
+        아니면 대화 전체를 LLM으로 한 번에 분석합니다.
+        """
+        if self.turn_scoring_enabled:
+            return await self._aggregate_interview(snapshot)
+        
+        # LLM을 활용한 면접 분석 및 피드백 생성
+        # (면접 chat 이력에 덧붙이지 않고 대화록만 담은 새 요청으로 분석)
+        conversation_summary = self._format_conversation_for_analysis(snapshot["conversation_log"])
+        
+        analysis_prompt = f"""
+        다음은 방금 진행된 면접의 전체 대화입니다:
+        
+        {conversation_summary}
+        
+        이 면접을 바탕으로 다음 형식으로 분석해주세요:
+        
+        **면접 분석 결과**
+        1. **답변 품질**: 전반적인 답변의 구체성과 성의
+        2. **전공 적합성**: 지원 분야에 대한 이해도와 열정
+        3. **성장 가능성**: 잠재력과 발전 가능성
+        4. **개선 제안**: 향후 면접이나 준비 시 고려사항
+        5. **총평**: 한줄 요약
+        
+        객관적이고 건설적인 피드백을 제공해주세요.
+        """
+        
+        messages = [{"role": "user", "content": analysis_prompt}]
+        async with self._llm_slot(BACKGROUND_USER, self._estimate_input_tokens(messages)):
+            ai_feedback = await self.llm.generate(messages)
+        return {**snapshot, "ai_feedback": ai_feedback.strip()}
+    
+    async def _aggregate_interview(self, snapshot: Dict) -> Dict:
+        """면접 중 매긴 답변별 점수를 집계해 분석 결과 생성 (남은 답변만 채점하므로 면접 길이와 무관)"""
+        turn_scores = [dict(entry) for entry in snapshot.get("turn_scores", [])]
+        score_totals = {area: list(total) for area, total in snapshot.get("score_totals", {}).items()}
+        scored = await self._score_pending(
+            snapshot["conversation_log"], snapshot["interview_type"], snapshot.get("scored_answers", 0),
+            turn_scores, score_totals
+        )
+        return self._score_report(snapshot, turn_scores, score_totals, scored)
+    
+    def _score_report(self, snapshot: Dict, turn_scores: List[Dict], score_totals: Dict[str, List[float]],
+                      scored: int) -> Dict:
+        focus_areas = self.personalized_prompt_manager.get_focus_areas(snapshot["interview_type"])
+        aggregate = aggregate_scores(score_totals, focus_areas, scored)
+        return {
+            **snapshot,
+            "turn_scores": turn_scores,
+            "scores": aggregate,
+            "ai_feedback": compose_feedback(aggregate, turn_scores, snapshot.get("basic_feedback")),
+        }
+    
+    def _analysis_failed(self, snapshot: Dict, error: Exception) -> Dict:
+        """AI 분석에 끝내 실패했을 때의 결과 (기본 피드백과, 있으면 면접 중 채점한 점수만 포함)"""
+        print(f"AI 피드백 생성 오류: {error}")
+        if self.turn_scoring_enabled and snapshot.get("scored_answers"):
+            return self._score_report(
+                snapshot, snapshot["turn_scores"], snapshot["score_totals"], snapshot["scored_answers"]
+            )
+        return {**snapshot, "ai_feedback": "AI 피드백 생성 중 오류가 발생했습니다."}
+    
+    async def _delete_session(self, session_id: str):
+        """세션과 이 워커의 관련 자원 정리"""
+        await self.session_store.delete_session(session_id)
+        self._release_session(session_id)
+        print(f"✅ 면접 종료: {session_id}")
     
     def _format_conversation_for_analysis(self, conversation_history: List[Dict]) -> str:
         """대화 이력을 분석용으로 포맷팅"""
@@ -451,16 +1481,28 @@ class InterviewOrchestrator:
         
         return "\n\n".join(formatted_conversation)
     
-    def _generate_basic_feedback(self, session: InterviewSession) -> str:
-        """기본 피드백 생성"""
-        total_responses = len([msg for msg in session.conversation_history if msg["role"] == "user"])
+    def _generate_basic_feedback(self, session: InterviewSession, answer_summary: Optional[Dict] = None) -> str:
+        """기본 피드백 생성 (답변 수와 답변 사전 분석 요약 기준)"""
+        total_responses = len([msg for msg in session.conversation_history if msg.role == "user"])
+        summary = answer_summary or {}
         
-        if total_responses >= 5:
-            return "면접에 적극적으로 참여해주셨습니다. 답변이 구체적이고 성의있게 작성되었습니다."
+        if total_responses >= 5 and not summary.get("too_short") and not summary.get("vague"):
+            feedback = "면접에 적극적으로 참여해주셨습니다. 답변이 구체적이고 성의있게 작성되었습니다."
         elif total_responses >= 3:
-            return "면접에 참여해주셔서 감사합니다. 더 구체적인 예시와 경험을 공유해주시면 더 좋을 것 같습니다."
+            feedback = "면접에 참여해주셔서 감사합니다. 더 구체적인 예시와 경험을 공유해주시면 더 좋을 것 같습니다."
         else:
-            return "더 구체적이고 상세한 답변을 통해 자신을 어필해보세요."
+            feedback = "더 구체적이고 상세한 답변을 통해 자신을 어필해보세요."
+        
+        notes = []
+        if summary.get("too_short"):
+            notes.append(f"{summary['answers']}개 답변 중 {summary['too_short']}개가 매우 짧았습니다.")
+        if summary.get("vague"):
+            notes.append(f"{summary['vague']}개 답변에 구체적인 사례나 근거가 부족했습니다.")
+        if summary.get("off_topic"):
+            notes.append(f"{summary['off_topic']}개 답변이 질문과 관련이 적었습니다.")
+        if summary.get("keyword_overlap") is not None and summary["keyword_overlap"] < 0.2:
+            notes.append("관심 분야와 키워드를 답변에서 더 드러내 보세요.")
+        return " ".join([feedback] + notes)
 
 # 사용 예시 및 테스트 함수
 async def test_personalized_interview():
@@ -507,5 +1549,5 @@ async def test_personalized_interview():
     print(f"- AI 피드백:\n{result['ai_feedback']}")
 
 if __name__ == "__main__":
-    print("🚀 AI 면접 시스템 (Gemini 1.5 Pro) 시작...")
+    print("🚀 AI 면접 시스템 시작...")
     asyncio.run(test_personalized_interview()) 
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+class AnalysisJobQueue:
+    """면접 종료 분석 작업 큐
+
+    /api/interview/end 요청이 전체 대화 분석을 기다리지 않도록, 분석을 작업으로 등록하고
+    작업 ID를 바로 돌려줍니다. 워커 태스크들이 동시 실행 수(ANALYSIS_WORKERS)를 지키며
+    작업을 처리하고, 실패하면 지수 백오프로 재시도(ANALYSIS_MAX_RETRIES)합니다.
+    작업 상태와 결과는 세션 저장소에 보관되므로 클라이언트가 시간 초과로 끊겨도
+    GET /api/interview/analysis/{job_id} 로 다시 가져갈 수 있습니다.
+    서버가 재시작되면 start() 가 저장소에 queued/running 으로 남은 작업을 찾아 큐에 다시 넣습니다.
+    """
+
+    def __init__(self, analyze: Callable[[Dict], Awaitable[Dict]],
+                 on_failure: Callable[[Dict, Exception], Dict], store,
+                 concurrency: Optional[int] = None, max_retries: Optional[int] = None,
+                 on_finished: Optional[Callable[[Dict], Awaitable[None]]] = None):
+        self.analyze = analyze
+        self.on_failure = on_failure
+        self.store = store
+        # 작업이 끝나면 호출 (영구 저장소 기록 등)
+        self.on_finished = on_finished
+        self.concurrency = concurrency or int(os.getenv('ANALYSIS_WORKERS', 2))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('ANALYSIS_MAX_RETRIES', 2))
+        self.retry_base_delay = float(os.getenv('ANALYSIS_RETRY_DELAY_SECONDS', 1.0))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._recovery: Optional[asyncio.Task] = None
+        # 현재 큐에 들어 있거나 처리 중인 작업 ID (복구 시 중복 등록 방지)
+        self._enqueued: Set[str] = set()
+        # 이 워커에서 처리 중인 작업의 완료 이벤트 (WebSocket 푸시용)
+        self._done_events: Dict[str, asyncio.Event] = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.recovered = 0
+
+    def start(self):
+        """워커 태스크 시작 (이벤트 루프 안에서 호출) - 큐를 새로 만들 때는 끝나지 못한 작업도 복구"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._enqueued = set()
+            self._recovery = asyncio.create_task(self._recover())
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def stop(self):
+        """워커 태스크 종료"""
+        if self._recovery:
+            self._recovery.cancel()
+            self._recovery = None
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        # 대기 중인 작업은 저장소에 queued 상태로 남고, 다음 start() 때 새 이벤트 루프에 큐를 다시 만들어 복구
+        self._queue = None
+
+    async def submit(self, snapshot: Dict) -> Dict:
+        """분석 작업 등록 - 저장된 작업 정보를 바로 반환"""
+        self.start()
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "session_id": snapshot["session_id"],
+            "status": "queued",
+            "attempts": 0,
+            "created_at": datetime.now().isoformat(),
+            "snapshot": snapshot,
+        }
+        await self.store.save_job(job)
+        await self._enqueue(job["job_id"])
+        return self._public(job)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태와 (완료 시) 결과 조회"""
+        job = await self.store.get_job(job_id)
+        return self._public(job) if job else None
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """이 워커에 등록된 작업이 끝날 때까지 대기 후 결과 반환"""
+        event = self._done_events.get(job_id)
+        if event:
+            await asyncio.wait_for(event.wait(), timeout)
+        return await self.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "recovered": self.recovered,
+        }
+
+    async def _enqueue(self, job_id: str):
+        if job_id in self._enqueued:
+            return
+        self._enqueued.add(job_id)
+        self._done_events[job_id] = asyncio.Event()
+        await self._queue.put(job_id)
+
+    async def _recover(self):
+        """저장소에 queued/running 으로 남은 작업(재시작 전에 끝나지 못한 작업)을 등록 순서대로 큐에 다시 넣음"""
+        try:
+            jobs = await self.store.list_jobs(("queued", "running"))
+        except Exception as e:
+            print(f"경고: 끝나지 않은 분석 작업을 복구하지 못했습니다: {e}")
+            return
+        jobs = sorted((job for job in jobs if job["job_id"] not in self._enqueued), key=lambda job: job["created_at"])
+        for job in jobs:
+            await self._enqueue(job["job_id"])
+        self.recovered += len(jobs)
+        if jobs:
+            print(f"🔁 끝나지 않은 분석 작업 {len(jobs)}개 복구")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"분석 작업 처리 오류: {job_id} - {e}")
+            finally:
+                self._enqueued.discard(job_id)
+                event = self._done_events.pop(job_id, None)
+                if event:
+                    event.set()
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await self.store.get_job(job_id)
+        # 복구된 작업을 다른 워커가 먼저 끝냈으면 건너뜀
+        if not job or job["status"] in ("done", "failed"):
+            return
+
+        while True:
+            job["status"] = "running"
+            job["attempts"] += 1
+            await self.store.save_job(job)
+            try:
+                job["result"] = await self.analyze(job["snapshot"])
+                job["status"] = "done"
+                self.completed += 1
+                break
+            except Exception as e:
+                if job["attempts"] > self.max_retries:
+                    print(f"❌ 분석 작업 실패: {job_id} - {e}")
+                    job["result"] = self.on_failure(job["snapshot"], e)
+                    job["status"] = "failed"
+                    job["error"] = str(e)
+                    self.failed += 1
+                    break
+                # 지수 백오프 + 지터 후 재시도
+                self.retried += 1
+                delay = self.retry_base_delay * (2 ** (job["attempts"] - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+        job["finished_at"] = datetime.now().isoformat()
+        # 결과에 대화록이 모두 담기므로 원본 스냅샷은 지움
+        job.pop("snapshot", None)
+        await self.store.save_job(job)
+        if self.on_finished:
+            try:
+                await self.on_finished(job)
+            except Exception as e:
+                print(f"분석 결과 저장 오류: {job_id} - {e}")
+        print(f"✅ 분석 작업 완료: {job_id} ({job['status']})")
+
+    def _public(self, job: Dict) -> Dict:
+        return {key: value for key, value in job.items() if key != "snapshot"}
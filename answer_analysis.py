@@ -0,0 +1,212 @@
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 구체적인 답변에 자주 나오는 표현 (수치, 예시, 직접 한 경험)과 막연한 답변에 자주 나오는 표현
+_SPECIFIC = re.compile(r"\d+|예를 ?들|예컨대|실제로|직접|경험|실험|프로젝트|대회|때문|했(?:습니다|어요|다|는데)")
+_VAGUE = re.compile(r"그냥|잘 ?모르|모르겠|열심히|최선|아마|등등|그런 것|뭔가")
+_WORDS = re.compile(r"\w+")
+
+# (면접관 질문, 지원자 답변, 프로필 키워드/관심 분야)
+AnswerItem = Tuple[str, str, Sequence[str]]
+
+
+class CharNgramVectorizer:
+    """scikit-learn 이 없을 때 쓰는 대체 벡터화 - HashingVectorizer(analyzer="char_wb") 와 같은 n-gram
+
+    단어마다 앞뒤에 공백을 붙여 문자 n-gram 을 세고 L2 정규화한 {n-gram: 가중치} 를 돌려줍니다.
+    해싱하지 않으므로 충돌이 없고, 코사인 유사도는 scikit-learn 결과와 (해시 충돌 차이만큼) 같습니다.
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 3)):
+        self.ngram_range = ngram_range
+
+    def _ngrams(self, text: str) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        min_n, max_n = self.ngram_range
+        for word in text.lower().split():
+            word = f" {word} "
+            for n in range(min_n, max_n + 1):
+                # 단어가 n 보다 짧으면 단어 전체를 한 번만 셈 (scikit-learn 과 같게)
+                for offset in range(max(1, len(word) - n + 1)):
+                    gram = word[offset:offset + n]
+                    counts[gram] = counts.get(gram, 0.0) + 1.0
+                if len(word) <= n:
+                    break
+        norm = float(np.sqrt(sum(value * value for value in counts.values())))
+        return {gram: value / norm for gram, value in counts.items()} if norm else counts
+
+    def encode(self, texts: List[str]) -> List[Dict[str, float]]:
+        return [self._ngrams(text) for text in texts]
+
+
+class AnswerAnalyzer:
+    """LLM 호출 전에 답변을 로컬에서 빠르게 분석하는 사전 분석기
+
+    답변마다 길이, 구체성(수치/예시/경험 표현 대 막연한 표현), 프로필 키워드·관심 분야 언급 비율,
+    질문과의 유사도(문자 2~3-gram 해싱 벡터의 코사인)를 계산하고, 짧거나 막연하거나 질문과 관련이
+    적은 답변이면 면접관이 구체적인 예시를 묻도록 이번 턴 메시지에 안내를 덧붙입니다.
+    analyze() 는 같은 이벤트 루프 반복(ANSWER_ANALYSIS_BATCH_WINDOW_MS) 안에 들어온 모든 세션의
+    답변을 모아 한 번의 벡터화로 처리합니다. 벡터화는 scikit-learn HashingVectorizer 를 쓰고,
+    없으면 같은 n-gram 을 직접 세는 CharNgramVectorizer 로 대체합니다.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('ANSWER_ANALYSIS', 'true').lower() == 'true'
+        self.batch_window = float(os.getenv('ANSWER_ANALYSIS_BATCH_WINDOW_MS', 1)) / 1000
+        self.max_batch = int(os.getenv('ANSWER_ANALYSIS_MAX_BATCH', 256))
+        self.min_chars = int(os.getenv('ANSWER_MIN_CHARS', 30))
+        self.vague_specificity = float(os.getenv('ANSWER_VAGUE_SPECIFICITY', 0.3))
+        self.offtopic_similarity = float(os.getenv('ANSWER_OFFTOPIC_SIMILARITY', 0.05))
+
+        self._vectorizer = None
+        self._pending: List[Tuple[AnswerItem, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self.batches = 0
+        self.answers = 0
+        self._batch_us: deque = deque(maxlen=1000)  # 배치별 (소요 시간 µs, 답변 수)
+
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            try:
+                from sklearn.feature_extraction.text import HashingVectorizer
+
+                self._vectorizer = HashingVectorizer(
+                    analyzer="char_wb", ngram_range=(2, 3), n_features=2 ** 18, alternate_sign=False, norm="l2"
+                )
+            except ImportError as e:
+                print(f"경고: scikit-learn 을 사용할 수 없어 대체 n-gram 벡터화로 답변을 분석합니다. ({e})")
+                self._vectorizer = CharNgramVectorizer()
+        return self._vectorizer
+
+    def _vectorize(self, texts: List[str]):
+        vectorizer = self.vectorizer
+        if hasattr(vectorizer, "transform"):
+            return vectorizer.transform(texts)
+        return vectorizer.encode(texts)
+
+    @staticmethod
+    def _rowwise_cosine(a, b) -> np.ndarray:
+        """행마다 정규화된 두 행렬의 같은 행끼리 코사인 유사도 (희소 행렬, 또는 대체 벡터화의 {n-gram: 가중치} 목록)"""
+        if hasattr(a, "multiply"):
+            return np.asarray(a.multiply(b).sum(axis=1)).ravel()
+        return np.array([sum(weight * right.get(gram, 0.0) for gram, weight in left.items())
+                         for left, right in zip(a, b)])
+
+    def features(self, items: List[AnswerItem]) -> List[Dict]:
+        """답변 묶음의 특징을 한 번에 계산 (동기 - 답변당 수십 µs)"""
+        if not items:
+            return []
+        started = time.perf_counter()
+        questions = [question for question, _, _ in items]
+        answers = [re.sub(r"\s+", " ", answer).strip() for _, answer, _ in items]
+
+        matrix = self._vectorize(answers + questions)
+        relevance = self._rowwise_cosine(matrix[:len(items)], matrix[len(items):])
+        chars = np.array([len(answer) for answer in answers])
+        words = np.array([len(_WORDS.findall(answer)) for answer in answers])
+        specific = np.array([len(_SPECIFIC.findall(answer)) for answer in answers])
+        vague = np.array([len(_VAGUE.findall(answer)) for answer in answers])
+        # 구체적인 표현은 더하고 막연한 표현은 빼되, 짧은 답변은 표현과 관계없이 낮게
+        specificity = np.clip(0.3 + 0.15 * specific - 0.2 * vague, 0.0, 1.0) * np.minimum(1.0, words / 15)
+
+        results = []
+        for index, (_, answer, keywords) in enumerate(items):
+            terms = [term.strip().lower() for term in keywords if term and term.strip()]
+            lowered = answers[index].lower()
+            overlap = sum(1 for term in terms if term in lowered) / len(terms) if terms else None
+            flags = []
+            if chars[index] < self.min_chars:
+                flags.append("too_short")
+            elif specificity[index] < self.vague_specificity:
+                flags.append("vague")
+            if chars[index] >= self.min_chars and relevance[index] < self.offtopic_similarity and not overlap:
+                flags.append("off_topic")
+            results.append({
+                "chars": int(chars[index]),
+                "words": int(words[index]),
+                "specificity": round(float(specificity[index]), 3),
+                "keyword_overlap": round(overlap, 3) if overlap is not None else None,
+                "relevance": round(float(relevance[index]), 3),
+                "flags": flags,
+            })
+
+        self.batches += 1
+        self.answers += len(items)
+        self._batch_us.append(((time.perf_counter() - started) * 1e6, len(items)))
+        return results
+
+    async def analyze(self, question: str, answer: str, keywords: Sequence[str]) -> Dict:
+        """답변 하나 분석 - 같은 시점에 들어온 다른 세션의 답변과 묶어 처리"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((question, answer, keywords), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        try:
+            results = self.features([item for item, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def guidance(features: Dict) -> str:
+        """분석 결과에 따라 이번 턴 메시지에 덧붙일 면접관 안내 (문제가 없으면 빈 문자열)"""
+        notes = []
+        if "too_short" in features["flags"]:
+            notes.append("답변이 매우 짧습니다. 구체적인 예시나 직접 겪은 경험을 들어 더 설명하도록 유도해주세요.")
+        if "vague" in features["flags"]:
+            notes.append("답변에 구체적인 사례나 근거가 부족합니다. 실제 경험, 수치, 예시를 물어봐 주세요.")
+        if "off_topic" in features["flags"]:
+            notes.append("답변이 질문과 관련이 적어 보입니다. 질문의 핵심으로 부드럽게 되돌려 주세요.")
+        if not notes:
+            return ""
+        return "[답변 사전 분석]\n" + "\n".join(f"- {note}" for note in notes)
+
+    @staticmethod
+    def summarize(features: List[Dict]) -> Dict:
+        """면접 전체 답변의 특징 요약 (최종 분석 보고서용)"""
+        if not features:
+            return {"answers": 0}
+        overlaps = [f["keyword_overlap"] for f in features if f["keyword_overlap"] is not None]
+        return {
+            "answers": len(features),
+            "avg_chars": round(float(np.mean([f["chars"] for f in features])), 1),
+            "avg_specificity": round(float(np.mean([f["specificity"] for f in features])), 3),
+            "avg_relevance": round(float(np.mean([f["relevance"] for f in features])), 3),
+            "keyword_overlap": round(float(np.mean(overlaps)), 3) if overlaps else None,
+            "too_short": sum(1 for f in features if "too_short" in f["flags"]),
+            "vague": sum(1 for f in features if "vague" in f["flags"]),
+            "off_topic": sum(1 for f in features if "off_topic" in f["flags"]),
+        }
+
+    def stats(self) -> Dict:
+        spent = sum(us for us, _ in self._batch_us)
+        counted = sum(count for _, count in self._batch_us)
+        return {
+            "enabled": self.enabled,
+            "vectorizer": type(self._vectorizer).__name__ if self._vectorizer is not None else None,
+            "batches": self.batches,
+            "answers": self.answers,
+            "avg_batch_size": round(self.answers / self.batches, 2) if self.batches else 0.0,
+            "us_per_answer": round(spent / counted, 1) if counted else 0.0,
+        }
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 import asyncio
+import time
 import uuid
 import json
 from datetime import datetime
@@ -12,6 +14,12 @@ import os
 from dotenv import load_dotenv
 
 from ai_interviewer_system_lite import InterviewOrchestrator
+from batch_simulation import BatchSimulation, read_items
+from connection_manager import ConnectionManager
+from document_store import UploadTooLarge
+from llm_scheduler import LLMOverloaded
+from loop_monitor import LoopLagMonitor
+from metrics import REGISTRY
 
 # 환경 변수 로드
 load_dotenv()
@@ -31,9 +39,65 @@ app.add_middleware(
 security = HTTPBearer()
 SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret-key-for-development')
 
-# 전역 변수
-interview_orchestrator = InterviewOrchestrator()
-active_connections: Dict[str, WebSocket] = {}
+# 전역 변수 - 오케스트레이터(LLM 백엔드, 저장소 등)는 import 시점이 아니라 서버 시작(startup) 시 생성
+interview_orchestrator: Optional[InterviewOrchestrator] = None
+document_store = None
+# 준비 상태 - 시작 후 warm-up 이 끝나야 /api/health/ready 가 200 (로드 밸런서는 준비된 워커로만 라우팅)
+readiness: Dict = {"ready": False, "phase": "starting", "started_at": time.time()}
+loop_monitor = LoopLagMonitor()
+# 이 워커의 WebSocket 연결 - REST 요청이 만든 이벤트는 이벤트 버스를 거쳐 소켓을 가진 워커가 전달
+connections = ConnectionManager()
+background_tasks: set = set()  # 완료 전에 GC되지 않도록 참조 보관
+# 모의 면접 일괄 생성 (배치 ID -> 실행 상태) - 입력/결과 파일은 BATCH_DIR/{배치 ID}/ 에 보관
+BATCH_DIR = os.getenv('BATCH_DIR', 'batches')
+batch_runs: Dict[str, BatchSimulation] = {}
+batch_tasks: Dict[str, asyncio.Task] = {}
+
+# /metrics 에서 렌더링 시점에 읽는 게이지
+REGISTRY.gauge("llm_executor_queue_depth", "LLM 스레드 풀 대기 중인 호출 수",
+               lambda: interview_orchestrator.llm_executor.stats()["queue_depth"])
+REGISTRY.gauge("llm_executor_in_flight", "LLM 스레드 풀에서 실행 중인 호출 수",
+               lambda: interview_orchestrator.llm_executor.stats()["in_flight"])
+REGISTRY.gauge("llm_executor_abandoned", "호출자가 포기했지만 스레드 풀에서 아직 실행 중인 호출 수",
+               lambda: interview_orchestrator.llm_executor.stats()["abandoned"])
+REGISTRY.gauge("llm_scheduler_queued", "LLM 호출 차례를 기다리는 요청 수",
+               lambda: interview_orchestrator.llm_scheduler.stats()["queued"])
+REGISTRY.gauge("llm_scheduler_active", "LLM 호출 슬롯을 점유한 요청 수",
+               lambda: interview_orchestrator.llm_scheduler.stats()["active"])
+REGISTRY.gauge("llm_circuit_open", "LLM 회로 차단기가 열려 있으면 1",
+               lambda: 0 if interview_orchestrator.llm.breaker.state == "closed" else 1)
+REGISTRY.gauge("active_websockets", "연결된 WebSocket 수", lambda: len(connections))
+REGISTRY.gauge("websocket_send_queue_frames", "WebSocket 송신 대기열에 쌓인 프레임 수",
+               lambda: connections.stats()["queued_frames"])
+REGISTRY.gauge("event_loop_lag_max_seconds", "측정 구간 내 이벤트 루프 최대 지연",
+               lambda: loop_monitor.stats()["max_ms"] / 1000)
+
+@app.middleware("http")
+async def readiness_gate(request, call_next):
+    """오케스트레이터가 아직 없으면(시작 전, 시작 실패) API 요청은 503"""
+    path = request.url.path
+    if interview_orchestrator is None and path.startswith("/api/") and not path.startswith("/api/health"):
+        return JSONResponse(
+            status_code=503, content={"detail": "서버를 준비하는 중입니다. 잠시 후 다시 시도해주세요."},
+            headers={"Retry-After": "1"}
+        )
+    return await call_next(request)
+
+def queue_status_frame(event: Dict) -> Dict:
+    """오케스트레이터의 queued/overloaded 이벤트를 클라이언트용 queue_status 프레임으로 변환"""
+    if event["type"] == "queued":
+        return {
+            "type": "queue_status",
+            "status": "waiting",
+            "position": event["position"],
+            "message": f"요청이 많아 대기 중입니다. (대기 순번 {event['position']})"
+        }
+    return {
+        "type": "queue_status",
+        "status": "overloaded",
+        "message": event["content"],
+        "retry_after": event["retry_after"]
+    }
 
 # 기존 요청/응답 모델
 class InterviewStartRequest(BaseModel):
@@ -43,11 +107,16 @@ class InterviewStartRequest(BaseModel):
 class InterviewResponse(BaseModel):
     session_id: str
     question: str
+    seq: int = 1  # 오프닝 질문은 대화 이력의 첫 턴
 
 class UserResponseRequest(BaseModel):
     session_id: str
     response: str
 
+class DraftRequest(BaseModel):
+    session_id: str
+    content: str
+
 class AnalysisResult(BaseModel):
     session_id: str
     interview_type: str
@@ -55,6 +124,14 @@ class AnalysisResult(BaseModel):
     total_exchanges: int
     feedback: str
     scores: Optional[Dict] = None
+    answer_analysis: Optional[Dict] = None  # 답변 사전 분석 요약 (평균 길이/구체성, 짧거나 막연한 답변 수 등)
+
+class AnalysisJobResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: str  # 'queued', 'running', 'done', 'failed'
+    result: Optional[AnalysisResult] = None
+    error: Optional[str] = None
 
 class LoginRequest(BaseModel):
     username: str
@@ -62,11 +139,13 @@ class LoginRequest(BaseModel):
 
 # 새로운 모델 - 개인화된 면접
 class UploadedFile(BaseModel):
-    id: Optional[str] = None
+    id: Optional[str] = None  # POST /api/interview/files 가 돌려준 파일 ID
     name: str
-    type: str
-    content: str
-    size: int
+    type: str = ""
+    size: int = 0
+    chars: int = 0  # 추출된 텍스트 길이
+    preview: str = ""  # 추출된 텍스트 앞부분
+    content: Optional[str] = None  # (호환용) 본문에 직접 담은 파일 내용 - 저장 시 문서로 옮기고 비움
 
 class InterviewProfile(BaseModel):
     id: Optional[str] = None
@@ -77,6 +156,7 @@ class InterviewProfile(BaseModel):
     additionalStyle: str  # 추가 요청사항
     uploadedFiles: List[UploadedFile] = []
     difficulty: Optional[str] = None  # 면접 난이도 ('elementary', 'middle', 'high', 'professional', 'public')
+    responseCache: bool = False  # 반복 연습 모드 - 비슷한 답변에는 저장된 면접관 응답 재사용
     createdAt: Optional[datetime] = None
 
 class PersonalizedInterviewRequest(BaseModel):
@@ -116,6 +196,52 @@ async def login(request: LoginRequest):
         return {"access_token": token, "token_type": "bearer", "user_id": user_id}
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
+async def resolve_uploaded_files(profile: InterviewProfile):
+    """프로필의 업로드 파일을 ID + 추출 메타데이터만 담도록 정리
+    
+    파일 내용을 JSON 본문에 직접 담아 보내는 기존 클라이언트의 파일은 문서 저장소로 옮깁니다.
+    """
+    resolved = []
+    for file in profile.uploadedFiles:
+        if file.content is not None:
+            metadata = await document_store.save_text(file.name, file.type, file.content)
+        elif file.id:
+            metadata = await document_store.get(file.id)
+            if metadata is None:
+                raise HTTPException(status_code=400, detail=f"업로드된 파일을 찾을 수 없습니다: {file.id}")
+        else:
+            raise HTTPException(status_code=400, detail=f"파일 ID 또는 내용이 필요합니다: {file.name}")
+        resolved.append(UploadedFile(**metadata))
+    profile.uploadedFiles = resolved
+
+# 새로운 API - 업로드 파일
+@app.post("/api/interview/files", response_model=UploadedFile)
+async def upload_interview_file(
+    file: UploadFile = File(...),
+    user_id: str = Depends(optional_auth)
+):
+    """자기소개서/보고서 파일 업로드 - 프로필에는 반환된 파일 ID 를 담아 보냄"""
+    try:
+        metadata = await document_store.save_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"파일 업로드 실패: {str(e)}")
+    finally:
+        await file.close()
+    return UploadedFile(**metadata)
+
+@app.get("/api/interview/files/{file_id}", response_model=UploadedFile)
+async def get_interview_file(
+    file_id: str,
+    user_id: str = Depends(optional_auth)
+):
+    """업로드 파일 메타데이터 조회"""
+    metadata = await document_store.get(file_id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    return UploadedFile(**metadata)
+
 # 새로운 API - 프로필 관리
 @app.post("/api/interview/profile", response_model=ProfileResponse)
 async def save_interview_profile(
@@ -123,6 +249,7 @@ async def save_interview_profile(
     user_id: str = Depends(optional_auth)
 ):
     """면접 프로필 저장"""
+    await resolve_uploaded_files(request.profile)
     try:
         profile_id = str(uuid.uuid4())
         profile = request.profile
@@ -130,7 +257,7 @@ async def save_interview_profile(
         profile.createdAt = datetime.now()
         
         # 프로필 저장 (메모리에 임시 저장, 실제로는 DB에 저장해야 함)
-        interview_orchestrator.save_profile(profile_id, profile)
+        await interview_orchestrator.save_profile(profile_id, profile, user_id=user_id)
         
         return ProfileResponse(
             profile_id=profile_id,
@@ -147,6 +274,7 @@ async def start_personalized_interview(
 ):
     """개인화된 면접 시작"""
     session_id = str(uuid.uuid4())
+    await resolve_uploaded_files(request.profile)
     
     try:
         opening_question = await interview_orchestrator.start_personalized_interview(
@@ -202,54 +330,198 @@ async def respond_to_question(
     request: UserResponseRequest,
     user_id: str = Depends(optional_auth)
 ):
-    """사용자 응답 처리"""
+    """사용자 응답 처리 - seq 는 다음 질문의 대화 이력 순번"""
     try:
-        next_question = await interview_orchestrator.process_response(
+        turn = await interview_orchestrator.process_turn(
             session_id=request.session_id,
             user_response=request.response
         )
         
-        # WebSocket으로 실시간 응답 전송
-        if request.session_id in active_connections:
-            try:
-                await active_connections[request.session_id].send_text(
-                    json.dumps({
-                        "type": "question",
-                        "content": next_question,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                )
-            except Exception as ws_error:
-                print(f"WebSocket 전송 오류: {ws_error}")
+        # WebSocket으로 실시간 응답 전송 (소켓이 다른 워커에 있어도 이벤트 버스로 전달)
+        await connections.publish(request.session_id, {
+            "type": "question",
+            "content": turn["content"],
+            "seq": turn["seq"],
+            "timestamp": datetime.now().isoformat()
+        })
         
-        return {"question": next_question}
+        return {"question": turn["content"], "seq": turn["seq"]}
+    except LLMOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/interview/end", response_model=AnalysisResult)
+@app.post("/api/interview/respond/stream")
+async def respond_to_question_stream(
+    request: UserResponseRequest,
+    user_id: str = Depends(optional_auth)
+):
+    """사용자 응답 처리 - Server-Sent Events 로 토큰 단위 스트리밍
+    
+    생성 중에는 ai_question_delta 이벤트를, 마지막에 전체 텍스트와 턴 순번(seq)을 담은 ai_question 이벤트를 보냅니다.
+    LLM 호출 차례를 기다리거나 대기열이 가득 차면 queue_status 이벤트를 보냅니다.
+    """
+    async def event_stream():
+        async for event in interview_orchestrator.process_response_stream(
+            session_id=request.session_id,
+            user_response=request.response
+        ):
+            if event["type"] in ("queued", "overloaded"):
+                payload = queue_status_frame(event)
+                yield f"event: queue_status\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                continue
+            frame_type = "ai_question_delta" if event["type"] == "delta" else "ai_question"
+            payload = {
+                "type": frame_type,
+                "content": event["content"],
+                "timestamp": datetime.now().isoformat()
+            }
+            if event["type"] == "final":
+                payload["seq"] = event["seq"]
+            yield f"event: {frame_type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            
+            # WebSocket이 연결되어 있으면 완성된 질문도 함께 전송
+            if event["type"] == "final":
+                await connections.publish(request.session_id, {
+                    "type": "question",
+                    "content": event["content"],
+                    "seq": event["seq"],
+                    "timestamp": payload["timestamp"]
+                })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/interview/draft")
+async def submit_draft(
+    request: DraftRequest,
+    user_id: str = Depends(optional_auth)
+):
+    """작성 중인 답변 초안 (WebSocket typing_partial 과 동일) - enabled 가 false 면 보낼 필요 없음"""
+    interview_orchestrator.submit_draft(request.session_id, request.content)
+    return {"enabled": interview_orchestrator.speculation.enabled}
+
+def to_analysis_job_response(job: Dict) -> AnalysisJobResponse:
+    """저장된 분석 작업을 API 응답 형식으로 변환"""
+    result = job.get("result")
+    return AnalysisJobResponse(
+        job_id=job["job_id"],
+        session_id=job["session_id"],
+        status=job["status"],
+        result=AnalysisResult(
+            session_id=result["session_id"],
+            interview_type=result["interview_type"],
+            duration_minutes=result["duration_minutes"],
+            total_exchanges=result["total_exchanges"],
+            feedback=result["ai_feedback"],
+            scores=result.get("scores"),
+            answer_analysis=result.get("answer_analysis")
+        ) if result else None,
+        error=job.get("error")
+    )
+
+async def push_analysis_when_done(session_id: str, job_id: str):
+    """분석이 끝나면 해당 세션의 WebSocket으로 interview_ended 전송"""
+    job = await interview_orchestrator.analysis_jobs.wait(job_id)
+    if job:
+        await connections.publish(session_id, {
+            "type": "interview_ended",
+            "job_id": job_id,
+            "analysis": job.get("result")
+        })
+
+@app.post("/api/interview/end", response_model=AnalysisJobResponse)
 async def end_interview(
     session_id: str,
     user_id: str = Depends(optional_auth)
 ):
-    """면접 종료 및 분석"""
+    """면접 종료 - 분석을 작업 큐에 등록하고 작업 ID를 바로 반환
+    
+    결과는 GET /api/interview/analysis/{job_id} 로 조회하거나 WebSocket의 interview_ended 로 받습니다.
+    """
     try:
-        analysis = await interview_orchestrator.end_interview(session_id)
+        job = await interview_orchestrator.submit_end_interview(session_id)
         
-        if "error" in analysis:
-            raise HTTPException(status_code=404, detail=analysis["error"])
+        if job is None:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
         
-        return AnalysisResult(
-            session_id=analysis["session_id"],
-            interview_type=analysis["interview_type"],
-            duration_minutes=analysis["duration_minutes"],
-            total_exchanges=analysis["total_exchanges"],
-            feedback=analysis["feedback"]
-        )
+        task = asyncio.create_task(push_analysis_when_done(session_id, job["job_id"]))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+        return to_analysis_job_response(job)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/interview/analysis/{job_id}", response_model=AnalysisJobResponse)
+async def get_interview_analysis(
+    job_id: str,
+    user_id: str = Depends(optional_auth)
+):
+    """면접 분석 작업 상태 및 결과 조회 (보관 기간이 지난 결과는 영구 저장소에서 조회)"""
+    job = await interview_orchestrator.analysis_jobs.get(job_id)
+    if job is None:
+        job = await interview_orchestrator.repository.get_analysis(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
+    return to_analysis_job_response(job)
+
+@app.get("/api/interview/history")
+async def list_interview_history(
+    limit: int = 20,
+    before: Optional[datetime] = None,
+    user_id: str = Depends(optional_auth)
+):
+    """사용자의 지난 면접 목록 (최신순, 다음 페이지는 마지막 항목의 started_at 을 before 로 전달)"""
+    interviews = await interview_orchestrator.repository.list_interviews(user_id, min(max(limit, 1), 100), before)
+    return {"interviews": interviews}
+
+@app.get("/api/interview/history/{session_id}")
+async def get_interview_transcript(
+    session_id: str,
+    user_id: str = Depends(optional_auth)
+):
+    """지난 면접의 전체 대화록"""
+    transcript = await interview_orchestrator.repository.get_transcript(session_id)
+    if not transcript:
+        raise HTTPException(status_code=404, detail="대화 기록을 찾을 수 없습니다.")
+    return {"session_id": session_id, "conversation_log": transcript}
+
+@app.get("/api/interview/{session_id}/turns")
+async def get_interview_turns(
+    session_id: str,
+    after: int = 0,
+    user_id: str = Depends(optional_auth)
+):
+    """진행 중인 면접에서 순번 after 뒤의 대화 턴 (새로고침, 끊긴 스트림 뒤 이력 동기화용)"""
+    replay = await interview_orchestrator.get_turns_since(session_id, after)
+    if replay is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    return {"session_id": session_id, **replay}
+
+@app.put("/api/interview/{session_id}/trace")
+async def enable_interview_trace(
+    session_id: str,
+    enabled: bool = True,
+    user_id: str = Depends(optional_auth)
+):
+    """세션의 턴별 단계 소요 시간 기록 켜기/끄기"""
+    if not await interview_orchestrator.set_trace(session_id, enabled):
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    return {"session_id": session_id, "trace_enabled": enabled}
+
+@app.get("/api/interview/{session_id}/trace")
+async def get_interview_trace(
+    session_id: str,
+    user_id: str = Depends(optional_auth)
+):
+    """세션의 턴별 단계 소요 시간 기록 조회"""
+    return {"session_id": session_id, "turns": await interview_orchestrator.get_trace(session_id)}
+
 @app.get("/api/interview/types")
 async def get_interview_types():
     """면접 유형 목록 조회"""
@@ -273,80 +545,311 @@ async def get_interview_types():
         ]
     }
 
+# 모의 면접 일괄 생성 (배치 시뮬레이션)
+def batch_path(batch_id: str, name: str = "") -> str:
+    """배치 파일 경로 (배치 ID 는 UUID 만 허용)"""
+    try:
+        batch_id = str(uuid.UUID(batch_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+    return os.path.join(BATCH_DIR, batch_id, name)
+
+def start_batch_run(batch_id: str, options: Dict) -> BatchSimulation:
+    """저장된 입력/옵션으로 배치 실행 시작 (결과 파일이 있으면 남은 면접만 이어서 진행)"""
+    simulation = BatchSimulation(
+        interview_orchestrator,
+        batch_path(batch_id, "input.jsonl"),
+        batch_path(batch_id, "results.jsonl"),
+        concurrency=options.get("concurrency"),
+        turns_per_minute=options.get("turns_per_minute"),
+        analyze=options.get("analyze", False),
+        parquet_path=batch_path(batch_id, "results.parquet") if options.get("parquet") else None,
+    )
+    batch_runs[batch_id] = simulation
+    task = asyncio.create_task(simulation.run())
+    batch_tasks[batch_id] = task
+    task.add_done_callback(lambda t: batch_tasks.pop(batch_id, None) if batch_tasks.get(batch_id) is t else None)
+    return simulation
+
+@app.post("/api/batch")
+async def start_batch(
+    file: UploadFile = File(...),
+    concurrency: Optional[int] = None,
+    turns_per_minute: Optional[float] = None,
+    analyze: bool = False,
+    parquet: bool = False,
+    user_id: str = Depends(optional_auth)
+):
+    """프로필 + 답변 스크립트 JSONL 로 모의 면접 일괄 생성 시작 - 배치 ID 를 바로 반환"""
+    batch_id = str(uuid.uuid4())
+    input_path = batch_path(batch_id, "input.jsonl")
+    options = {"concurrency": concurrency, "turns_per_minute": turns_per_minute, "analyze": analyze, "parquet": parquet}
+    content = await file.read()
+    await file.close()
+    
+    def save():
+        os.makedirs(os.path.dirname(input_path), exist_ok=True)
+        with open(input_path, "wb") as f:
+            f.write(content)
+        with open(batch_path(batch_id, "options.json"), "w", encoding="utf-8") as f:
+            json.dump(options, f)
+        return read_items(input_path)
+    
+    try:
+        items = await asyncio.get_running_loop().run_in_executor(None, save)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"배치 입력 형식 오류: {e}")
+    start_batch_run(batch_id, options)
+    return {"batch_id": batch_id, "status": "running", "total": len(items)}
+
+@app.get("/api/batch/{batch_id}")
+async def get_batch(batch_id: str, user_id: str = Depends(optional_auth)):
+    """배치 진행 상황과 처리량 보고서 (서버 재시작 등으로 멈춘 배치는 stopped)"""
+    simulation = batch_runs.get(batch_id)
+    if simulation is not None:
+        return {"batch_id": batch_id, **simulation.report()}
+    if not os.path.exists(batch_path(batch_id, "input.jsonl")):
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+    report_path = batch_path(batch_id, "results.jsonl.report.json")
+    report = {}
+    if os.path.exists(report_path):
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+    return {"batch_id": batch_id, **report, "status": "stopped" if report.get("status") != "completed" else "completed"}
+
+@app.post("/api/batch/{batch_id}/resume")
+async def resume_batch(batch_id: str, user_id: str = Depends(optional_auth)):
+    """중단된 배치를 남은 면접부터 이어서 실행"""
+    if batch_id in batch_tasks:
+        raise HTTPException(status_code=409, detail="이미 실행 중인 배치입니다.")
+    options_path = batch_path(batch_id, "options.json")
+    if not os.path.exists(options_path):
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다.")
+    with open(options_path, encoding="utf-8") as f:
+        options = json.load(f)
+    start_batch_run(batch_id, options)
+    return {"batch_id": batch_id, "status": "running"}
+
+@app.get("/api/batch/{batch_id}/results")
+async def download_batch_results(batch_id: str, format: str = "jsonl", user_id: str = Depends(optional_auth)):
+    """배치 결과 다운로드 (jsonl: 면접당 한 줄 - 진행 중에도 완료된 만큼, parquet: 턴당 한 행 - 완료 후)"""
+    if format not in ("jsonl", "parquet"):
+        raise HTTPException(status_code=400, detail="format 은 jsonl 또는 parquet 입니다.")
+    path = batch_path(batch_id, f"results.{format}")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="결과 파일이 아직 없습니다.")
+    media_type = "application/x-ndjson" if format == "jsonl" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=f"batch-{batch_id}.{format}")
+
 # WebSocket 엔드포인트
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
+    """면접 WebSocket - 질문 프레임(ai_question, question)에는 대화 이력 순번 seq 가 붙음
+    
+    다시 연결한 클라이언트는 {"type": "resume", "last_seq": 마지막으로 받은 순번} 을 보내면
+    그 뒤의 턴만 history_replay 로 받습니다. 동기화와 실시간 프레임이 겹칠 수 있으므로 클라이언트는
+    이미 받은 순번 이하의 질문 프레임은 무시합니다.
+    """
+    if interview_orchestrator is None:
+        # 1013: 잠시 후 다시 시도
+        await websocket.close(code=1013)
+        return
     await websocket.accept()
-    active_connections[session_id] = websocket
+    # 보내는 프레임은 모두 연결별 송신 대기열을 거침 (느린 클라이언트가 처리를 막지 않도록)
+    connection = connections.connect(session_id, websocket)
     
     try:
         while True:
             # 클라이언트로부터 메시지 수신
             data = await websocket.receive_text()
             message = json.loads(data)
+            connection.touch(pong=message["type"] == "pong")
+            # 처리하는 동안은 메시지를 받지 않으므로 (LLM 응답, 분석 대기 등) heartbeat 시간 제한을 멈춤
+            with connection.processing():
+                if message["type"] == "ping":
+                    connections.send(connection, json.dumps({"type": "pong"}))
+            
+                elif message["type"] == "resume":
+                    # 재연결 - 세션 저장소에서 클라이언트가 놓친 턴만 다시 전송
+                    replay = await interview_orchestrator.get_turns_since(session_id, int(message.get("last_seq", 0)))
+                    if replay is None:
+                        connections.send(connection, json.dumps({
+                            "type": "error",
+                            "code": "session_not_found",
+                            "message": "세션을 찾을 수 없습니다. 면접을 다시 시작해주세요."
+                        }, ensure_ascii=False))
+                        continue
+                    connections.send(connection, json.dumps({"type": "history_replay", **replay}, ensure_ascii=False))
+            
+                elif message["type"] == "typing_partial":
+                    # 작성 중인 답변 초안 - 추측 실행 모드면 다음 턴 준비를 미리 시작 (응답 없음)
+                    interview_orchestrator.submit_draft(session_id, message.get("content", ""))
             
-            if message["type"] == "user_response":
-                # 사용자 응답 처리
-                try:
-                    next_question = await interview_orchestrator.process_response(
-                        session_id=session_id,
-                        user_response=message["content"]
-                    )
+                elif message["type"] == "user_response":
+                    # 사용자 응답 처리
+                    try:
+                        if message.get("stream"):
+                            # 스트리밍 모드: 토큰 조각을 ai_question_delta 로 먼저 보내고,
+                            # 완성된 질문을 ai_question 으로 마지막에 전송
+                            async for event in interview_orchestrator.process_response_stream(
+                                session_id=session_id,
+                                user_response=message["content"]
+                            ):
+                                if event["type"] in ("queued", "overloaded"):
+                                    connections.send(connection, json.dumps(queue_status_frame(event), ensure_ascii=False))
+                                    continue
+                                frame = {
+                                    "type": "ai_question_delta" if event["type"] == "delta" else "ai_question",
+                                    "content": event["content"],
+                                    "timestamp": datetime.now().isoformat()
+                                }
+                                if event["type"] == "final":
+                                    frame["seq"] = event["seq"]
+                                connections.send(connection, json.dumps(frame))
+                            continue
+                    
+                        async def report_position(position: int):
+                            connections.send(connection, json.dumps(
+                                queue_status_frame({"type": "queued", "position": position}), ensure_ascii=False
+                            ))
+                    
+                        turn = await interview_orchestrator.process_turn(
+                            session_id=session_id,
+                            user_response=message["content"],
+                            on_queued=report_position
+                        )
                     
-                    # 다음 질문 전송
-                    await websocket.send_text(json.dumps({
-                        "type": "ai_question",
-                        "content": next_question,
-                        "timestamp": datetime.now().isoformat()
-                    }))
-                except Exception as e:
-                    await websocket.send_text(json.dumps({
-                        "type": "error",
-                        "message": f"응답 처리 중 오류가 발생했습니다: {str(e)}"
-                    }))
+                        # 다음 질문 전송
+                        connections.send(connection, json.dumps({
+                            "type": "ai_question",
+                            "content": turn["content"],
+                            "seq": turn["seq"],
+                            "timestamp": datetime.now().isoformat()
+                        }))
+                    except LLMOverloaded as e:
+                        connections.send(connection, json.dumps(queue_status_frame(
+                            {"type": "overloaded", "content": str(e), "retry_after": e.retry_after}
+                        ), ensure_ascii=False))
+                    except Exception as e:
+                        connections.send(connection, json.dumps({
+                            "type": "error",
+                            "message": f"응답 처리 중 오류가 발생했습니다: {str(e)}"
+                        }))
             
-            elif message["type"] == "end_interview":
-                # 면접 종료 처리
-                try:
-                    analysis = await interview_orchestrator.end_interview(session_id)
-                    await websocket.send_text(json.dumps({
-                        "type": "interview_ended",
-                        "analysis": analysis
-                    }))
-                    break
-                except Exception as e:
-                    await websocket.send_text(json.dumps({
-                        "type": "error",
-                        "message": f"면접 종료 중 오류가 발생했습니다: {str(e)}"
-                    }))
+                elif message["type"] == "end_interview":
+                    # 면접 종료 처리 - 분석 작업을 등록하고 완료되면 결과 전송
+                    try:
+                        job = await interview_orchestrator.submit_end_interview(session_id)
+                        if job is None:
+                            connections.send(connection, json.dumps({
+                                "type": "error",
+                                "message": "세션을 찾을 수 없습니다."
+                            }))
+                            continue
+                    
+                        connections.send(connection, json.dumps({
+                            "type": "analysis_queued",
+                            "job_id": job["job_id"]
+                        }))
+                        job = await interview_orchestrator.analysis_jobs.wait(job["job_id"])
+                        connections.send(connection, json.dumps({
+                            "type": "interview_ended",
+                            "job_id": job["job_id"],
+                            "analysis": job.get("result")
+                        }, ensure_ascii=False))
+                        break
+                    except Exception as e:
+                        connections.send(connection, json.dumps({
+                            "type": "error",
+                            "message": f"면접 종료 중 오류가 발생했습니다: {str(e)}"
+                        }))
                 
     except WebSocketDisconnect:
-        # 연결 해제 시 정리
-        if session_id in active_connections:
-            del active_connections[session_id]
         print(f"WebSocket 연결 해제: {session_id}")
     except Exception as e:
         print(f"WebSocket 오류: {e}")
-        await websocket.send_text(json.dumps({
+        connections.send(connection, json.dumps({
             "type": "error",
             "message": str(e)
         }))
     finally:
-        # 정리
-        if session_id in active_connections:
-            del active_connections[session_id]
+        # 정리 (남은 프레임을 보낸 뒤 송신 태스크 종료)
+        await connections.disconnect(connection)
+
+@app.on_event("startup")
+async def start_orchestrator():
+    """오케스트레이터 생성, 유휴 세션 정리 등 백그라운드 태스크 시작 후 warm-up 예약"""
+    global interview_orchestrator, document_store
+    started = time.perf_counter()
+    interview_orchestrator = InterviewOrchestrator()
+    document_store = interview_orchestrator.document_store
+    interview_orchestrator.start_background_tasks()
+    await connections.start()
+    loop_monitor.start()
+    readiness["init_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    # warm-up 은 요청을 받기 시작한 뒤 백그라운드로 실행 (그동안 /api/health/ready 는 503)
+    if os.getenv('STARTUP_WARMUP', 'true').lower() == 'true':
+        readiness["phase"] = "warming_up"
+        task = asyncio.create_task(warm_up_orchestrator())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    else:
+        readiness.update(ready=True, phase="ready")
+
+async def warm_up_orchestrator():
+    """첫 요청 전에 프롬프트, 임베딩 모델 등을 미리 준비한 뒤 준비 완료로 표시"""
+    try:
+        readiness["warmup"] = await interview_orchestrator.warm_up()
+    except Exception as e:
+        # 준비 작업은 첫 사용 시 다시 시도되므로 실패해도 요청은 받음
+        print(f"경고: warm-up 실패, 첫 요청에서 다시 준비합니다: {e}")
+        readiness["warmup_error"] = str(e)
+    readiness.update(ready=True, phase="ready")
+    print(f"✅ 서버 준비 완료 ({round((time.time() - readiness['started_at']) * 1000)}ms)")
+
+@app.on_event("shutdown")
+async def shutdown_orchestrator():
+    """서버 종료 시 LLM 백엔드, 스레드 풀과 세션 저장소 정리"""
+    # 종료 중에는 준비되지 않은 워커로 보고 로드 밸런서가 새 요청을 보내지 않게 함
+    readiness.update(ready=False, phase="stopping")
+    await loop_monitor.stop()
+    # 실행 중인 배치는 멈추고, 결과 파일이 남아 있으므로 재시작 후 resume 으로 이어서 실행
+    for task in list(batch_tasks.values()):
+        task.cancel()
+    await asyncio.gather(*batch_tasks.values(), return_exceptions=True)
+    await connections.close()
+    await interview_orchestrator.stop_background_tasks()
+    await interview_orchestrator.llm.close()
+    interview_orchestrator.llm_executor.shutdown()
+    document_store.shutdown()
+    await interview_orchestrator.session_store.close()
 
 # 건강 체크 및 정보 엔드포인트
 @app.get("/api/health")
 async def health_check():
-    """헬스 체크"""
+    """헬스 체크 (프로세스가 살아 있으면 200 - 준비 여부는 ready 항목 또는 /api/health/ready)"""
     return {
         "status": "healthy", 
+        "ready": readiness["ready"],
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0-lite",
         "openai_configured": bool(os.getenv('OPENAI_API_KEY'))
     }
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """liveness - 이벤트 루프가 응답하면 200 (실패 시 재시작 대상)"""
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """readiness - 오케스트레이터 생성과 warm-up 이 끝났으면 200, 아니면 503 (로드 밸런서 라우팅 기준)"""
+    body = {"status": readiness["phase"], **{k: v for k, v in readiness.items() if k != "phase"}}
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content=body, headers={"Retry-After": "1"})
+    return body
+
 @app.get("/")
 async def root():
     return {
@@ -359,13 +862,40 @@ async def root():
 async def system_status():
     """시스템 상태 확인"""
     return {
-        "active_sessions": len(interview_orchestrator.sessions),
-        "active_websockets": len(active_connections),
+        "readiness": readiness,
+        "active_sessions": await interview_orchestrator.session_store.count_sessions(),
+        "session_store": type(interview_orchestrator.session_store).__name__,
+        "session_eviction": interview_orchestrator.session_store.stats(),
+        "active_websockets": len(connections),
+        "websockets": connections.stats(),
+        "llm_executor": interview_orchestrator.llm_executor.stats(),
+        "prompt_cache": interview_orchestrator.personalized_prompt_manager.cache_stats(),
+        "llm_backend": interview_orchestrator.llm.stats(),
+        "llm_scheduler": interview_orchestrator.llm_scheduler.stats(),
+        "speculation": interview_orchestrator.speculation.stats(),
+        "response_cache": interview_orchestrator.response_cache.stats(),
+        "analysis_jobs": interview_orchestrator.analysis_jobs.stats(),
+        "event_loop": loop_monitor.stats(),
+        "documents": document_store.stats(),
+        "retrieval": interview_orchestrator.retrieval.stats(),
+        "answer_analysis": interview_orchestrator.answer_analyzer.stats(),
+        "persistence": interview_orchestrator.repository.stats(),
         "gemini_api_configured": bool(os.getenv('GOOGLE_API_KEY')),
         "openai_api_configured": bool(os.getenv('OPENAI_API_KEY')),  # 호환성 유지
         "environment": os.getenv('DEBUG', 'false')
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 수집용 지표 (턴 처리 단계별 지연 히스토그램, 토큰 수, 기본 질문 사용 횟수 등)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/api/system/status/reset")
+async def reset_system_status():
+    """이벤트 루프 지연 측정값 초기화 (벤치마크 구간 시작 시 사용)"""
+    loop_monitor.reset()
+    return {"status": "reset"}
+
 if __name__ == "__main__":
     import uvicorn
     
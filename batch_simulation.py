@@ -0,0 +1,354 @@
+"""모의 면접 일괄 생성 (배치 시뮬레이션)
+
+프로필과 지원자 답변 스크립트를 담은 JSONL 을 읽어, 여러 면접을 InterviewOrchestrator 로 동시에
+진행하고 결과를 한 줄에 면접 하나씩 JSONL 로 저장합니다. 학급 전체의 면접 연습 자료를 미리 만들 때
+사용하며, 같은 기능을 POST /api/batch 로도 실행할 수 있습니다.
+
+입력 (한 줄에 면접 하나):
+    {"id": "3반-07", "profile": {"type": "university", "institution": "...", ...},
+     "answers": ["첫 번째 답변", "두 번째 답변", ...]}
+    (id 를 생략하면 "line-<줄 번호>")
+
+- 동시 실행: BATCH_CONCURRENCY 개의 워커가 면접을 하나씩 맡아 진행
+- 속도 제한: BATCH_TURNS_PER_MINUTE (0 이면 제한 없음) - 배치 전체의 분당 답변 처리 수.
+  LLM 호출은 모두 BATCH_USER 한 사용자로 스케줄러를 거치므로 실시간 면접과 공정하게 나눠 쓰고,
+  LLM_RPM/LLM_TPM 한도도 그대로 적용됩니다.
+- 이어서 실행: 결과 파일에 성공으로 기록된 id 는 건너뛰므로, 중단된 뒤 같은 명령을 다시 실행하면
+  남은 면접만 진행합니다. (실패한 면접과 끝까지 쓰이지 못한 마지막 줄은 다시 실행)
+- 결과 보고: 진행 중에는 BATCH_PROGRESS_SECONDS 마다 진행률을, 끝나면 처리량(분당 면접 수,
+  초당 답변 수, 답변 지연 p50/p95, 토큰 수)을 출력하고 <결과 파일>.report.json 으로 저장합니다.
+
+사용 예:
+    python batch_simulation.py class_3.jsonl -o results/class_3.jsonl --concurrency 16 \\
+        --turns-per-minute 300 --parquet results/class_3.parquet
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile
+from llm_scheduler import LLMOverloaded, TokenBucket
+
+# 배치 면접의 LLM 호출을 묶는 스케줄러 사용자 ID (실시간 면접 사용자와 라운드 로빈으로 공유)
+BATCH_USER = "__batch__"
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def read_items(input_path: str) -> List[Dict]:
+    """입력 JSONL 읽기 - 형식이 잘못된 줄이 있으면 줄 번호와 함께 ValueError"""
+    items = []
+    seen: Set[str] = set()
+    with open(input_path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{number}번째 줄: JSON 형식 오류 - {e}")
+            if not isinstance(item, dict) or not isinstance(item.get("profile"), dict):
+                raise ValueError(f"{number}번째 줄: profile 이 없습니다.")
+            answers = item.get("answers")
+            if not isinstance(answers, list) or not answers or not all(isinstance(a, str) for a in answers):
+                raise ValueError(f"{number}번째 줄: answers 는 답변 문자열 목록이어야 합니다.")
+            item_id = str(item.get("id") or f"line-{number}")
+            if item_id in seen:
+                raise ValueError(f"{number}번째 줄: 중복된 id - {item_id}")
+            seen.add(item_id)
+            items.append({"id": item_id, "profile": item["profile"], "answers": answers})
+    return items
+
+
+def load_completed(output_path: str) -> Set[str]:
+    """결과 파일에서 성공한 면접 id 목록을 읽고, 실패 기록과 잘린 마지막 줄은 지워 다시 실행할 수 있게 정리"""
+    if not os.path.exists(output_path):
+        return set()
+    completed: Set[str] = set()
+    kept: List[str] = []
+    dropped = 0
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 중단되면서 끝까지 쓰이지 못한 줄
+                dropped += 1
+                continue
+            if record.get("status") == "ok" and record.get("id") not in completed:
+                completed.add(record["id"])
+                kept.append(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                dropped += 1
+    if dropped:
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(kept)
+        os.replace(temp_path, output_path)
+    return completed
+
+
+def write_parquet(output_path: str, parquet_path: str) -> bool:
+    """JSONL 결과를 답변 한 턴당 한 행인 Parquet 표로 변환 (pandas/pyarrow 가 없으면 경고 후 건너뜀)"""
+    try:
+        import pandas as pd
+    except ImportError as e:
+        print(f"경고: Parquet 저장 불가 (pandas 미설치), JSONL 결과만 사용합니다: {e}")
+        return False
+
+    rows = []
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            profile = record.get("profile") or {}
+            for turn, exchange in enumerate(record.get("turns") or [], 1):
+                rows.append({
+                    "id": record["id"],
+                    "type": profile.get("type"),
+                    "institution": profile.get("institution"),
+                    "difficulty": profile.get("difficulty"),
+                    "opening": record.get("opening"),
+                    "turn": turn,
+                    "answer": exchange["answer"],
+                    "question": exchange["question"],
+                    "latency_ms": exchange["latency_ms"],
+                })
+    try:
+        pd.DataFrame(rows).to_parquet(parquet_path, index=False)
+    except ImportError as e:
+        print(f"경고: Parquet 저장 불가 (pyarrow 미설치), JSONL 결과만 사용합니다: {e}")
+        return False
+    return True
+
+
+class BatchSimulation:
+    """JSONL 로 받은 모의 면접들을 워커 풀로 동시에 진행하고 결과를 JSONL 로 기록"""
+
+    def __init__(self, orchestrator: InterviewOrchestrator, input_path: str, output_path: str,
+                 concurrency: Optional[int] = None, turns_per_minute: Optional[float] = None,
+                 analyze: bool = False, parquet_path: Optional[str] = None):
+        self.orchestrator = orchestrator
+        self.input_path = input_path
+        self.output_path = output_path
+        self.parquet_path = parquet_path
+        self.analyze = analyze
+        self.concurrency = concurrency or int(os.getenv('BATCH_CONCURRENCY', 8))
+        rate = turns_per_minute if turns_per_minute is not None else float(os.getenv('BATCH_TURNS_PER_MINUTE', 0))
+        self.turn_bucket = TokenBucket(rate) if rate > 0 else None
+        self.progress_interval = float(os.getenv('BATCH_PROGRESS_SECONDS', 10))
+        self.max_overload_retries = int(os.getenv('BATCH_MAX_OVERLOAD_RETRIES', 10))
+
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.total = 0
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self.turns = 0
+        self.tokens = {"in": 0, "out": 0}
+        self._turn_latencies: List[float] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._write_lock = asyncio.Lock()
+        self._throttle_lock = asyncio.Lock()
+
+    async def run(self) -> Dict:
+        """남은 면접을 모두 진행하고 처리량 보고서 반환"""
+        self.status = "running"
+        self._started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            items = await loop.run_in_executor(None, read_items, self.input_path)
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+            completed = await loop.run_in_executor(None, load_completed, self.output_path)
+            pending = [item for item in items if item["id"] not in completed]
+            self.total = len(items)
+            self.skipped = len(items) - len(pending)
+            if self.skipped:
+                print(f"📝 배치 이어서 실행: 완료된 {self.skipped}개 건너뜀, 남은 면접 {len(pending)}개")
+
+            queue: asyncio.Queue = asyncio.Queue()
+            for item in pending:
+                queue.put_nowait(item)
+            with open(self.output_path, "a", encoding="utf-8") as output:
+                reporter = asyncio.create_task(self._report_progress())
+                try:
+                    workers = [asyncio.create_task(self._worker(queue, output)) for _ in range(self.concurrency)]
+                    await asyncio.gather(*workers)
+                finally:
+                    reporter.cancel()
+
+            if self.parquet_path:
+                await loop.run_in_executor(None, write_parquet, self.output_path, self.parquet_path)
+            self.status = "completed"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+            raise
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            print(f"❌ 배치 실행 오류: {e}")
+        finally:
+            self._finished = time.perf_counter()
+            report = self.report()
+            # 중단된 경우에도 보고서를 남김 (이어서 실행하면 덮어씀)
+            with open(f"{self.output_path}.report.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"✅ 배치 종료 ({self.status}): 성공 {self.completed}, 실패 {self.failed}, 건너뜀 {self.skipped} - "
+                  f"분당 면접 {report['interviews_per_minute']}, 초당 답변 {report['turns_per_second']}")
+        return report
+
+    async def _worker(self, queue: asyncio.Queue, output):
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            record = await self._simulate(item)
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            async with self._write_lock:
+                await asyncio.get_running_loop().run_in_executor(None, self._append, output, line)
+
+    @staticmethod
+    def _append(output, line: str):
+        output.write(line)
+        output.flush()
+
+    async def _simulate(self, item: Dict) -> Dict:
+        """스크립트대로 면접 하나 진행 - 실패해도 예외 대신 status=error 기록 반환"""
+        orchestrator = self.orchestrator
+        session_id = f"batch-{uuid.uuid4()}"
+        record = {"id": item["id"], "session_id": session_id, "profile": item["profile"], "turns": []}
+        finished = False
+        try:
+            profile = InterviewProfile(**item["profile"])
+            record["profile"] = profile.model_dump(mode="json", exclude_none=True)
+            record["opening"] = await orchestrator.start_personalized_interview(session_id, BATCH_USER, profile)
+            for answer in item["answers"]:
+                await self._throttle()
+                started = time.perf_counter()
+                question = await self._respond(session_id, answer)
+                latency = time.perf_counter() - started
+                self._turn_latencies.append(latency)
+                self.turns += 1
+                record["turns"].append({"answer": answer, "question": question, "latency_ms": round(latency * 1000, 1)})
+
+            finished = True
+            if self.analyze:
+                result = await orchestrator.end_interview(session_id)
+                record["analysis"] = result.get("ai_feedback")
+            else:
+                result = await orchestrator.finish_interview(session_id) or {}
+            record["tokens"] = result.get("tokens", {"in": 0, "out": 0})
+            self.tokens["in"] += record["tokens"]["in"]
+            self.tokens["out"] += record["tokens"]["out"]
+            record["status"] = "ok"
+            self.completed += 1
+        except Exception as e:
+            print(f"❌ 배치 면접 실패: {item['id']} - {e}")
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            self.failed += 1
+            if not finished:
+                await orchestrator.finish_interview(session_id)
+        return record
+
+    async def _respond(self, session_id: str, answer: str) -> str:
+        """답변 처리 - 스케줄러 대기열이 가득 차면 안내된 시간만큼 기다렸다가 다시 보냄"""
+        for _ in range(self.max_overload_retries):
+            try:
+                return await self.orchestrator.process_response(session_id, answer)
+            except LLMOverloaded as e:
+                await asyncio.sleep(e.retry_after)
+        return await self.orchestrator.process_response(session_id, answer)
+
+    async def _throttle(self):
+        """BATCH_TURNS_PER_MINUTE 한도 안에서 다음 답변을 보낼 차례까지 대기"""
+        if self.turn_bucket is None:
+            return
+        async with self._throttle_lock:
+            delay = self.turn_bucket.delay(1)
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.turn_bucket.delay(1)
+            self.turn_bucket.take(1)
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            report = self.report()
+            print(f"📝 배치 진행: {self.completed + self.failed}/{self.total - self.skipped} "
+                  f"(실패 {self.failed}) - 분당 면접 {report['interviews_per_minute']}, "
+                  f"초당 답변 {report['turns_per_second']}, 답변 p95 {report['turn_latency_ms']['p95']}ms")
+
+    def report(self) -> Dict:
+        """진행 상황과 처리량"""
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        latencies = self._turn_latencies
+        return {
+            "status": self.status,
+            "error": self.error,
+            "input": self.input_path,
+            "output": self.output_path,
+            "parquet": self.parquet_path,
+            "concurrency": self.concurrency,
+            "total": self.total,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "remaining": max(0, self.total - self.skipped - self.completed - self.failed),
+            "turns": self.turns,
+            "elapsed_seconds": round(elapsed, 2),
+            "interviews_per_minute": round((self.completed + self.failed) / elapsed * 60, 2) if elapsed else 0.0,
+            "turns_per_second": round(self.turns / elapsed, 2) if elapsed else 0.0,
+            "turn_latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 1),
+                "p95": round(percentile(latencies, 95) * 1000, 1),
+                "max": round(max(latencies) * 1000, 1) if latencies else 0.0,
+            },
+            "tokens": dict(self.tokens),
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="모의 면접 일괄 생성")
+    parser.add_argument("input", help="프로필과 답변 스크립트 JSONL")
+    parser.add_argument("-o", "--output", help="결과 JSONL (기본값: <입력>.results.jsonl, 이미 있으면 이어서 실행)")
+    parser.add_argument("--concurrency", type=int, help="동시에 진행할 면접 수 (기본값: BATCH_CONCURRENCY)")
+    parser.add_argument("--turns-per-minute", type=float, help="분당 답변 처리 한도 (기본값: BATCH_TURNS_PER_MINUTE)")
+    parser.add_argument("--analyze", action="store_true", help="면접마다 종료 분석(AI 피드백)까지 생성")
+    parser.add_argument("--parquet", help="턴 단위 Parquet 결과 경로 (pyarrow 필요)")
+    args = parser.parse_args()
+
+    orchestrator = InterviewOrchestrator()
+    orchestrator.repository.start()
+    simulation = BatchSimulation(
+        orchestrator, args.input, args.output or f"{os.path.splitext(args.input)[0]}.results.jsonl",
+        concurrency=args.concurrency, turns_per_minute=args.turns_per_minute,
+        analyze=args.analyze, parquet_path=args.parquet,
+    )
+    try:
+        report = await simulation.run()
+    finally:
+        await orchestrator.stop_background_tasks()
+        await orchestrator.llm.close()
+        orchestrator.llm_executor.shutdown()
+        await orchestrator.session_store.close()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
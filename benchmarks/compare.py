@@ -0,0 +1,77 @@
+"""두 부하 테스트 결과(JSON) 비교
+
+    python benchmarks/compare.py benchmarks/results/이전.json benchmarks/results/이후.json
+
+지연 시간과 메모리는 커질수록, 처리량은 작아질수록 나빠진 것으로 보고
+--threshold(기본 10%) 이상 나빠진 항목을 표시합니다. 나빠진 항목이 있으면 종료 코드 1.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# (항목 경로, 값이 클수록 좋은지)
+METRICS: List[Tuple[str, bool]] = [
+    ("sessions_per_second", True),
+    ("turns_per_second", True),
+    ("turn_latency.p50_ms", False),
+    ("turn_latency.p95_ms", False),
+    ("turn_latency.p99_ms", False),
+    ("turn_latency_rest.p95_ms", False),
+    ("turn_latency_ws.p95_ms", False),
+    ("ws_first_frame_latency.p95_ms", False),
+    ("start_latency.p95_ms", False),
+    ("end_latency.p95_ms", False),
+    ("event_loop_lag.p99_ms", False),
+    ("event_loop_lag.max_ms", False),
+    ("rss.per_session_bytes", False),
+]
+
+
+def lookup(results: Dict, path: str) -> Optional[float]:
+    value = results
+    for key in path.split("."):
+        if not isinstance(value, dict) or value.get(key) is None:
+            return None
+        value = value[key]
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트 결과 비교")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="나빠졌다고 볼 변화율 (%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"기준: {baseline['meta'].get('commit')} ({baseline['meta']['timestamp']})")
+    print(f"비교: {candidate['meta'].get('commit')} ({candidate['meta']['timestamp']})")
+    print(f"{'항목':<32}{'기준':>14}{'비교':>14}{'변화':>10}")
+
+    regressions = []
+    for path, higher_is_better in METRICS:
+        before = lookup(baseline["results"], path)
+        after = lookup(candidate["results"], path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse >= args.threshold:
+            flag = " ❌"
+            regressions.append(path)
+        print(f"{path:<32}{before:>14}{after:>14}{change:>+9.1f}%{flag}")
+
+    if regressions:
+        print(f"경고: {len(regressions)}개 항목이 {args.threshold}% 이상 나빠졌습니다: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
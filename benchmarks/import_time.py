@@ -0,0 +1,95 @@
+"""backend_api_lite import 시간 예산 검사
+
+    python benchmarks/import_time.py --budget-ms 800
+
+새 프로세스에서 `import backend_api_lite` 를 --runs 번 실행해 중앙값을 재고(-X importtime 으로
+가장 느린 모듈도 표시), 예산을 넘거나 import 시점에 불러오면 안 되는 무거운 모듈(LLM SDK,
+NumPy, SQLAlchemy 등 - 서버 시작 시 오케스트레이터를 만들 때 불러옴)이 있으면 종료 코드 1.
+워커 기동과 테스트 수집이 느려지는 변경을 CI 에서 잡기 위한 검사입니다.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import 시점에 불러오면 안 되는 모듈
+FORBIDDEN = (
+    "google.generativeai", "openai", "anthropic", "numpy", "sqlalchemy", "sklearn",
+    "sentence_transformers", "pandas", "redis",
+)
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import backend_api_lite
+elapsed = (time.perf_counter() - started) * 1000
+print(f"ELAPSED {elapsed:.1f}")
+print("LOADED " + ",".join(name for name in sys.argv[1:] if name in sys.modules))
+"""
+
+
+def run_once(env: Dict[str, str]) -> Tuple[float, List[str], List[Tuple[int, str]]]:
+    """한 번 import - (소요 시간 ms, 불러온 금지 모듈, (누적 µs, 모듈) 목록)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, *FORBIDDEN],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed = 0.0
+    loaded: List[str] = []
+    for line in result.stdout.splitlines():
+        if line.startswith("ELAPSED "):
+            elapsed = float(line.split()[1])
+        elif line.startswith("LOADED "):
+            loaded = [name for name in line[len("LOADED "):].split(",") if name]
+
+    modules = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 구분자 뒤 공백 하나를 빼면 들여쓰기가 중첩 깊이
+        modules.append((int(cumulative), name[1:]))
+    return elapsed, loaded, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="backend_api_lite import 시간 예산 검사")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv('IMPORT_BUDGET_MS', 800)),
+                        help="import 시간 중앙값 상한 (ms)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="표시할 느린 모듈 수")
+    args = parser.parse_args()
+
+    env = {**os.environ, "LLM_BACKEND": "fake", "PYTHONDONTWRITEBYTECODE": "1"}
+    # 첫 실행은 바이트코드 컴파일이 섞일 수 있으므로 버림
+    run_once(env)
+    runs = [run_once(env) for _ in range(args.runs)]
+    median = statistics.median(elapsed for elapsed, _, _ in runs)
+    loaded = sorted({name for _, names, _ in runs for name in names})
+
+    print(f"import backend_api_lite: 중앙값 {median:.1f}ms (예산 {args.budget_ms:.0f}ms, {args.runs}회)")
+    print("backend_api_lite 가 직접 불러오는 모듈 중 느린 순 (누적):")
+    direct = [(cumulative, name.strip()) for cumulative, name in runs[-1][2]
+              if name.startswith("  ") and not name.startswith("   ")]
+    for cumulative, name in sorted(direct, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"❌ import 시간이 예산을 넘었습니다: {median:.1f}ms > {args.budget_ms:.0f}ms")
+        failed = True
+    if loaded:
+        print(f"❌ import 시점에 무거운 모듈을 불러왔습니다: {', '.join(loaded)}")
+        failed = True
+    if not failed:
+        print("✅ import 시간 예산 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
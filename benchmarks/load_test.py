@@ -0,0 +1,369 @@
+"""AI 면접관 백엔드 부하 테스트
+
+가짜 LLM 백엔드(LLM_BACKEND=fake)로 backend_api_lite 서버를 별도 프로세스로 띄우고,
+수백 명의 가상 지원자가 REST(/api/interview/respond)와 WebSocket(/ws/{session_id})으로
+동시에 면접을 진행합니다. 턴 지연 p50/p95/p99, 초당 완료 세션 수, 서버 이벤트 루프 지연,
+세션당 RSS 증가량을 측정해 JSON 으로 저장하므로 커밋 사이의 성능 변화를 비교할 수 있습니다.
+
+사용 예:
+    python benchmarks/load_test.py --clients 300 --turns 5 --latency lognormal:0.8,0.5
+    python benchmarks/compare.py benchmarks/results/이전.json benchmarks/results/이후.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PROFILE = {
+    "type": "university",
+    "institution": "부하테스트대학교",
+    "fields": ["컴퓨터공학", "인공지능"],
+    "keywords": ["머신러닝", "프로그래밍"],
+    "additionalStyle": "친근하고 격려하는 분위기",
+    "uploadedFiles": [],
+    "difficulty": "high",
+}
+
+ANSWERS = [
+    "고등학교 때 코딩 동아리에서 챗봇을 만들면서 인공지능에 관심을 갖게 되었습니다.",
+    "팀 프로젝트에서 의견 충돌이 있었는데, 각자의 장점을 살려 역할을 나누어 해결했습니다.",
+    "가장 어려웠던 점은 데이터가 부족했던 것이고, 직접 설문을 만들어 데이터를 모았습니다.",
+    "대학에서는 머신러닝을 깊이 공부하고 의료 분야에 적용하는 연구를 해보고 싶습니다.",
+    "실패했던 경험에서 계획을 작게 나누어 자주 점검하는 습관을 배웠습니다.",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """지연 시간 목록(초)을 밀리초 단위 통계로 변환"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+
+def read_rss_bytes(pid: int) -> Optional[int]:
+    """/proc 에서 프로세스의 RSS 읽기 (Linux 전용)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """가짜 LLM 백엔드로 uvicorn 서버를 별도 프로세스로 실행"""
+
+    def __init__(self, port: int, latency: str, workers: int, extra_env: Dict[str, str]):
+        self.port = port
+        self.latency = latency
+        self.workers = workers
+        self.extra_env = extra_env
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        env = {
+            **os.environ,
+            "LLM_BACKEND": "fake",
+            "FAKE_LLM_LATENCY": self.latency,
+            "PYTHONUNBUFFERED": "1",
+            **self.extra_env,
+        }
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend_api_lite:app",
+             "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+        )
+
+    async def wait_ready(self, timeout: float = 30.0):
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient() as client:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError("서버 프로세스가 시작 중에 종료되었습니다.")
+                try:
+                    if (await client.get(f"{self.url}/api/health/ready")).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("서버가 제한 시간 안에 준비되지 않았습니다.")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Recorder:
+    """측정값 수집"""
+
+    def __init__(self):
+        self.start_latency: List[float] = []
+        self.turn_latency: Dict[str, List[float]] = {"rest": [], "ws": []}
+        self.first_token: List[float] = []
+        self.end_latency: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.sessions_completed = 0
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+async def run_candidate(index: int, args, base_url: str, http: httpx.AsyncClient,
+                        recorder: Recorder, release_end: asyncio.Event, turns_done: asyncio.Event,
+                        finished: List[int]):
+    """가상 지원자 한 명: 면접 시작 → 답변 N번 → (모두 답변을 마치고 RSS 를 잰 뒤) 면접 종료"""
+    rng = random.Random(args.seed + index)
+    transport = "ws" if rng.random() < args.ws_ratio else "rest"
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+
+    started = time.perf_counter()
+    try:
+        response = await http.post(f"{base_url}/api/interview/start-personalized", json={"profile": PROFILE})
+        response.raise_for_status()
+        session_id = response.json()["session_id"]
+    except Exception:
+        recorder.error("start")
+        finished.append(index)
+        if len(finished) == args.clients:
+            turns_done.set()
+        return
+    recorder.start_latency.append(time.perf_counter() - started)
+
+    ws = None
+    try:
+        if transport == "ws":
+            ws = await websockets.connect(f"{base_url.replace('http', 'ws', 1)}/ws/{session_id}", max_size=None)
+
+        for turn in range(args.turns):
+            answer = f"{ANSWERS[(index + turn) % len(ANSWERS)]} ({index}-{turn})"
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+            started = time.perf_counter()
+            try:
+                if ws is not None:
+                    await ws.send(json.dumps({"type": "user_response", "content": answer, "stream": args.stream}))
+                    first = None
+                    while True:
+                        frame = json.loads(await ws.recv())
+                        if first is None:
+                            first = time.perf_counter() - started
+                        if frame["type"] == "ai_question":
+                            break
+                        if frame["type"] == "error" or frame.get("status") == "overloaded":
+                            raise RuntimeError(frame.get("message"))
+                    recorder.first_token.append(first)
+                else:
+                    response = await http.post(
+                        f"{base_url}/api/interview/respond",
+                        json={"session_id": session_id, "response": answer}
+                    )
+                    response.raise_for_status()
+                recorder.turn_latency[transport].append(time.perf_counter() - started)
+            except Exception:
+                recorder.error(f"turn_{transport}")
+    finally:
+        # 모든 지원자가 답변을 마친 시점에 세션이 살아 있는 상태로 RSS 를 측정
+        finished.append(index)
+        if len(finished) == args.clients:
+            turns_done.set()
+        await release_end.wait()
+
+        started = time.perf_counter()
+        try:
+            if ws is not None:
+                await ws.send(json.dumps({"type": "end_interview"}))
+                while json.loads(await ws.recv())["type"] not in ("analysis_queued", "error"):
+                    pass
+            else:
+                (await http.post(f"{base_url}/api/interview/end", params={"session_id": session_id})).raise_for_status()
+            recorder.end_latency.append(time.perf_counter() - started)
+            recorder.sessions_completed += 1
+        except Exception:
+            recorder.error("end")
+        finally:
+            if ws is not None:
+                await ws.close()
+
+
+async def run_benchmark(args) -> Dict:
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = Server(args.port or free_port(), args.latency, args.workers, dict(args.env))
+        server.start()
+
+    try:
+        if server:
+            await server.wait_ready()
+            base_url = server.url
+
+        limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as http:
+            await http.post(f"{base_url}/api/system/status/reset")
+            rss_before = read_rss_bytes(server.process.pid) if server else None
+
+            recorder = Recorder()
+            release_end = asyncio.Event()
+            turns_done = asyncio.Event()
+            finished: List[int] = []
+
+            wall_started = time.perf_counter()
+            tasks = [
+                asyncio.create_task(run_candidate(i, args, base_url, http, recorder, release_end, turns_done, finished))
+                for i in range(args.clients)
+            ]
+            await turns_done.wait()
+            turns_elapsed = time.perf_counter() - wall_started
+
+            rss_peak = read_rss_bytes(server.process.pid) if server else None
+            status = (await http.get(f"{base_url}/api/system/status")).json()
+            release_end.set()
+            await asyncio.gather(*tasks)
+            wall_elapsed = time.perf_counter() - wall_started
+
+    finally:
+        if server:
+            server.stop()
+
+    sessions = status.get("active_sessions") or args.clients
+    rss = None
+    if rss_before is not None and rss_peak is not None:
+        rss = {
+            "before_bytes": rss_before,
+            "peak_bytes": rss_peak,
+            "per_session_bytes": (rss_peak - rss_before) // max(sessions, 1),
+            "note": "workers=1 일 때만 정확 (부모 프로세스 RSS 측정)" if args.workers > 1 else None,
+        }
+
+    all_turns = recorder.turn_latency["rest"] + recorder.turn_latency["ws"]
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "env")},
+        },
+        "results": {
+            "sessions_completed": recorder.sessions_completed,
+            "sessions_per_second": round(recorder.sessions_completed / wall_elapsed, 2) if wall_elapsed else 0.0,
+            "turns_per_second": round(len(all_turns) / turns_elapsed, 2) if turns_elapsed else 0.0,
+            "wall_seconds": round(wall_elapsed, 2),
+            "start_latency": summarize(recorder.start_latency),
+            "turn_latency": summarize(all_turns),
+            "turn_latency_rest": summarize(recorder.turn_latency["rest"]),
+            "turn_latency_ws": summarize(recorder.turn_latency["ws"]),
+            "ws_first_frame_latency": summarize(recorder.first_token),
+            "end_latency": summarize(recorder.end_latency),
+            "event_loop_lag": status.get("event_loop"),
+            "rss": rss,
+            "errors": recorder.errors,
+        },
+        "server_status": status,
+    }
+
+
+def parse_env(value: str):
+    key, _, val = value.partition("=")
+    if not key or not _:
+        raise argparse.ArgumentTypeError("KEY=VALUE 형식이어야 합니다.")
+    return key, val
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 면접관 백엔드 부하 테스트 (가짜 LLM 백엔드)")
+    parser.add_argument("--clients", type=int, default=200, help="동시 가상 지원자 수")
+    parser.add_argument("--turns", type=int, default=5, help="지원자당 답변 횟수")
+    parser.add_argument("--ws-ratio", type=float, default=0.5, help="WebSocket 으로 진행할 지원자 비율 (0~1)")
+    parser.add_argument("--stream", action="store_true", help="WebSocket 지원자는 스트리밍 모드로 응답 수신")
+    parser.add_argument("--latency", default="lognormal:0.5,0.4", help="가짜 LLM 지연 분포 (FAKE_LLM_LATENCY)")
+    parser.add_argument("--think-time", type=float, default=0.2, help="답변 사이 최대 대기 시간 (초)")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="지원자 시작 시점을 분산할 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="HTTP 요청 제한 시간 (초)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--port", type=int, default=None, help="서버 포트 (기본: 빈 포트)")
+    parser.add_argument("--url", default=None, help="이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않음)")
+    parser.add_argument("--env", type=parse_env, action="append", default=[],
+                        help="서버 프로세스에 추가할 환경 변수 (KEY=VALUE, 여러 번 지정 가능)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 지원자 행동 난수 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<시각>_<커밋>.json)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{result['meta']['commit'] or 'nocommit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    summary = result["results"]
+    print(f"✅ 완료 세션 {summary['sessions_completed']}개, {summary['sessions_per_second']} sessions/s")
+    print(f"   턴 지연 p50/p95/p99: {summary['turn_latency'].get('p50_ms')} / "
+          f"{summary['turn_latency'].get('p95_ms')} / {summary['turn_latency'].get('p99_ms')} ms")
+    print(f"   이벤트 루프 지연: {summary['event_loop_lag']}")
+    if summary["rss"]:
+        print(f"   세션당 RSS: {summary['rss']['per_session_bytes']} bytes")
+    if summary["errors"]:
+        print(f"경고: 오류 {summary['errors']}")
+    print(f"📄 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
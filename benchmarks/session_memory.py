@@ -0,0 +1,141 @@
+"""면접 세션당 메모리 측정 (예전 dict 턴 + 프로필 복사 형식과 비교)
+
+    python benchmarks/session_memory.py --sessions 2000 --turns 12 --profiles 20
+
+같은 대화를 두 가지 형식으로 --sessions 개 만들어 tracemalloc 으로 세션당 할당량을 재고,
+Redis 에 저장되는 JSON 크기(공유 프로필은 프로필 수만큼만)도 비교합니다.
+- 예전: 턴마다 {"role", "content", "timestamp": ISO 문자열} dict, 세션마다 profile.model_dump() 복사
+- 현재: __slots__ Turn (epoch 시각), 같은 내용의 프로필은 세션 저장소가 한 객체를 공유
+각 세션의 프로필은 API 요청처럼 JSON 에서 새로 읽어 만듭니다.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ai_interviewer_system_lite import InterviewProfile, InterviewSession  # noqa: E402
+from session_records import Turn  # noqa: E402
+from session_store import InMemorySessionStore  # noqa: E402
+
+
+class LegacySession(BaseModel):
+    """비교용 예전 세션 형식"""
+    session_id: str
+    user_id: str
+    interview_type: str
+    stage: str = "opening"
+    conversation_history: List[Dict] = []
+    user_profile: Dict = {}
+    personalized_profile: Optional[Dict] = None
+    context_summary: str = ""
+    summarized_exchanges: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+def profile_json(index: int, files: int) -> str:
+    return json.dumps({
+        "id": f"profile-{index}",
+        "type": "science_high",
+        "institution": f"과학고등학교 {index}",
+        "fields": ["물리", "화학", "정보"],
+        "keywords": ["로봇", "인공지능", "신재생 에너지", "실험 설계"],
+        "additionalStyle": "압박 면접보다는 대화형으로 진행해주세요.",
+        "uploadedFiles": [
+            {"id": f"file-{index}-{n}", "name": f"자기소개서_{n}.pdf", "type": "application/pdf",
+             "size": 120000, "chars": 4000, "preview": "지원 동기와 탐구 활동을 정리한 자기소개서입니다. " * 5}
+            for n in range(files)
+        ],
+        "difficulty": "high",
+    }, ensure_ascii=False)
+
+
+def turn_text(session: int, turn: int, chars: int) -> str:
+    return (f"[{session}-{turn}] " + "저는 실험을 직접 설계하면서 변수 통제의 중요성을 배웠습니다. " * (chars // 30 + 1))[:chars]
+
+
+def build_legacy(index: int, args, profiles: List[str]):
+    profile = InterviewProfile.model_validate_json(profiles[index % len(profiles)])
+    session = LegacySession(session_id=f"s{index}", user_id=f"u{index}", interview_type=profile.type,
+                            personalized_profile=profile.model_dump())
+    for turn in range(args.turns):
+        session.conversation_history.append({
+            "role": "assistant" if turn % 2 == 0 else "user",
+            "content": turn_text(index, turn, args.chars),
+            "timestamp": datetime.now().isoformat(),
+        })
+    return session
+
+
+async def build_current(index: int, args, profiles: List[str], store: InMemorySessionStore):
+    profile = InterviewProfile.model_validate_json(profiles[index % len(profiles)])
+    session = InterviewSession(session_id=f"s{index}", user_id=f"u{index}", interview_type=profile.type)
+    await store.attach_profile(session, profile.model_dump(mode="json"))
+    for turn in range(args.turns):
+        session.conversation_history.append(Turn("assistant" if turn % 2 == 0 else "user", turn_text(index, turn, args.chars)))
+    await store.save_session(session)
+    return session
+
+
+def measure(build: Callable[[int], object], count: int):
+    """(세션 목록, 세션당 할당 바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(index) for index in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sessions, (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="면접 세션당 메모리 측정")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=12, help="세션당 대화 턴 수 (질문 + 답변)")
+    parser.add_argument("--chars", type=int, default=200, help="턴당 글자 수")
+    parser.add_argument("--profiles", type=int, default=20, help="서로 다른 프로필 수")
+    parser.add_argument("--files", type=int, default=2, help="프로필당 업로드 파일 수")
+    args = parser.parse_args()
+
+    profiles = [profile_json(index, args.files) for index in range(args.profiles)]
+    loop = asyncio.new_event_loop()
+
+    legacy, legacy_bytes = measure(lambda i: build_legacy(i, args, profiles), args.sessions)
+    legacy_json = sum(len(s.model_dump_json(exclude_none=True).encode("utf-8")) for s in legacy) / args.sessions
+    del legacy
+
+    store = InMemorySessionStore(max_sessions=args.sessions + 1)
+    current, current_bytes = measure(
+        lambda i: loop.run_until_complete(build_current(i, args, profiles, store)), args.sessions
+    )
+    shared = {s.profile_key: s.personalized_profile for s in current}
+    current_json = (
+        sum(len(s.model_dump_json(exclude_none=True).encode("utf-8")) for s in current)
+        + sum(len(json.dumps(p, ensure_ascii=False).encode("utf-8")) for p in shared.values())
+    ) / args.sessions
+    loop.close()
+
+    print(f"세션 {args.sessions}개, 턴 {args.turns}개 x {args.chars}자, 프로필 {args.profiles}종 (파일 {args.files}개)")
+    print(f"{'':<28}{'예전':>12}{'현재':>12}{'변화':>10}")
+    for name, before, after in (
+        ("메모리/세션 (bytes)", legacy_bytes, current_bytes),
+        ("Redis JSON/세션 (bytes)", legacy_json, current_json),
+    ):
+        print(f"{name:<28}{before:>12.0f}{after:>12.0f}{(after - before) / before * 100:>9.1f}%")
+    print(f"세션 저장소 추정치 (프로필 제외): {store.stats()['estimated_bytes_per_session']} bytes/세션")
+
+
+if __name__ == "__main__":
+    main()
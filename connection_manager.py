@@ -0,0 +1,327 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from metrics import WS_DISCONNECTS_TOTAL, span
+
+# 서버 heartbeat 프레임 (클라이언트는 {"type": "pong"} 으로 응답)
+PING_FRAME = json.dumps({"type": "ping"})
+
+
+class EventBus:
+    """워커 간 WebSocket 이벤트 전달 인터페이스
+
+    REST 요청을 처리한 워커가 세션의 이벤트를 발행하면, 그 세션의 WebSocket 을 가진 워커가
+    받아 전달합니다. 메시지는 (세션 ID, 직렬화된 프레임) 입니다.
+    """
+
+    async def start(self, handler: Callable[[str, str], None]):
+        """수신 시작 - 메시지마다 handler(세션 ID, 프레임) 호출"""
+        pass
+
+    async def publish(self, session_id: str, text: str):
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {}
+
+    async def close(self):
+        pass
+
+
+class InProcessEventBus(EventBus):
+    """한 프로세스 안의 이벤트 버스 (단일 워커 실행, 테스트용)
+
+    같은 버스 객체를 여러 ConnectionManager 에 넘기면 여러 워커를 흉내 낼 수 있습니다.
+    """
+
+    def __init__(self):
+        self._handlers: List[Callable[[str, str], None]] = []
+        self.published = 0
+
+    async def start(self, handler: Callable[[str, str], None]):
+        self._handlers.append(handler)
+
+    async def publish(self, session_id: str, text: str):
+        self.published += 1
+        for handler in list(self._handlers):
+            handler(session_id, text)
+
+    def stats(self) -> Dict:
+        return {"backend": "memory", "published": self.published, "subscribers": len(self._handlers)}
+
+    async def close(self):
+        self._handlers.clear()
+
+
+class RedisEventBus(EventBus):
+    """Redis pub/sub 이벤트 버스 - 여러 워커 실행 시 사용
+
+    세션마다 {prefix}:ws:{세션 ID} 채널에 발행하고, 각 워커는 패턴 구독으로 모두 받아
+    자기가 가진 WebSocket 의 메시지만 전달합니다. 구독 연결이 끊기면 다시 구독하며,
+    끊긴 동안 발행된 메시지는 전달되지 않습니다.
+    """
+
+    def __init__(self, client, key_prefix: str = "donga"):
+        self.client = client
+        self.channel_prefix = f"{key_prefix}:ws:"
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+
+    async def start(self, handler: Callable[[str, str], None]):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(handler))
+
+    async def _listen(self, handler: Callable[[str, str], None]):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{self.channel_prefix}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    self.received += 1
+                    handler(message["channel"][len(self.channel_prefix):], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                print(f"경고: 이벤트 버스 구독 끊김, 1초 후 다시 구독: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def publish(self, session_id: str, text: str):
+        await self.client.publish(f"{self.channel_prefix}{session_id}", text)
+        self.published += 1
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "redis",
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.client.close()
+
+
+def create_event_bus() -> EventBus:
+    """EVENT_BUS 환경 변수('memory' 또는 'redis', 기본값은 SESSION_STORE 와 같게)에 따라 이벤트 버스 생성"""
+    backend = os.getenv('EVENT_BUS', os.getenv('SESSION_STORE', 'memory')).lower()
+
+    if backend == "redis":
+        import redis.asyncio as redis
+
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        client = redis.from_url(redis_url, decode_responses=True)
+        print(f"✅ Redis 이벤트 버스 사용: {redis_url}")
+        return RedisEventBus(client, key_prefix=os.getenv('REDIS_KEY_PREFIX', 'donga'))
+
+    return InProcessEventBus()
+
+
+class Connection:
+    """이 워커가 가진 WebSocket 하나와 전용 송신 대기열"""
+
+    def __init__(self, session_id: str, websocket, max_queue: int):
+        self.session_id = session_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.last_seen = time.monotonic()
+        self.heartbeat = False  # 클라이언트가 pong 으로 응답한 적이 있으면 heartbeat 시간 제한 적용
+        self.busy = 0  # 처리 중인 수신 메시지 수 (처리하는 동안은 수신 루프가 멈춰 있음)
+        self.closed = False
+        self.sender: Optional[asyncio.Task] = None
+
+    def touch(self, pong: bool = False):
+        """클라이언트에서 메시지를 받음"""
+        self.last_seen = time.monotonic()
+        if pong:
+            self.heartbeat = True
+
+    @contextmanager
+    def processing(self) -> Iterator[None]:
+        """받은 메시지를 처리하는 동안 heartbeat 시간 제한을 멈춤
+
+        수신 루프가 턴 처리(LLM 호출 등)를 기다리는 동안에는 클라이언트의 pong 을 읽지 못하므로
+        긴 턴이 heartbeat 응답 없음으로 보이지 않게 합니다. 처리가 끝난 시점부터 다시 잽니다.
+        """
+        self.busy += 1
+        try:
+            yield
+        finally:
+            self.busy -= 1
+            self.last_seen = time.monotonic()
+
+
+class ConnectionManager:
+    """WebSocket 연결 관리 및 워커 간 이벤트 라우팅
+
+    - 프레임은 연결마다 최대 WS_SEND_QUEUE_SIZE 개까지 대기열에 넣고 전용 송신 태스크가 보냅니다.
+      느린 클라이언트 때문에 응답을 만드는 쪽이 기다리지 않으며, 대기열이 가득 차거나 한 프레임
+      전송이 WS_SEND_TIMEOUT_SECONDS 를 넘으면 연결을 끊습니다. (클라이언트는 다시 연결)
+    - WS_PING_INTERVAL_SECONDS 마다 {"type": "ping"} 을 보내고, pong 으로 응답하는 클라이언트가
+      WS_PING_TIMEOUT_SECONDS 동안 아무 메시지도 보내지 않으면 끊긴 것으로 보고 정리합니다.
+      받은 메시지를 처리하는 동안(Connection.processing)은 수신하지 못하므로 시간 제한을 멈춥니다.
+    - publish() 는 세션의 WebSocket 이 이 워커에 있으면 바로 대기열에 넣고, 없으면 이벤트 버스로
+      발행해 그 WebSocket 을 가진 워커가 전달하게 합니다.
+    """
+
+    def __init__(self, bus: Optional[EventBus] = None, max_queue: Optional[int] = None):
+        self.bus = bus or create_event_bus()
+        self.max_queue = max_queue or int(os.getenv('WS_SEND_QUEUE_SIZE', 256))
+        self.send_timeout = float(os.getenv('WS_SEND_TIMEOUT_SECONDS', 10))
+        self.ping_interval = float(os.getenv('WS_PING_INTERVAL_SECONDS', 20))
+        self.ping_timeout = float(os.getenv('WS_PING_TIMEOUT_SECONDS', 60))
+
+        self._connections: Dict[str, Connection] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self.sent = 0
+        self.delivered_from_bus = 0
+        self.disconnects: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._connections
+
+    async def start(self):
+        """이벤트 버스 수신 시작 (이벤트 루프 안에서 호출)"""
+        await self.bus.start(self._on_bus_message)
+
+    async def close(self):
+        for connection in list(self._connections.values()):
+            await self.disconnect(connection)
+        await self.bus.close()
+
+    def connect(self, session_id: str, websocket) -> Connection:
+        """수락한 WebSocket 등록 - 같은 세션의 이전 연결은 끊음"""
+        previous = self._connections.get(session_id)
+        if previous is not None:
+            self._abort(previous, "replaced")
+        connection = Connection(session_id, websocket, self.max_queue)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self._connections[session_id] = connection
+        return connection
+
+    async def disconnect(self, connection: Connection):
+        """연결 해제 - 대기 중인 프레임을 (송신 시간 제한 안에서) 모두 보낸 뒤 송신 태스크 종료"""
+        if self._connections.get(connection.session_id) is connection:
+            del self._connections[connection.session_id]
+        if not connection.closed:
+            connection.closed = True
+            try:
+                connection.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                connection.sender.cancel()
+        done, _ = await asyncio.wait([connection.sender], timeout=self.send_timeout)
+        if not done:
+            connection.sender.cancel()
+
+    def send(self, connection: Connection, text: str) -> bool:
+        """프레임을 연결의 송신 대기열에 추가 (가득 차면 느린 클라이언트로 보고 연결을 끊고 False)"""
+        if connection.closed:
+            return False
+        try:
+            connection.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            print(f"경고: WebSocket 송신 대기열 초과로 연결 해제: {connection.session_id}")
+            self._abort(connection, "slow_consumer")
+            return False
+        return True
+
+    async def publish(self, session_id: str, frame: Dict):
+        """세션의 WebSocket 으로 프레임 전달 (어느 워커에 있든) - 연결이 없으면 버려짐"""
+        text = json.dumps(frame, ensure_ascii=False)
+        connection = self._connections.get(session_id)
+        if connection is not None:
+            self.send(connection, text)
+            return
+        try:
+            await self.bus.publish(session_id, text)
+        except Exception as e:
+            print(f"이벤트 버스 발행 오류: {session_id} - {e}")
+
+    def _on_bus_message(self, session_id: str, text: str):
+        connection = self._connections.get(session_id)
+        if connection is not None and self.send(connection, text):
+            self.delivered_from_bus += 1
+
+    async def _send_loop(self, connection: Connection):
+        next_ping = time.monotonic() + self.ping_interval
+        try:
+            while True:
+                try:
+                    text = await asyncio.wait_for(connection.queue.get(), max(0.0, next_ping - time.monotonic()))
+                except asyncio.TimeoutError:
+                    now = time.monotonic()
+                    if connection.heartbeat and not connection.busy and now - connection.last_seen > self.ping_timeout:
+                        print(f"경고: WebSocket heartbeat 응답 없음, 연결 해제: {connection.session_id}")
+                        self._abort(connection, "heartbeat_timeout")
+                        return
+                    text = PING_FRAME
+                    next_ping = now + self.ping_interval
+                if text is None:
+                    return
+                with span("ws_send"):
+                    await asyncio.wait_for(connection.websocket.send_text(text), self.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"경고: WebSocket 전송 시간 초과로 연결 해제: {connection.session_id}")
+            self._abort(connection, "send_timeout")
+        except Exception as e:
+            print(f"WebSocket 전송 오류: {connection.session_id} - {e}")
+            self._abort(connection, "send_error")
+
+    def _abort(self, connection: Connection, reason: str):
+        """대기열을 비우지 않고 바로 연결을 끊음 (수신 루프는 소켓이 닫히면서 종료)"""
+        if self._connections.get(connection.session_id) is connection:
+            del self._connections[connection.session_id]
+        if connection.closed:
+            return
+        connection.closed = True
+        self.disconnects[reason] = self.disconnects.get(reason, 0) + 1
+        WS_DISCONNECTS_TOTAL.inc(reason=reason)
+        if connection.sender is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+        task = asyncio.create_task(self._close_socket(connection))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_socket(self, connection: Connection):
+        try:
+            # 1013: 잠시 후 다시 시도 (느린 클라이언트, 새 연결로 대체 등)
+            await asyncio.wait_for(connection.websocket.close(code=1013), self.send_timeout)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict:
+        return {
+            "connections": len(self._connections),
+            "queued_frames": sum(c.queue.qsize() for c in self._connections.values()),
+            "max_queue": self.max_queue,
+            "sent": self.sent,
+            "delivered_from_bus": self.delivered_from_bus,
+            "disconnects": dict(self.disconnects),
+            "bus": self.bus.stats(),
+        }
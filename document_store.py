@@ -0,0 +1,291 @@
+import asyncio
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# 업로드 파일을 읽고 쓰는 단위
+CHUNK_SIZE = 1024 * 1024
+# 프롬프트에 들어가는 파일 미리보기 길이
+PREVIEW_CHARS = 200
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기 제한(UPLOAD_MAX_BYTES) 초과"""
+
+
+def _xml_text(data: bytes, paragraph_tag: str) -> str:
+    """OOXML/OWPML 본문에서 문단 단위로 텍스트만 추출"""
+    xml = data.decode("utf-8", errors="ignore")
+    xml = re.sub(rf"</(?:\w+:)?{paragraph_tag}>", "\n", xml)
+    text = re.sub(r"<[^>]+>", "", xml)
+    for entity, char in (("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&apos;", "'"), ("&amp;", "&")):
+        text = text.replace(entity, char)
+    return text
+
+
+def extract_text(path: str, name: str) -> str:
+    """저장된 업로드 파일에서 텍스트 추출 (프로세스 풀에서 실행)
+
+    txt/md/csv, docx, hwpx, xlsx 는 표준 라이브러리로 처리하고, pdf 는 pypdf 가 설치되어
+    있을 때만 처리합니다. 추출할 수 없는 형식(hwp, doc 등)은 빈 문자열을 반환합니다.
+    """
+    ext = os.path.splitext(name)[1].lower()
+
+    if ext in (".txt", ".md", ".csv"):
+        with open(path, "rb") as f:
+            data = f.read()
+        for encoding in ("utf-8", "cp949"):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return data.decode("utf-8", errors="ignore")
+
+    if ext == ".pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            print("경고: pypdf 가 설치되지 않아 PDF 텍스트를 추출하지 않습니다.")
+            return ""
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    if ext in (".docx", ".hwpx", ".xlsx"):
+        with zipfile.ZipFile(path) as archive:
+            if ext == ".docx":
+                return _xml_text(archive.read("word/document.xml"), "w:p")
+            if ext == ".hwpx":
+                sections = sorted(n for n in archive.namelist() if re.match(r"Contents/section\d+\.xml", n))
+                return "\n".join(_xml_text(archive.read(n), "hp:p") for n in sections)
+            if "xl/sharedStrings.xml" in archive.namelist():
+                return _xml_text(archive.read("xl/sharedStrings.xml"), "si")
+            return ""
+
+    return ""
+
+
+class DocumentStore:
+    """업로드 문서 저장소
+
+    업로드 파일은 요청 본문을 한꺼번에 메모리에 올리지 않고 CHUNK_SIZE 단위로 디스크에
+    기록하며, 텍스트 추출은 이벤트 루프를 막지 않도록 별도 프로세스 풀에서 실행합니다.
+    프로필에는 파일 ID 와 미리보기 등 메타데이터만 담기고, 추출된 전체 텍스트는
+    {UPLOAD_DIR}/{file_id}.txt 에 보관됩니다. 원본 파일은 텍스트를 추출한 뒤 바로 지웁니다.
+    프로필은 영구 저장소에 남아 여러 면접에서 다시 쓰이므로, 문서는 마지막으로 사용한 뒤
+    DOCUMENT_TTL_SECONDS 가 지나면 sweep() 에서 지웁니다 (조회할 때마다 사용 시각 갱신).
+    """
+
+    def __init__(self, upload_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 workers: Optional[int] = None, ttl: Optional[float] = None):
+        self.upload_dir = upload_dir or os.getenv('UPLOAD_DIR', 'uploads')
+        self.max_bytes = max_bytes or int(os.getenv('UPLOAD_MAX_BYTES', 20 * 1024 * 1024))
+        self.workers = workers or int(os.getenv('DOCUMENT_WORKERS', 2))
+        # 마지막 사용 후 보관 기간 (0 이면 지우지 않음)과 디스크 정리 주기
+        self.ttl = ttl if ttl is not None else float(os.getenv('DOCUMENT_TTL_SECONDS', 30 * 86400))
+        self.sweep_interval = float(os.getenv('DOCUMENT_SWEEP_INTERVAL_SECONDS', 3600))
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+        # 프로세스 풀은 첫 업로드 때 생성 (spawn: 스레드가 있는 서버 프로세스를 fork 하지 않음)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # 최근 조회한 메타데이터 (오래 사용하지 않은 것부터 DOCUMENT_CACHE_SIZE 개를 넘으면 제거)
+        self._metadata: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_cached = int(os.getenv('DOCUMENT_CACHE_SIZE', 1000))
+        self._last_sweep = 0.0
+        self.uploads = 0
+        self.bytes_received = 0
+        self.expired = 0
+
+    def _path(self, file_id: str, suffix: str) -> str:
+        return os.path.join(self.upload_dir, f"{file_id}{suffix}")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def save_upload(self, upload: Any) -> Dict:
+        """UploadFile 을 청크 단위로 디스크에 저장하고 텍스트를 추출해 메타데이터 반환"""
+        loop = asyncio.get_running_loop()
+        file_id = str(uuid.uuid4())
+        name = os.path.basename(upload.filename or "upload")
+        ext = os.path.splitext(name)[1].lower()
+        raw_path = self._path(file_id, f".raw{ext}")
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(raw_path, "wb") as f:
+                while True:
+                    chunk = await upload.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge(f"파일 크기가 제한({self.max_bytes} bytes)을 초과했습니다.")
+                    digest.update(chunk)
+                    await loop.run_in_executor(None, f.write, chunk)
+        except BaseException:
+            os.remove(raw_path)
+            raise
+
+        try:
+            text = await loop.run_in_executor(self._get_pool(), extract_text, raw_path, name)
+        except Exception as e:
+            print(f"텍스트 추출 오류: {name} - {e}")
+            text = ""
+        finally:
+            # 이후에는 추출된 텍스트만 사용하므로 원본은 보관하지 않음
+            os.remove(raw_path)
+
+        self.uploads += 1
+        self.bytes_received += size
+        return await self._save_metadata(file_id, name, upload.content_type or "", size, digest.hexdigest(), text)
+
+    async def save_text(self, name: str, content_type: str, content: str) -> Dict:
+        """JSON 본문으로 들어온 파일 내용을 문서로 저장 (기존 클라이언트 호환용)"""
+        data = content.encode("utf-8")
+        return await self._save_metadata(
+            str(uuid.uuid4()), name, content_type, len(data), hashlib.sha256(data).hexdigest(), content
+        )
+
+    async def _save_metadata(self, file_id: str, name: str, content_type: str, size: int,
+                             sha256: str, text: str) -> Dict:
+        text = text.strip()
+        metadata = {
+            "id": file_id,
+            "name": name,
+            "type": content_type,
+            "size": size,
+            "sha256": sha256,
+            "chars": len(text),
+            "preview": text[:PREVIEW_CHARS] + "..." if len(text) > PREVIEW_CHARS else text,
+            "uploadedAt": datetime.now().isoformat(),
+        }
+
+        def write():
+            with open(self._path(file_id, ".txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+            with open(self._path(file_id, ".json"), "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+
+        await asyncio.get_running_loop().run_in_executor(None, write)
+        self._remember(file_id, metadata)
+        print(f"✅ 문서 저장: {file_id} - {name} ({size} bytes, {len(text)}자)")
+        return metadata
+
+    async def get(self, file_id: str) -> Optional[Dict]:
+        """파일 메타데이터 조회 (다른 워커가 저장한 파일은 디스크에서 읽음)"""
+        path = self._path(os.path.basename(file_id), ".json")
+
+        def read():
+            try:
+                os.utime(path)
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return None
+
+        metadata = self._metadata.get(file_id)
+        if metadata is not None:
+            self._metadata.move_to_end(file_id)
+            # 다른 워커의 정리 대상이 되지 않도록 사용 시각만 갱신
+            await asyncio.get_running_loop().run_in_executor(None, self._touch, path)
+            return metadata
+        metadata = await asyncio.get_running_loop().run_in_executor(None, read)
+        if metadata is not None:
+            self._remember(file_id, metadata)
+        return metadata
+
+    async def get_text(self, file_id: str) -> str:
+        """추출된 전체 텍스트 조회"""
+        path = self._path(os.path.basename(file_id), ".txt")
+
+        def read():
+            self._touch(self._path(os.path.basename(file_id), ".json"))
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, read)
+        except FileNotFoundError:
+            return ""
+
+    def _remember(self, file_id: str, metadata: Dict):
+        self._metadata[file_id] = metadata
+        self._metadata.move_to_end(file_id)
+        while len(self._metadata) > self.max_cached:
+            self._metadata.popitem(last=False)
+
+    @staticmethod
+    def _touch(path: str):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    async def sweep(self, force: bool = False) -> int:
+        """마지막 사용 후 ttl 이 지난 문서 파일 삭제 (sweep_interval 에 한 번만 디렉터리를 훑음) - 삭제한 문서 수 반환"""
+        now = time.time()
+        if self.ttl <= 0 or (not force and now - self._last_sweep < self.sweep_interval):
+            return 0
+        self._last_sweep = now
+        deadline = now - self.ttl
+
+        def remove_expired():
+            expired = []
+            for path in glob.glob(os.path.join(self.upload_dir, "*.json")):
+                try:
+                    if os.path.getmtime(path) > deadline:
+                        continue
+                except FileNotFoundError:
+                    continue
+                file_id = os.path.basename(path)[:-len(".json")]
+                for suffix in (".json", ".txt"):
+                    try:
+                        os.remove(self._path(file_id, suffix))
+                    except FileNotFoundError:
+                        pass
+                expired.append(file_id)
+            # 추출 도중 서버가 멈춰 남은 원본 파일
+            for path in glob.glob(os.path.join(self.upload_dir, "*.raw*")):
+                try:
+                    if os.path.getmtime(path) <= deadline:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+            return expired
+
+        expired = await asyncio.get_running_loop().run_in_executor(None, remove_expired)
+        for file_id in expired:
+            self._metadata.pop(file_id, None)
+        self.expired += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "uploads": self.uploads,
+            "bytes_received": self.bytes_received,
+            "max_bytes": self.max_bytes,
+            "workers": self.workers,
+            "ttl_seconds": self.ttl,
+            "cached_metadata": len(self._metadata),
+            "expired": self.expired,
+        }
+
+    def shutdown(self):
+        """텍스트 추출 프로세스 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -4,9 +4,10 @@ import InterviewChat from './components/InterviewChat';
 import InterviewSetupWizard from './components/InterviewSetupWizard';
 
 function App() {
-  const [currentSession, setCurrentSession] = useState<string | null>(null);
+  // 새로고침 전에 진행 중이던 면접이 있으면 이어서 진행
+  const [currentSession, setCurrentSession] = useState<string | null>(() => useInterviewStore.getState().sessionId);
   const [showWizard, setShowWizard] = useState(false);
-  const [currentProfile, setCurrentProfile] = useState<any>(null);
+  const [currentProfile, setCurrentProfile] = useState<any>(() => useInterviewStore.getState().profile);
   const { clearMessages } = useInterviewStore();
 
   const handleStartSetup = () => {
@@ -27,10 +28,12 @@ function App() {
 
   const handleInterviewEnd = (analysis: any) => {
     alert(analysis.feedback);
+    clearMessages();
     setCurrentSession(null);
   };
 
   const handleBackToHome = () => {
+    clearMessages();
     setCurrentSession(null);
     setCurrentProfile(null);
     setShowWizard(false);
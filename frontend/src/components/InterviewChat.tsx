@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
-import { useInterviewStore } from '../store/interviewStore';
+import { ReplayedTurn, useInterviewStore } from '../store/interviewStore';
 import axios from 'axios';
 
 interface InterviewChatProps {
@@ -11,13 +11,68 @@ interface InterviewChatProps {
 const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd, profile }) => {
   const [userInput, setUserInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
+  const [queueMessage, setQueueMessage] = useState('');
   const [currentQuestion, setCurrentQuestion] = useState('');
-  const [interviewStarted, setInterviewStarted] = useState(false);
-  const [actualSessionId, setActualSessionId] = useState<string | null>(null);
+  // 새로고침 전에 진행 중이던 면접이면 저장된 세션으로 이어서 진행
+  const resumedRef = useRef(useInterviewStore.getState().sessionId !== null);
+  const [interviewStarted, setInterviewStarted] = useState(resumedRef.current);
+  const [actualSessionId, setActualSessionId] = useState<string | null>(() => useInterviewStore.getState().sessionId);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const hasStartedRef = useRef(false); // 면접 시작 여부 추적
+  const draftEnabledRef = useRef(true); // 서버가 추측 실행을 끄고 있으면 초안 전송 중단
+  const loadingRef = useRef(false); // 응답 처리 중에는 이력 동기화를 미룸
   
-  const { messages, addMessage } = useInterviewStore();
+  const { messages, addMessage, appendToLastMessage, updateLastMessage, startSession, confirmTurn, applyReplay } = useInterviewStore();
+
+  useEffect(() => {
+    loadingRef.current = isLoading;
+  }, [isLoading]);
+
+  // 서버에서 마지막으로 받은 순번 뒤의 턴만 받아 대화 동기화 (전체 대화록을 다시 받지 않음)
+  // 새로 받은 턴 목록을 반환 (세션이 없거나 실패하면 빈 목록)
+  const resyncTurns = async (): Promise<ReplayedTurn[]> => {
+    const { sessionId: storedSessionId, lastSeq } = useInterviewStore.getState();
+    if (!storedSessionId) return [];
+    try {
+      const response = await axios.get(`http://localhost:8000/api/interview/${storedSessionId}/turns`, {
+        params: { after: lastSeq }
+      });
+      const { turns, seq, reset } = response.data as { turns: ReplayedTurn[]; seq: number; reset: boolean };
+      applyReplay(turns, seq, reset);
+      const missing = reset ? turns : turns.filter((turn) => turn.seq > lastSeq);
+      const last = missing[missing.length - 1];
+      if (last && last.role === 'assistant') {
+        setCurrentQuestion(last.content);
+      }
+      return missing;
+    } catch (error) {
+      if (axios.isAxiosError(error) && error.response?.status === 404) {
+        setQueueMessage('면접 세션이 만료되었습니다. 새 면접을 시작해주세요.');
+      } else {
+        console.error('대화 동기화 실패:', error);
+      }
+      return [];
+    }
+  };
+
+  // 새로고침으로 이어서 진행하거나, 네트워크가 돌아오거나 화면으로 돌아오면 놓친 턴 동기화
+  useEffect(() => {
+    if (resumedRef.current) {
+      resyncTurns();
+    }
+    const resyncIfIdle = () => {
+      if (!loadingRef.current && document.visibilityState === 'visible') {
+        resyncTurns();
+      }
+    };
+    window.addEventListener('online', resyncIfIdle);
+    document.addEventListener('visibilitychange', resyncIfIdle);
+    return () => {
+      window.removeEventListener('online', resyncIfIdle);
+      document.removeEventListener('visibilitychange', resyncIfIdle);
+    };
+  }, []);
 
   // 스크롤을 최하단으로
   const scrollToBottom = () => {
@@ -28,6 +83,26 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
     scrollToBottom();
   }, [messages]);
 
+  // 답변 작성 중 입력이 잠시 멈추면 초안을 보내 서버가 다음 질문을 미리 준비하게 함
+  useEffect(() => {
+    const currentSessionId = actualSessionId || sessionId;
+    const draft = userInput.trim();
+    if (!currentSessionId || !draftEnabledRef.current || isLoading || draft.length < 20) return;
+
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.post('http://localhost:8000/api/interview/draft', {
+          session_id: currentSessionId,
+          content: draft
+        });
+        draftEnabledRef.current = response.data.enabled;
+      } catch (error) {
+        // 초안 전송 실패는 답변 처리에 영향이 없으므로 무시
+      }
+    }, 1000);
+    return () => clearTimeout(timer);
+  }, [userInput, actualSessionId, sessionId, isLoading]);
+
   // 면접 시작 - React StrictMode 중복 실행 방지
   useEffect(() => {
     let isCanceled = false;
@@ -88,11 +163,13 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
         `안녕하세요! ${profile?.institution || '지원 기관'} 면접에 오신 것을 환영합니다. 자기소개를 부탁드립니다.`;
 
       setActualSessionId(newSessionId);
+      startSession(newSessionId, profile);
 
       addMessage({
         role: 'assistant',
         content: welcomeMessage,
-        timestamp: new Date().toISOString()
+        timestamp: new Date().toISOString(),
+        seq: response.data.seq ?? 1
       });
 
       setCurrentQuestion(welcomeMessage);
@@ -129,30 +206,110 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
 
     setIsLoading(true);
 
+    let streamStarted = false;
+    setQueueMessage('');
+
     try {
       console.log('사용자 응답 전송:', { session_id: actualSessionId || sessionId, response: userMessage });
       
-      // 백엔드에 사용자 응답 전송
-      const response = await axios.post('http://localhost:8000/api/interview/respond', {
-        session_id: actualSessionId || sessionId,
-        response: userMessage
+      // 백엔드에 사용자 응답 전송 (SSE 스트리밍)
+      const response = await fetch('http://localhost:8000/api/interview/respond/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          session_id: actualSessionId || sessionId,
+          response: userMessage
+        })
       });
 
-      console.log('AI 응답:', response.data);
+      if (!response.ok || !response.body) {
+        throw new Error(`스트리밍 응답 오류: ${response.status}`);
+      }
 
-      const aiResponse = response.data.question || response.data.response || "흥미로운 답변이네요. 더 자세히 설명해 주실 수 있나요?";
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let aiResponse = '';
+      let overloaded = false;
 
-      // AI 응답 추가
-      addMessage({
-        role: 'assistant',
-        content: aiResponse,
-        timestamp: new Date().toISOString()
-      });
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE 이벤트는 빈 줄로 구분됨
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+
+        for (const rawEvent of events) {
+          const dataLine = rawEvent.split('\n').find((line) => line.startsWith('data: '));
+          if (!dataLine) continue;
+          const frame = JSON.parse(dataLine.slice(6));
+
+          // 서버가 혼잡하면 대기 순번 또는 "잠시 후 다시 시도" 안내를 먼저 보냄
+          if (frame.type === 'queue_status') {
+            setQueueMessage(frame.message);
+            if (frame.status === 'overloaded') {
+              // 답변은 기록되지 않았으므로 입력창에 되돌려 다시 보낼 수 있게 함
+              setUserInput(userMessage);
+              overloaded = true;
+            }
+            continue;
+          }
+          setQueueMessage('');
+
+          if (!streamStarted) {
+            // 첫 토큰이 도착하면 빈 AI 메시지를 만들고 로딩 표시를 내림
+            streamStarted = true;
+            setIsStreaming(true);
+            addMessage({
+              role: 'assistant',
+              content: '',
+              timestamp: frame.timestamp || new Date().toISOString()
+            });
+          }
+
+          if (frame.type === 'ai_question_delta') {
+            appendToLastMessage(frame.content);
+          } else if (frame.type === 'ai_question') {
+            aiResponse = frame.content;
+            updateLastMessage(aiResponse);
+            if (frame.seq) {
+              confirmTurn(frame.seq);
+            }
+          }
+        }
+      }
+
+      console.log('AI 응답:', aiResponse);
+
+      if (overloaded) {
+        return;
+      }
+
+      if (!aiResponse) {
+        aiResponse = "흥미로운 답변이네요. 더 자세히 설명해 주실 수 있나요?";
+        if (streamStarted) {
+          updateLastMessage(aiResponse);
+        } else {
+          addMessage({
+            role: 'assistant',
+            content: aiResponse,
+            timestamp: new Date().toISOString()
+          });
+        }
+      }
 
       setCurrentQuestion(aiResponse);
 
     } catch (error) {
       console.error('응답 전송 실패:', error);
+
+      // 스트림만 끊기고 서버는 답변을 처리했을 수 있으므로 놓친 턴부터 확인
+      const missing = await resyncTurns();
+      if (missing.some((turn) => turn.role === 'assistant')) {
+        return;
+      }
       
       // 간단한 AI 응답 생성 (백엔드 실패시 폴백)
       const fallbackResponses = [
@@ -164,32 +321,51 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
       
       const fallbackResponse = fallbackResponses[Math.floor(Math.random() * fallbackResponses.length)];
       
-      addMessage({
-        role: 'assistant',
-        content: fallbackResponse,
-        timestamp: new Date().toISOString()
-      });
+      if (streamStarted) {
+        updateLastMessage(fallbackResponse);
+      } else {
+        addMessage({
+          role: 'assistant',
+          content: fallbackResponse,
+          timestamp: new Date().toISOString()
+        });
+      }
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
-  // 면접 종료
+  // 면접 종료 - 분석 작업을 등록한 뒤 완료될 때까지 결과 조회
   const endInterview = async () => {
+    const currentSessionId = actualSessionId || sessionId;
+
     try {
-      const response = await axios.post(`http://localhost:8000/api/interview/end?session_id=${actualSessionId || sessionId}`);
+      setIsLoading(true);
+      const response = await axios.post(`http://localhost:8000/api/interview/end?session_id=${currentSessionId}`);
+      let job = response.data;
+
+      const deadline = Date.now() + 120000;
+      while ((job.status === 'queued' || job.status === 'running') && Date.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, 1500));
+        const poll = await axios.get(`http://localhost:8000/api/interview/analysis/${job.job_id}`);
+        job = poll.data;
+      }
 
       onInterviewEnd({
-        feedback: response.data.feedback || "면접이 완료되었습니다. 수고하셨습니다!",
-        session_id: actualSessionId || sessionId,
-        analysis: response.data
+        feedback: job.result?.feedback || "면접이 완료되었습니다. 수고하셨습니다!",
+        session_id: currentSessionId,
+        job_id: job.job_id,
+        analysis: job.result
       });
     } catch (error) {
       console.error('면접 종료 실패:', error);
       onInterviewEnd({
         feedback: "면접이 완료되었습니다. 수고하셨습니다!",
-        session_id: actualSessionId || sessionId
+        session_id: currentSessionId
       });
+    } finally {
+      setIsLoading(false);
     }
   };
 
@@ -229,11 +405,12 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
           </div>
         ))}
         
-        {isLoading && (
+        {isLoading && !isStreaming && (
           <div className="flex justify-start">
             <div className="bg-gray-100 text-gray-800 p-3 rounded-lg">
               <div className="flex items-center space-x-2">
                 <span className="text-sm font-medium">AI 면접관</span>
+                {queueMessage && <span className="text-xs text-gray-500">{queueMessage}</span>}
                 <div className="flex space-x-1">
                   <div className="w-2 h-2 bg-gray-400 rounded-full animate-bounce"></div>
                   <div className="w-2 h-2 bg-gray-400 rounded-full animate-bounce" style={{animationDelay: '0.1s'}}></div>
@@ -243,6 +420,9 @@ const InterviewChat: React.FC<InterviewChatProps> = ({ sessionId, onInterviewEnd
             </div>
           </div>
         )}
+        {!isLoading && queueMessage && (
+          <div className="text-center text-sm text-amber-600">{queueMessage}</div>
+        )}
         <div ref={messagesEndRef} />
       </div>
 
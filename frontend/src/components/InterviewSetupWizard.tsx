@@ -73,7 +73,8 @@ const InterviewSetupWizard: React.FC<InterviewSetupWizardProps> = ({ onComplete,
     keywords: [] as string[],
     additionalStyle: '',
     uploadedFiles: [] as any[],
-    difficulty: '' // 난이도 추가
+    difficulty: '', // 난이도 추가
+    responseCache: false // 반복 연습 모드 (비슷한 답변에는 저장된 면접관 응답 재사용)
   });
 
   const [keywordInput, setKeywordInput] = useState('');
@@ -89,6 +90,33 @@ const InterviewSetupWizard: React.FC<InterviewSetupWizardProps> = ({ onComplete,
     setProfile({ ...profile, keywords: profile.keywords.filter(k => k !== keyword) });
   };
 
+  const [isUploading, setIsUploading] = useState(false);
+
+  // 파일은 업로드 엔드포인트로 따로 보내고, 프로필에는 반환된 파일 ID와 메타데이터만 담음
+  const uploadFiles = async (files: FileList | null) => {
+    if (!files || files.length === 0) return;
+    setIsUploading(true);
+    try {
+      const uploaded = [];
+      for (const file of Array.from(files)) {
+        const formData = new FormData();
+        formData.append('file', file);
+        const response = await axios.post('http://localhost:8000/api/interview/files', formData);
+        uploaded.push(response.data);
+      }
+      setProfile(prev => ({ ...prev, uploadedFiles: [...prev.uploadedFiles, ...uploaded] }));
+    } catch (error) {
+      console.error('파일 업로드 실패:', error);
+      alert('파일 업로드에 실패했습니다. 파일 크기와 형식을 확인해주세요.');
+    } finally {
+      setIsUploading(false);
+    }
+  };
+
+  const removeFile = (fileId: string) => {
+    setProfile(prev => ({ ...prev, uploadedFiles: prev.uploadedFiles.filter(f => f.id !== fileId) }));
+  };
+
   // 다음 단계로
   const nextStep = () => {
     if (currentStep < 6) {
@@ -310,17 +338,34 @@ const InterviewSetupWizard: React.FC<InterviewSetupWizardProps> = ({ onComplete,
               <input
                 type="file"
                 multiple
-                accept=".pdf,.doc,.docx,.txt,.hwp"
+                accept=".pdf,.doc,.docx,.txt,.hwp,.hwpx,.xlsx"
                 className="hidden"
                 id="file-upload"
+                disabled={isUploading}
+                onChange={(e) => {
+                  uploadFiles(e.target.files);
+                  e.target.value = '';
+                }}
               />
               <label htmlFor="file-upload" className="cursor-pointer">
                 <div className="text-gray-500">
-                  <p className="text-lg mb-2">파일을 드래그하거나 클릭하여 업로드</p>
+                  <p className="text-lg mb-2">{isUploading ? '업로드 중...' : '파일을 드래그하거나 클릭하여 업로드'}</p>
                   <p className="text-sm">업로드 가능한 파일 형식: hwp(x), doc(x), pdf, xlsx, txt</p>
                 </div>
               </label>
             </div>
+            {profile.uploadedFiles.length > 0 && (
+              <ul className="mt-4 space-y-2">
+                {profile.uploadedFiles.map((file) => (
+                  <li key={file.id} className="flex items-center justify-between bg-gray-50 rounded-lg px-4 py-2 text-sm">
+                    <span>📄 {file.name} ({file.chars}자)</span>
+                    <button onClick={() => removeFile(file.id)} className="text-red-500 hover:text-red-700">
+                      삭제
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
             <p className="text-sm text-gray-500 mt-3">파일 업로드는 선택사항입니다.</p>
           </div>
         )}
@@ -338,6 +383,15 @@ const InterviewSetupWizard: React.FC<InterviewSetupWizardProps> = ({ onComplete,
               autoFocus
             />
             <p className="text-sm text-gray-500 mt-2">이 내용은 선택사항입니다.</p>
+            <label className="flex items-center mt-6 text-gray-700">
+              <input
+                type="checkbox"
+                checked={profile.responseCache}
+                onChange={(e) => setProfile(prev => ({ ...prev, responseCache: e.target.checked }))}
+                className="mr-2"
+              />
+              반복 연습 모드 - 같은 질문에 비슷하게 답하면 이전 면접관 응답을 바로 보여줍니다.
+            </label>
           </div>
         )}
       </div>
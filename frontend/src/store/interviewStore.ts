@@ -1,24 +1,102 @@
 import { create } from 'zustand';
+import { createJSONStorage, persist } from 'zustand/middleware';
 
 export interface Message {
   role: 'user' | 'assistant';
   content: string;
   timestamp: string;
+  seq?: number; // 서버 대화 이력의 턴 순번 (서버가 확인하기 전의 메시지는 없음)
+}
+
+// 서버가 다시 보낸 대화 턴 (GET /api/interview/{session_id}/turns, WebSocket history_replay)
+export interface ReplayedTurn extends Message {
+  seq: number;
 }
 
 interface InterviewState {
   messages: Message[];
+  sessionId: string | null; // 진행 중인 면접의 서버 세션 ID - 새로고침 후 이어서 진행
+  profile: any;
+  lastSeq: number; // 서버에서 받은 마지막 턴 순번
   addMessage: (message: Message) => void;
+  appendToLastMessage: (delta: string) => void;
+  updateLastMessage: (content: string) => void;
+  startSession: (sessionId: string, profile: any) => void;
+  confirmTurn: (seq: number) => void;
+  applyReplay: (turns: ReplayedTurn[], seq: number, reset: boolean) => void;
   clearMessages: () => void;
 }
 
-export const useInterviewStore = create<InterviewState>((set) => ({
-  messages: [],
-  
-  addMessage: (message) =>
-    set((state) => ({
-      messages: [...state.messages, message],
-    })),
+export const useInterviewStore = create<InterviewState>()(
+  persist(
+    (set) => ({
+      messages: [],
+      sessionId: null,
+      profile: null,
+      lastSeq: 0,
+
+      addMessage: (message) =>
+        set((state) => ({
+          messages: [...state.messages, message],
+          lastSeq: message.seq ? Math.max(state.lastSeq, message.seq) : state.lastSeq,
+        })),
+
+      // 스트리밍 중인 마지막 메시지에 토큰 조각 이어붙이기
+      appendToLastMessage: (delta) =>
+        set((state) => {
+          if (state.messages.length === 0) return state;
+          const messages = [...state.messages];
+          const last = messages[messages.length - 1];
+          messages[messages.length - 1] = { ...last, content: last.content + delta };
+          return { messages };
+        }),
+
+      // 스트리밍 완료 시 서버가 확정한 전체 텍스트로 교체
+      updateLastMessage: (content) =>
+        set((state) => {
+          if (state.messages.length === 0) return state;
+          const messages = [...state.messages];
+          messages[messages.length - 1] = { ...messages[messages.length - 1], content };
+          return { messages };
+        }),
+
+      startSession: (sessionId, profile) => set({ sessionId, profile, lastSeq: 0 }),
+
+      // 서버가 마지막 메시지(면접관 질문)를 seq 번째 턴으로 기록함 - 바로 앞의 답변은 seq - 1 번째
+      confirmTurn: (seq) =>
+        set((state) => {
+          if (state.messages.length === 0) return state;
+          const messages = [...state.messages];
+          messages[messages.length - 1] = { ...messages[messages.length - 1], seq };
+          const previous = messages[messages.length - 2];
+          if (previous && previous.role === 'user' && previous.seq === undefined) {
+            messages[messages.length - 2] = { ...previous, seq: seq - 1 };
+          }
+          return { messages, lastSeq: Math.max(state.lastSeq, seq) };
+        }),
+
+      // 서버가 다시 보낸 턴 반영 - 이미 받은 순번은 건너뛰고, 놓친 턴이 있으면 서버가 확인하지 않은
+      // 끝부분 메시지(끊긴 스트림, 임시 응답)를 그 턴들로 대체. reset 이면 전체 이력으로 교체
+      applyReplay: (turns, seq, reset) =>
+        set((state) => {
+          if (reset) {
+            return { messages: turns, lastSeq: seq };
+          }
+          const missing = turns.filter((turn) => turn.seq > state.lastSeq);
+          if (missing.length === 0) return state;
+          const messages = [...state.messages];
+          while (messages.length > 0 && messages[messages.length - 1].seq === undefined) {
+            messages.pop();
+          }
+          return { messages: [...messages, ...missing], lastSeq: Math.max(state.lastSeq, seq) };
+        }),
 
-  clearMessages: () => set({ messages: [] }),
-}));
+      clearMessages: () => set({ messages: [], sessionId: null, profile: null, lastSeq: 0 }),
+    }),
+    {
+      // 탭을 닫기 전까지 새로고침해도 대화가 남도록 sessionStorage 에 보관
+      name: 'interview-store',
+      storage: createJSONStorage(() => sessionStorage),
+    }
+  )
+);
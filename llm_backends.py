@@ -0,0 +1,441 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+# 모든 백엔드가 공유하는 생성 설정
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.8,
+    "top_k": 40,
+    "max_output_tokens": 1000,
+}
+
+
+def key_fingerprint(name: str, api_key: str) -> str:
+    """API 키별 속도 제한에 쓰는 식별자 (키 원문은 상태 조회에 드러나지 않게 해시)"""
+    return f"{name}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:8]}"
+
+
+class LLMBackend:
+    """LLM 공급자 공통 인터페이스
+
+    messages 는 [{"role": "user" | "assistant", "content": str}, ...] 형식이며,
+    system_instruction 은 유형/난이도별 고정 프롬프트처럼 여러 세션이 공유하는 지시문입니다.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str, generation_config: Optional[Dict] = None):
+        self.model_name = model_name
+        self.generation_config = generation_config or dict(DEFAULT_GENERATION_CONFIG)
+        # 속도 제한(RPM/TPM) 버킷을 나누는 API 키 식별자
+        self.key_id = self.name
+        self.requests = 0
+        self.prompt_chars = 0
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        """전체 응답 텍스트 생성"""
+        raise NotImplementedError
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        """응답을 생성되는 순서대로 텍스트 조각 단위로 전달 (기본: 한 번에 전달)"""
+        yield await self.generate(messages, system_instruction)
+
+    async def generate_json(self, messages: List[Dict], schema: Dict, system_instruction: Optional[str] = None) -> str:
+        """schema(JSON Schema)를 따르는 JSON 텍스트 생성
+
+        기본 구현은 일반 생성과 같으므로 프롬프트에도 스키마를 적어 보내야 하며, 공급자의 JSON 출력
+        모드를 쓸 수 있는 백엔드는 이를 사용합니다. 결과는 호출한 쪽에서 검증합니다.
+        """
+        return await self.generate(messages, system_instruction)
+
+    def prewarm(self, system_instruction: Optional[str]):
+        """다음 호출 전에 미리 준비할 것이 있으면 준비 (기본: 없음)"""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "model": self.model_name,
+            "key": self.key_id,
+            "requests": self.requests,
+            "prompt_chars": self.prompt_chars,
+        }
+
+    async def close(self):
+        pass
+
+    def _count(self, messages: List[Dict], system_instruction: Optional[str]):
+        self.requests += 1
+        self.prompt_chars += sum(len(msg["content"]) for msg in messages) + len(system_instruction or "")
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini 어댑터 - 블로킹 SDK 호출은 LLMExecutor 스레드 풀에서 실행
+
+    고정 프롬프트는 해시별로 system_instruction 이 등록된 GenerativeModel 을 한 번만 만들어
+    같은 유형/난이도의 모든 세션이 재사용합니다. SDK가 system_instruction 을 지원하지 않으면
+    첫 사용자 메시지 앞에 붙여 보냅니다.
+    """
+
+    name = "gemini"
+
+    def __init__(self, executor, api_key: str, model_name: str = "gemini-1.5-pro",
+                 generation_config: Optional[Dict] = None):
+        super().__init__(model_name, generation_config)
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.key_id = key_fingerprint(self.name, api_key)
+        self._genai = genai
+        self.executor = executor
+        self.supports_system_instruction = True
+        self.supports_json_mode = True
+        self._models: Dict[str, Any] = {}
+        self._base_model = genai.GenerativeModel(model_name=model_name, generation_config=self.generation_config)
+
+    def _model_for(self, system_instruction: Optional[str]):
+        if not system_instruction or not self.supports_system_instruction:
+            return self._base_model
+
+        key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        model = self._models.get(key)
+        if model is None:
+            try:
+                model = self._genai.GenerativeModel(
+                    model_name=self.model_name,
+                    generation_config=self.generation_config,
+                    system_instruction=system_instruction
+                )
+            except TypeError:
+                print("경고: 설치된 SDK가 system_instruction 을 지원하지 않아 첫 메시지에 프롬프트를 포함합니다.")
+                self.supports_system_instruction = False
+                return self._base_model
+            self._models[key] = model
+            print(f"✅ 고정 프롬프트 등록: {key[:8]}")
+        return model
+
+    def prewarm(self, system_instruction: Optional[str]):
+        # 고정 프롬프트 모델을 첫 호출 전에 만들어 둠
+        self._model_for(system_instruction)
+
+    def _contents(self, messages: List[Dict], system_instruction: Optional[str]) -> List[Dict]:
+        contents = [
+            {"role": "model" if msg["role"] == "assistant" else "user", "parts": [msg["content"]]}
+            for msg in messages
+        ]
+        if system_instruction and not self.supports_system_instruction and contents:
+            contents[0] = {"role": "user", "parts": [f"[시스템] {system_instruction}\n\n{contents[0]['parts'][0]}"]}
+        return contents
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        self._count(messages, system_instruction)
+        model = self._model_for(system_instruction)
+        response = await self.executor.run(model.generate_content, self._contents(messages, system_instruction))
+        return response.text
+
+    async def generate_json(self, messages: List[Dict], schema: Dict, system_instruction: Optional[str] = None) -> str:
+        if not self.supports_json_mode:
+            return await self.generate(messages, system_instruction)
+        self._count(messages, system_instruction)
+        model = self._model_for(system_instruction)
+        try:
+            response = await self.executor.run(
+                model.generate_content, self._contents(messages, system_instruction),
+                generation_config={**self.generation_config, "response_mime_type": "application/json"}
+            )
+        except (TypeError, ValueError) as e:
+            print(f"경고: 설치된 SDK가 JSON 출력 모드를 지원하지 않아 일반 생성으로 대체합니다: {e}")
+            self.supports_json_mode = False
+            return await self.generate(messages, system_instruction)
+        return response.text
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        self._count(messages, system_instruction)
+        model = self._model_for(system_instruction)
+        async for chunk in self.executor.stream(
+            model.generate_content, self._contents(messages, system_instruction), stream=True
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "registered_prefixes": len(self._models),
+            "system_instruction_supported": self.supports_system_instruction,
+            "json_mode_supported": self.supports_json_mode,
+        }
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI Chat Completions 어댑터 (네이티브 async 클라이언트)"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model_name: str = "gpt-4", generation_config: Optional[Dict] = None):
+        super().__init__(model_name, generation_config)
+        from openai import AsyncOpenAI
+
+        self.client = AsyncOpenAI(api_key=api_key)
+        self.key_id = key_fingerprint(self.name, api_key)
+
+    def _request(self, messages: List[Dict], system_instruction: Optional[str]) -> Dict:
+        chat = [{"role": "system", "content": system_instruction}] if system_instruction else []
+        chat += [{"role": msg["role"], "content": msg["content"]} for msg in messages]
+        return {
+            "model": self.model_name,
+            "messages": chat,
+            "temperature": self.generation_config["temperature"],
+            "top_p": self.generation_config["top_p"],
+            "max_tokens": self.generation_config["max_output_tokens"],
+        }
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        self._count(messages, system_instruction)
+        response = await self.client.chat.completions.create(**self._request(messages, system_instruction))
+        return response.choices[0].message.content or ""
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        self._count(messages, system_instruction)
+        response = await self.client.chat.completions.create(
+            **self._request(messages, system_instruction), stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def close(self):
+        await self.client.close()
+
+
+class AnthropicBackend(LLMBackend):
+    """Anthropic Claude 어댑터 (네이티브 async 클라이언트)
+
+    Messages API 가 있는 SDK 에서는 이를 사용하고, requirements.txt 에 고정된
+    구버전 SDK 에서는 Human/Assistant 형식의 Completions API 를 사용합니다.
+    """
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model_name: str = "claude-2.1", generation_config: Optional[Dict] = None):
+        super().__init__(model_name, generation_config)
+        import anthropic
+
+        self._anthropic = anthropic
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        self.key_id = key_fingerprint(self.name, api_key)
+        self.use_messages_api = hasattr(self.client, "messages")
+
+    def _sampling(self) -> Dict:
+        return {
+            "temperature": self.generation_config["temperature"],
+            "top_p": self.generation_config["top_p"],
+            "top_k": self.generation_config["top_k"],
+        }
+
+    def _messages_request(self, messages: List[Dict], system_instruction: Optional[str]) -> Dict:
+        request = {
+            "model": self.model_name,
+            "messages": [{"role": msg["role"], "content": msg["content"]} for msg in messages],
+            "max_tokens": self.generation_config["max_output_tokens"],
+            **self._sampling(),
+        }
+        if system_instruction:
+            request["system"] = system_instruction
+        return request
+
+    def _completion_request(self, messages: List[Dict], system_instruction: Optional[str]) -> Dict:
+        human, assistant = self._anthropic.HUMAN_PROMPT, self._anthropic.AI_PROMPT
+        prompt = system_instruction or ""
+        for msg in messages:
+            prompt += f"{human if msg['role'] == 'user' else assistant} {msg['content']}"
+        return {
+            "model": self.model_name,
+            "prompt": prompt + assistant,
+            "max_tokens_to_sample": self.generation_config["max_output_tokens"],
+            **self._sampling(),
+        }
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        self._count(messages, system_instruction)
+        if self.use_messages_api:
+            response = await self.client.messages.create(**self._messages_request(messages, system_instruction))
+            return "".join(block.text for block in response.content if getattr(block, "text", None))
+        response = await self.client.completions.create(**self._completion_request(messages, system_instruction))
+        return response.completion
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        self._count(messages, system_instruction)
+        if self.use_messages_api:
+            response = await self.client.messages.create(
+                **self._messages_request(messages, system_instruction), stream=True
+            )
+            async for event in response:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
+            return
+        response = await self.client.completions.create(
+            **self._completion_request(messages, system_instruction), stream=True
+        )
+        async for chunk in response:
+            if chunk.completion:
+                yield chunk.completion
+
+    async def close(self):
+        await self.client.close()
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """지연 시간 분포 설정 파싱 (초 단위)
+
+    - constant:0.5          항상 0.5초
+    - uniform:0.2,1.5       0.2~1.5초 균등 분포
+    - normal:1.0,0.3        평균 1.0초, 표준편차 0.3초 (음수는 0)
+    - lognormal:0.8,0.5     중앙값 0.8초, 로그 표준편차 0.5 (긴 꼬리 지연 재현)
+    - exponential:0.5       평균 0.5초 지수 분포
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    kind = kind.strip().lower()
+
+    if kind == "constant":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    raise ValueError(f"알 수 없는 지연 시간 분포: {spec}")
+
+
+class FakeBackend(LLMBackend):
+    """API 호출 없이 부하 테스트/벤치마크를 하기 위한 결정적인 로컬 가짜 백엔드
+
+    응답 텍스트는 입력의 해시로 정해지고, 지연 시간은 FAKE_LLM_LATENCY 분포에서
+    FAKE_LLM_SEED 로 고정된 난수로 뽑습니다. 스트리밍 시 첫 조각은 전체 지연의
+    FAKE_LLM_TTFT_RATIO 비율 뒤에 도착하고 나머지 조각이 남은 시간 동안 고르게 도착합니다.
+    FAKE_LLM_ERROR_RATE 비율의 호출은 지연 후 일시 오류(ConnectionError)로 실패합니다.
+    """
+
+    name = "fake"
+
+    replies = [
+        "좋은 답변 감사합니다. 방금 말씀하신 내용에서 가장 중요하다고 생각하는 부분을 구체적인 예시와 함께 조금 더 설명해 주시겠어요?",
+        "흥미로운 경험이네요. 그 과정에서 가장 어려웠던 점은 무엇이었고, 어떻게 해결하셨나요?",
+        "잘 들었습니다. 그 경험이 지원하신 분야에 대한 관심으로 어떻게 이어졌는지 말씀해 주시겠어요?",
+        "좋습니다. 만약 같은 상황을 다시 겪는다면 어떤 점을 다르게 해보고 싶으신가요?",
+    ]
+
+    def __init__(self, latency: Optional[str] = None, ttft_ratio: Optional[float] = None,
+                 seed: Optional[int] = None, chunk_chars: int = 8):
+        super().__init__("fake")
+        self.latency_spec = latency or os.getenv('FAKE_LLM_LATENCY', 'constant:0')
+        self._latency = parse_latency(self.latency_spec)
+        self.ttft_ratio = ttft_ratio if ttft_ratio is not None else float(os.getenv('FAKE_LLM_TTFT_RATIO', 0.3))
+        self._rng = random.Random(seed if seed is not None else int(os.getenv('FAKE_LLM_SEED', 42)))
+        self.error_rate = float(os.getenv('FAKE_LLM_ERROR_RATE', 0))
+        self.chunk_chars = chunk_chars
+        self.errors = 0
+
+    def _maybe_fail(self):
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise ConnectionError("가짜 LLM 백엔드 일시 오류")
+
+    def _reply(self, messages: List[Dict]) -> str:
+        last = messages[-1]["content"] if messages else ""
+        digest = hashlib.md5(last.encode("utf-8")).hexdigest()
+        return f"{self.replies[int(digest, 16) % len(self.replies)]} (#{digest[:6]})"
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        self._count(messages, system_instruction)
+        await asyncio.sleep(self._latency(self._rng))
+        self._maybe_fail()
+        return self._reply(messages)
+
+    async def generate_json(self, messages: List[Dict], schema: Dict, system_instruction: Optional[str] = None) -> str:
+        # 스키마의 scores 항목마다 입력 해시로 정한 1~5점
+        self._count(messages, system_instruction)
+        await asyncio.sleep(self._latency(self._rng))
+        self._maybe_fail()
+        last = messages[-1]["content"] if messages else ""
+        areas = schema.get("properties", {}).get("scores", {}).get("properties", {})
+        scores = {
+            area: int(hashlib.md5(f"{area}|{last}".encode("utf-8")).hexdigest(), 16) % 5 + 1
+            for area in areas
+        }
+        return json.dumps({"scores": scores, "comment": "답변의 핵심은 분명하지만 구체적인 근거를 더 보여주면 좋겠습니다."},
+                          ensure_ascii=False)
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        self._count(messages, system_instruction)
+        total = self._latency(self._rng)
+        text = self._reply(messages)
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+
+        await asyncio.sleep(total * self.ttft_ratio)
+        self._maybe_fail()
+        gap = total * (1 - self.ttft_ratio) / max(len(chunks) - 1, 1)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(gap)
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "latency": self.latency_spec, "errors": self.errors}
+
+
+def create_llm_backend(executor) -> LLMBackend:
+    """LLM_BACKEND 환경 변수에 따라 백엔드 생성
+
+    gemini / openai / anthropic / fake 중 하나를 지정하며, auto(기본값)는 설정된 API 키를
+    Gemini, OpenAI, Anthropic 순서로 찾습니다. 가짜 백엔드는 LLM_BACKEND=fake 로 명시했을 때만 쓰고,
+    키가 하나도 없으면 실제 지원자에게 가짜 응답이 나가지 않도록 서버 시작을 중단합니다.
+    """
+    choice = os.getenv('LLM_BACKEND', 'auto').lower()
+    google_api_key = os.getenv('GOOGLE_API_KEY')
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
+
+    if choice == "auto":
+        if google_api_key:
+            choice = "gemini"
+        elif openai_api_key:
+            choice = "openai"
+        elif anthropic_api_key:
+            choice = "anthropic"
+        else:
+            raise RuntimeError(
+                "LLM API 키(GOOGLE_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY)가 설정되지 않았습니다. "
+                ".env 파일을 확인하거나, 개발/부하 테스트라면 LLM_BACKEND=fake 로 가짜 백엔드를 명시하세요."
+            )
+
+    if choice == "gemini":
+        if not google_api_key:
+            raise RuntimeError("LLM_BACKEND=gemini 이지만 GOOGLE_API_KEY가 설정되지 않았습니다.")
+        backend = GeminiBackend(executor, google_api_key, os.getenv('GEMINI_MODEL', 'gemini-1.5-pro'))
+    elif choice == "openai":
+        if not openai_api_key:
+            raise RuntimeError("LLM_BACKEND=openai 이지만 OPENAI_API_KEY가 설정되지 않았습니다.")
+        backend = OpenAIBackend(openai_api_key, os.getenv('OPENAI_MODEL', 'gpt-4'))
+    elif choice == "anthropic":
+        if not anthropic_api_key:
+            raise RuntimeError("LLM_BACKEND=anthropic 이지만 ANTHROPIC_API_KEY가 설정되지 않았습니다.")
+        backend = AnthropicBackend(anthropic_api_key, os.getenv('ANTHROPIC_MODEL', 'claude-2.1'))
+    elif choice == "fake":
+        print("경고: LLM_BACKEND=fake - 실제 LLM 대신 로컬 가짜 백엔드의 고정 응답을 사용합니다.")
+        backend = FakeBackend()
+    else:
+        raise ValueError(f"알 수 없는 LLM_BACKEND: {choice}")
+
+    print(f"✅ LLM 백엔드 초기화: {backend.name} ({backend.model_name})")
+    return backend
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from metrics import observe
+
+
+class LLMExecutor:
+    """동기식 LLM SDK 호출을 이벤트 루프 밖에서 실행하는 제한된 스레드 풀
+
+    google-generativeai 의 send_message 는 블로킹 호출이므로, 그대로 await 문맥에서
+    호출하면 uvicorn 워커의 모든 요청이 멈춥니다. 이 실행기는 호출을 전용 스레드 풀로
+    넘기고, 대기열 깊이와 실행 중인 호출 수를 집계합니다.
+
+    호출자가 시간 초과나 헤지 요청 패배로 기다림을 취소해도 이미 시작된 블로킹 호출은 멈출 수
+    없으므로, 이런 호출은 버려진(abandoned) 호출로 세고 실제로 끝날 때까지 on_abandon() 이
+    돌려준 해제 함수를 부르지 않습니다 (스케줄러 슬롯을 계속 점유하게 하는 데 사용).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        # 풀 크기는 LLM_MAX_WORKERS 환경 변수로 설정 (기본값: 16)
+        self.max_workers = max_workers or int(os.getenv('LLM_MAX_WORKERS', 16))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._abandoned = 0
+        # 호출이 버려질 때 호출 - 반환한 함수는 그 호출이 실제로 끝나면 이벤트 루프에서 호출
+        self.on_abandon: Optional[Callable[[], Callable[[], None]]] = None
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """func(*args, **kwargs) 를 스레드 풀에서 실행하고 결과를 기다림 (풀 대기 시간은 llm_queue_wait 로 기록)"""
+        with self._lock:
+            self._queued += 1
+        submitted = time.perf_counter()
+        started: List[float] = []
+        future = self._pool.submit(self._invoke, func, args, kwargs, started)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancel() or future.cancelled():
+                # 스레드에서 시작하기 전에 취소됨
+                with self._lock:
+                    self._queued -= 1
+            elif not future.done():
+                self._abandon(future)
+            raise
+        finally:
+            if started:
+                observe("llm_queue_wait", started[0] - submitted, submitted)
+
+    def _abandon(self, future: Future):
+        """호출자가 떠났지만 스레드에서 계속 실행 중인 호출을 끝날 때까지 집계"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._abandoned += 1
+        release = self.on_abandon() if self.on_abandon else None
+
+        def finished(_):
+            with self._lock:
+                self._abandoned -= 1
+            if release is not None:
+                try:
+                    loop.call_soon_threadsafe(release)
+                except RuntimeError:
+                    # 이벤트 루프가 이미 닫힘 (서버 종료 중)
+                    pass
+
+        future.add_done_callback(finished)
+
+    async def stream(self, func: Callable[..., Any], *args, **kwargs) -> AsyncIterator[Any]:
+        """func(*args, **kwargs) 가 반환하는 이터러블을 스레드 풀에서 순회하며 항목을 하나씩 전달
+
+        스트리밍 응답의 각 청크는 생성되는 즉시 이벤트 루프로 넘어오므로,
+        호출자는 전체 생성이 끝나기 전에 첫 토큰을 클라이언트로 보낼 수 있습니다.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for item in func(*args, **kwargs):
+                    # 호출자가 순회를 그만두면 남은 응답은 받지 않고 스레드를 돌려줌
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+                raise
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+        producer = asyncio.ensure_future(self.run(produce))
+        # 오류는 큐를 통해 호출자에게 전달되므로 태스크 쪽 예외는 회수만 함
+        producer.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    break
+                yield item
+        finally:
+            stopped.set()
+            if not producer.done():
+                producer.cancel()
+
+    def _invoke(self, func: Callable[..., Any], args: tuple, kwargs: dict, started: List[float]) -> Any:
+        started.append(time.perf_counter())
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """대기열 깊이와 실행 중인 호출 수 등 실행기 상태"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "abandoned": self._abandoned,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """스레드 풀 종료"""
+        self._pool.shutdown(wait=wait)
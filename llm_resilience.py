@@ -0,0 +1,301 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from llm_backends import LLMBackend
+from llm_scheduler import LLMOverloaded, LLMScheduler
+from metrics import LLM_HEDGES_TOTAL, LLM_RETRIES_TOTAL, estimate_tokens
+
+# 헤지 요청이 스케줄러에서 쓰는 사용자 ID - 모든 헤지 요청이 한 사용자처럼 차례를 나눠 받으므로
+# 헤지 요청이 몰려도 실제 지원자의 호출 차례를 빼앗지 않음
+HEDGE_USER_ID = "__hedge__"
+
+
+class CircuitOpen(Exception):
+    """연속 실패로 회로 차단기가 열려 LLM 호출을 보내지 않음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM 호출이 일시 차단되었습니다. ({retry_after:.0f}초 후 재시도)")
+        self.retry_after = retry_after
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적인 오류인지 판단 - 인증/요청 형식 오류 같은 4xx 는 다시 보내도 실패하므로 재시도하지 않음"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    for attr in ("status_code", "http_status", "code"):
+        status = getattr(error, attr, None)
+        if callable(status):
+            try:
+                status = status()
+            except Exception:
+                status = None
+        status = getattr(status, "value", status)
+        if isinstance(status, int) and 400 <= status < 500:
+            return status in (408, 409, 429)
+    return not isinstance(error, (ValueError, TypeError, NotImplementedError))
+
+
+class CircuitBreaker:
+    """재시도까지 실패한 호출이 연속 LLM_BREAKER_FAILURES 번 쌓이면 LLM_BREAKER_RESET_SECONDS 동안 호출을 차단
+
+    차단 시간이 지나면 한 번의 시험 호출(half-open)만 보내고, 성공하면 다시 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or int(os.getenv('LLM_BREAKER_FAILURES', 5))
+        self.reset_timeout = reset_timeout or float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30))
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+
+    def before_call(self):
+        """호출 전에 확인 - 차단 중이면 CircuitOpen"""
+        if self.state == "closed":
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+            return
+        self.rejected += 1
+        raise CircuitOpen(max(remaining, 1.0))
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opens += 1
+                print(f"경고: LLM 회로 차단기 열림 - 연속 실패 {self.failures}회, {self.reset_timeout:.0f}초간 기본 질문 사용")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientBackend(LLMBackend):
+    """LLM 백엔드 앞단의 재시도, 헤지 요청, 회로 차단기
+
+    - 일시적인 오류는 최대 LLM_MAX_RETRIES 번, 지수 백오프에 무작위 지터(full jitter)를 더해 재시도
+    - 호출마다 LLM_TIMEOUT_SECONDS 시간 제한 (스트리밍은 첫 조각까지)
+    - LLM_HEDGE=true 면 최근 응답 시간의 p{LLM_HEDGE_PERCENTILE} 이 지나도 응답이 없을 때 같은 요청을
+      한 번 더 보내 먼저 끝난 쪽을 사용 (공급자 요청 수가 늘어나므로 기본값은 꺼짐). 헤지 요청도
+      스케줄러의 동시 실행/RPM·TPM 한도를 거치며, 대기열이 가득 차면 보내지 않음
+    - 연속 실패 시 회로 차단기가 열려 재시도 없이 바로 CircuitOpen
+
+    스트리밍은 첫 조각을 받기 전까지만 재시도하고, 이미 전달한 조각은 되돌릴 수 없으므로
+    그 이후의 오류는 그대로 올립니다. 헤지 요청도 전체 응답 생성(generate)에만 적용합니다.
+    """
+
+    def __init__(self, backend: LLMBackend, max_retries: Optional[int] = None,
+                 breaker: Optional[CircuitBreaker] = None, scheduler: Optional[LLMScheduler] = None):
+        super().__init__(backend.model_name, backend.generation_config)
+        self.backend = backend
+        # 헤지 요청의 호출 허가와 토큰 청구 (원래 요청은 호출한 쪽에서 이미 허가를 받음)
+        self.scheduler = scheduler
+        self.name = backend.name
+        self.key_id = backend.key_id
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('LLM_MAX_RETRIES', 2))
+        self.retry_base_delay = float(os.getenv('LLM_RETRY_BASE_DELAY_SECONDS', 0.5))
+        self.retry_max_delay = float(os.getenv('LLM_RETRY_MAX_DELAY_SECONDS', 8))
+        self.timeout = float(os.getenv('LLM_TIMEOUT_SECONDS', 60))
+        self.hedge_enabled = os.getenv('LLM_HEDGE', 'false').lower() == 'true'
+        self.hedge_percentile = float(os.getenv('LLM_HEDGE_PERCENTILE', 95))
+        self.hedge_min_samples = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20))
+        self.breaker = breaker or CircuitBreaker()
+
+        # 최근 성공한 호출의 응답 시간 (헤지 기준 계산용)
+        self._latencies: deque = deque(maxlen=500)
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_rejected = 0
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    def _hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보낼 시점 (표본이 부족하면 None)"""
+        if not self.hedge_enabled or len(self._latencies) < self.hedge_min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))]
+
+    async def _retry_or_raise(self, attempt: int, error: Exception):
+        """재시도할 수 있으면 백오프 대기, 아니면 실패를 차단기에 기록하고 오류를 그대로 올림"""
+        if isinstance(error, asyncio.TimeoutError):
+            self.timeouts += 1
+        if attempt >= self.max_retries or not is_retryable(error):
+            self.breaker.record_failure()
+            raise error
+        delay = self._backoff(attempt)
+        self.retries += 1
+        LLM_RETRIES_TOTAL.inc(reason=type(error).__name__)
+        print(f"경고: LLM 호출 실패, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {error!r}")
+        await asyncio.sleep(delay)
+        # 대기하는 동안 차단기가 열렸으면 더 보내지 않음
+        self.breaker.before_call()
+
+    @staticmethod
+    def _input_tokens(messages: List[Dict], system_instruction: Optional[str]) -> int:
+        return estimate_tokens(system_instruction or "") + sum(estimate_tokens(msg["content"]) for msg in messages)
+
+    async def generate(self, messages: List[Dict], system_instruction: Optional[str] = None) -> str:
+        return await self._call(lambda: self.backend.generate(messages, system_instruction),
+                                self._input_tokens(messages, system_instruction))
+
+    async def generate_json(self, messages: List[Dict], schema: Dict, system_instruction: Optional[str] = None) -> str:
+        return await self._call(lambda: self.backend.generate_json(messages, schema, system_instruction),
+                                self._input_tokens(messages, system_instruction))
+
+    async def _call(self, request: Callable[[], Awaitable[str]], tokens_in: int = 0) -> str:
+        """전체 응답 생성 호출에 재시도/헤지/차단기 적용 (request() 는 호출할 때마다 새 요청)"""
+        self.breaker.before_call()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                result = await self._generate_once(request, tokens_in)
+            except Exception as e:
+                await self._retry_or_raise(attempt, e)
+                attempt += 1
+                continue
+            self._latencies.append(time.perf_counter() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _generate_once(self, request: Callable[[], Awaitable[str]], tokens_in: int = 0) -> str:
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return await asyncio.wait_for(request(), self.timeout)
+
+        deadline = time.monotonic() + self.timeout
+        primary = asyncio.ensure_future(request())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=min(hedge_delay, self.timeout))
+            if not done:
+                # 평소 p95 안에 응답이 없으면 같은 요청을 한 번 더 보내 먼저 끝난 쪽을 사용
+                hedge = self._hedge(request, tokens_in)
+                if hedge is not None:
+                    tasks.append(hedge)
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(deadline - time.monotonic(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                            LLM_HEDGES_TOTAL.inc(outcome="won")
+                        return task.result()
+                    # 헤지 요청만 실패했으면 원래 요청의 오류를 우선
+                    if task is primary or error is None:
+                        error = task.exception()
+            raise error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # 취소가 끝나야 헤지 요청의 스케줄러 슬롯이 반환되고, 멈추지 못한 스레드 풀 호출은 슬롯을 넘겨받음
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    def _hedge(self, request: Callable[[], Awaitable[str]], tokens_in: int) -> Optional[asyncio.Future]:
+        """헤지 요청 시작 - 스케줄러 대기열이 가득 차 받아들여지지 않으면 None"""
+        if self.scheduler is None:
+            ticket = None
+        else:
+            try:
+                ticket = self.scheduler.submit(HEDGE_USER_ID, self.key_id, tokens_in)
+            except LLMOverloaded:
+                self.hedges_rejected += 1
+                LLM_HEDGES_TOTAL.inc(outcome="rejected")
+                return None
+        self.hedges += 1
+        LLM_HEDGES_TOTAL.inc(outcome="sent")
+        return asyncio.ensure_future(self._send_hedge(request, ticket))
+
+    async def _send_hedge(self, request: Callable[[], Awaitable[str]], ticket) -> str:
+        """스케줄러에서 호출 차례를 받은 뒤 헤지 요청을 보내고 출력 토큰을 청구 (원래 요청이 먼저 끝나면 취소됨)"""
+        if ticket is None:
+            return await request()
+        try:
+            await self.scheduler.acquire(ticket)
+            result = await request()
+        finally:
+            self.scheduler.release(ticket)
+        self.scheduler.charge(self.key_id, estimate_tokens(result))
+        return result
+
+    async def stream(self, messages: List[Dict], system_instruction: Optional[str] = None) -> AsyncIterator[str]:
+        self.breaker.before_call()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            chunks = self.backend.stream(messages, system_instruction)
+            try:
+                first = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+            except StopAsyncIteration:
+                self.breaker.record_success()
+                return
+            except Exception as e:
+                await chunks.aclose()
+                await self._retry_or_raise(attempt, e)
+                attempt += 1
+                continue
+            break
+
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            await chunks.aclose()
+        self._latencies.append(time.perf_counter() - started)
+        self.breaker.record_success()
+
+    def prewarm(self, system_instruction: Optional[str]):
+        self.backend.prewarm(system_instruction)
+
+    def stats(self) -> Dict:
+        hedge_delay = self._hedge_delay()
+        return {
+            **self.backend.stats(),
+            "resilience": {
+                "max_retries": self.max_retries,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "hedge_enabled": self.hedge_enabled,
+                "hedge_delay_ms": round(hedge_delay * 1000, 1) if hedge_delay is not None else None,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedges_rejected": self.hedges_rejected,
+                "circuit_breaker": self.breaker.stats(),
+            },
+        }
+
+    async def close(self):
+        await self.backend.close()
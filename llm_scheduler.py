@@ -0,0 +1,307 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from metrics import observe
+
+
+class LLMOverloaded(Exception):
+    """대기열이 가득 찼거나 대기 시간 제한을 넘겨 LLM 호출을 받아들일 수 없음"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """분당 한도(RPM/TPM)를 초 단위로 채우는 토큰 버킷
+
+    take() 는 잔량이 모자라도 빼므로(음수 허용) 응답 뒤에 알게 되는 출력 토큰도
+    나중에 청구할 수 있고, 그만큼 다음 호출의 대기 시간이 늘어납니다.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """amount 만큼 쓸 수 있을 때까지 남은 시간 (초, 지금 가능하면 0)"""
+        self._refill()
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 보냄
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+
+def key_env_suffix(key: str) -> str:
+    """API 키 식별자를 환경 변수 이름에 쓸 수 있게 변환 ("gemini:ab12cd34" -> "GEMINI_AB12CD34")"""
+    return re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_").upper()
+
+
+def load_key_limits() -> Dict[str, Dict[str, float]]:
+    """LLM_KEY_LIMITS (JSON: {"키 식별자": {"rpm": 분당 요청, "tpm": 분당 토큰}}) 읽기"""
+    raw = os.getenv('LLM_KEY_LIMITS', '').strip()
+    if not raw:
+        return {}
+    try:
+        limits = json.loads(raw)
+        if not isinstance(limits, dict) or not all(isinstance(value, dict) for value in limits.values()):
+            raise ValueError("키별 {\"rpm\": ..., \"tpm\": ...} 객체가 필요합니다")
+        return {key: {name: float(value[name]) for name in ("rpm", "tpm") if name in value}
+                for key, value in limits.items()}
+    except (ValueError, TypeError) as e:
+        print(f"경고: LLM_KEY_LIMITS 형식이 올바르지 않아 무시합니다: {e}")
+        return {}
+
+
+class Ticket:
+    """스케줄러 대기열의 LLM 호출 한 건"""
+
+    def __init__(self, user_id: str, key: str, tokens: int):
+        self.user_id = user_id
+        self.key = key
+        self.tokens = tokens
+        self.position = 0  # 대기 순번 (1부터, 호출 허가를 받으면 0)
+        self.granted = False
+        self.enqueued = time.perf_counter()
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        self._changed.set()
+
+
+class LLMScheduler:
+    """LLM 호출 앞단의 동시 실행 제한, 사용자 간 공정 스케줄러, 요청/토큰 속도 제한
+
+    호출은 사용자별 대기열에 들어가고, 빈 실행 슬롯(LLM_MAX_CONCURRENCY)이 생기면
+    사용자를 돌아가며 하나씩 꺼내므로 한 사용자가 요청을 몰아 보내도 다른 지원자의
+    대기 시간이 늘지 않습니다. 꺼낸 호출은 API 키별 RPM/TPM 토큰 버킷(LLM_RPM, LLM_TPM,
+    0 이면 제한 없음)에 여유가 생길 때까지 기다립니다. 키마다 한도가 다르면 LLM_KEY_LIMITS(JSON)
+    또는 LLM_RPM_<키>/LLM_TPM_<키> 로 덮어쓰고, 지정하지 않은 키는 전역 값을 씁니다. 대기열이 LLM_MAX_QUEUE 를 넘거나
+    LLM_MAX_QUEUE_WAIT_SECONDS 안에 차례가 오지 않으면 LLMOverloaded 를 올려 호출자가
+    기본 질문으로 조용히 넘어가지 않고 "잠시 후 다시 시도" 를 알릴 수 있게 합니다.
+    호출자가 포기했지만 스레드 풀에서 아직 끝나지 않은 호출은 hold() 로 슬롯을 계속 점유합니다.
+    한도는 워커 프로세스마다 따로 적용됩니다.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, rpm: Optional[float] = None,
+                 tpm: Optional[float] = None, max_queue: Optional[int] = None,
+                 max_wait: Optional[float] = None, key_limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv('LLM_MAX_CONCURRENCY', 16))
+        self.rpm = rpm if rpm is not None else float(os.getenv('LLM_RPM', 0))
+        self.tpm = tpm if tpm is not None else float(os.getenv('LLM_TPM', 0))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('LLM_MAX_QUEUE', 200))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv('LLM_MAX_QUEUE_WAIT_SECONDS', 30))
+        # API 키별 RPM/TPM 덮어쓰기 (없는 키/항목은 전역 rpm/tpm)
+        self.key_limits = key_limits if key_limits is not None else load_key_limits()
+
+        # 사용자 ID -> 대기 중인 호출 (OrderedDict 순서가 라운드 로빈 순서)
+        self._queues: "OrderedDict[str, Deque[Ticket]]" = OrderedDict()
+        self._queued = 0
+        self._active = 0
+        # 티켓 없이 점유 중인 슬롯 (버려졌지만 아직 실행 중인 스레드 풀 호출)
+        self._held = 0
+        # API 키 -> (RPM 버킷, TPM 버킷)
+        self._buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.rate_limited_waits = 0
+
+    def limits(self, key: str) -> Tuple[float, float]:
+        """API 키의 (RPM, TPM) - LLM_RPM_<키>/LLM_TPM_<키> > LLM_KEY_LIMITS > 전역 값 순"""
+        overrides = self.key_limits.get(key, {})
+        suffix = key_env_suffix(key)
+        rpm = float(os.getenv(f'LLM_RPM_{suffix}', overrides.get("rpm", self.rpm)))
+        tpm = float(os.getenv(f'LLM_TPM_{suffix}', overrides.get("tpm", self.tpm)))
+        return rpm, tpm
+
+    def _bucket(self, key: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            rpm, tpm = self.limits(key)
+            buckets = self._buckets[key] = (
+                TokenBucket(rpm) if rpm > 0 else None,
+                TokenBucket(tpm) if tpm > 0 else None,
+            )
+        return buckets
+
+    def _rate_delay(self, ticket: Ticket) -> float:
+        requests, tokens = self._bucket(ticket.key)
+        return max(
+            requests.delay(1) if requests else 0.0,
+            tokens.delay(ticket.tokens) if tokens else 0.0,
+        )
+
+    def submit(self, user_id: str, key: str, tokens: int) -> Ticket:
+        """호출을 대기열에 등록 (대기열이 가득 차면 LLMOverloaded)"""
+        if self._queued >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloaded("면접 요청이 많아 잠시 후 다시 시도해주세요.", self._retry_after())
+        ticket = Ticket(user_id, key, tokens)
+        self._queues.setdefault(user_id, deque()).append(ticket)
+        self._queued += 1
+        self._dispatch()
+        return ticket
+
+    async def wait(self, ticket: Ticket) -> AsyncIterator[int]:
+        """호출 허가를 받을 때까지 기다리며, 대기 순번이 바뀔 때마다 순번을 전달"""
+        deadline = time.monotonic() + self.max_wait
+        reported = 0
+        while not ticket.granted:
+            if ticket.position != reported:
+                reported = ticket.position
+                yield reported
+            ticket._changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.timed_out += 1
+                raise LLMOverloaded("대기 시간이 길어져 요청을 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+                                    self._retry_after())
+            try:
+                await asyncio.wait_for(ticket._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        observe("llm_admission", time.perf_counter() - ticket.enqueued, ticket.enqueued)
+
+    async def acquire(self, ticket: Ticket, on_wait: Optional[Callable[[int], Awaitable[None]]] = None):
+        """wait() 의 콜백 버전 - 대기 순번이 바뀌면 on_wait(순번) 호출"""
+        async for position in self.wait(ticket):
+            if on_wait is not None:
+                await on_wait(position)
+
+    def release(self, ticket: Ticket):
+        """호출이 끝났거나 대기를 포기한 경우 슬롯 반환 / 대기열에서 제거"""
+        if ticket.granted:
+            ticket.granted = False
+            self._active -= 1
+        else:
+            queue = self._queues.get(ticket.user_id)
+            if queue is None or ticket not in queue:
+                return
+            queue.remove(ticket)
+            self._queued -= 1
+            if not queue:
+                del self._queues[ticket.user_id]
+        self._dispatch()
+
+    def hold(self) -> Callable[[], None]:
+        """티켓과 별개로 실행 슬롯 하나를 점유 - 반환한 함수를 호출하면 해제 (여러 번 호출해도 한 번만 해제)"""
+        self._held += 1
+        released = False
+
+        def release():
+            nonlocal released
+            if released:
+                return
+            released = True
+            self._held -= 1
+            self._dispatch()
+
+        return release
+
+    def charge(self, key: str, tokens: int):
+        """응답 뒤에 알게 된 출력 토큰을 TPM 버킷에 청구"""
+        bucket = self._bucket(key)[1]
+        if bucket is not None and tokens > 0:
+            bucket.take(tokens)
+
+    def _dispatch(self):
+        """빈 슬롯만큼 사용자를 돌아가며 호출 허가
+
+        차례가 된 호출의 API 키가 속도 제한에 걸렸으면 다른 키를 쓰는 다음 사용자의 호출을 먼저
+        허가하고(건너뛴 사용자는 앞 순서 유지), 모두 걸렸으면 가장 먼저 풀리는 시점에 타이머로 다시 시도합니다.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._active + self._held < self.max_concurrency and self._queues:
+            user_id, queue, wait = None, None, None
+            for candidate, candidate_queue in self._queues.items():
+                delay = self._rate_delay(candidate_queue[0])
+                if delay <= 0:
+                    user_id, queue = candidate, candidate_queue
+                    break
+                wait = delay if wait is None else min(wait, delay)
+            if queue is None:
+                self.rate_limited_waits += 1
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                break
+
+            ticket = queue[0]
+            requests, tokens = self._bucket(ticket.key)
+            if requests:
+                requests.take(1)
+            if tokens:
+                tokens.take(ticket.tokens)
+
+            queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+            self._active += 1
+            self.admitted += 1
+            ticket.granted = True
+            ticket.position = 0
+            ticket._notify()
+
+        self._update_positions()
+
+    def _update_positions(self):
+        """라운드 로빈 순서로 각 대기 호출의 순번 계산"""
+        queues = list(self._queues.values())
+        lengths = [len(queue) for queue in queues]
+        for rotation, queue in enumerate(queues):
+            for index, ticket in enumerate(queue):
+                # 앞선 라운드에서 처리될 호출 수 + 이번 라운드에서 앞 순서 사용자의 호출 수
+                ahead = sum(min(length, index) for length in lengths)
+                ahead += sum(1 for length in lengths[:rotation] if length > index)
+                if ticket.position != ahead + 1:
+                    ticket.position = ahead + 1
+                    ticket._notify()
+
+    def _retry_after(self) -> float:
+        """대기열이 빠질 때까지의 대략적인 시간 (초)"""
+        if self.rpm > 0:
+            return round(max(1.0, self._queued * 60.0 / self.rpm), 1)
+        return 1.0
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "key_limits": {
+                key: {"rpm": requests.capacity if requests else 0, "tpm": tokens.capacity if tokens else 0}
+                for key, (requests, tokens) in self._buckets.items()
+            },
+            "active": self._active,
+            "held": self._held,
+            "queued": self._queued,
+            "waiting_users": len(self._queues),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "rate_limited_waits": self.rate_limited_waits,
+        }
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정기
+
+    interval 초마다 잠들었다 깨어나면서 예정보다 늦게 깨어난 시간을 기록합니다.
+    블로킹 호출이 이벤트 루프를 붙잡고 있으면 이 값이 커지므로, 부하 테스트 중
+    /api/system/status 의 event_loop 항목으로 확인할 수 있습니다.
+    """
+
+    def __init__(self, interval: Optional[float] = None, window: int = 1200):
+        # 측정 주기 (초, LOOP_LAG_INTERVAL_SECONDS)와 보관할 최근 측정값 수
+        self.interval = interval or float(os.getenv('LOOP_LAG_INTERVAL_SECONDS', 0.05))
+        self._samples: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.max_lag = 0.0
+
+    def start(self):
+        """측정 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """측정 태스크 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self):
+        """측정값 초기화 (벤치마크 구간 시작 시)"""
+        self._samples.clear()
+        self.max_lag = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """최근 측정 구간의 지연 통계 (밀리초)"""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(samples),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+            "max_ms": round(self.max_lag * 1000, 3),
+        }
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._samples.append(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
@@ -0,0 +1,199 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 단계별 소요 시간 버킷 (초) - 프롬프트 구성처럼 짧은 단계부터 LLM 호출까지
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # 레이블 값 -> [버킷별 개수..., 합계, 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {_format_value(count)}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {_format_value(state[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(state[-1])}")
+        return lines
+
+
+class Gauge:
+    """값을 렌더링 시점에 콜백으로 읽는 게이지"""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            value = self.read()
+        except Exception:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {_format_value(value)}"]
+
+
+class MetricsRegistry:
+    """Prometheus 텍스트 형식으로 내보낼 지표 모음"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        gauge = Gauge(name, help, read)
+        self._metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "interview_stage_seconds",
+    "면접 턴 처리 단계별 소요 시간 (prompt_build, retrieval, answer_analysis, response_cache, llm_admission, llm_queue_wait, llm_ttft, llm_total, history_append, session_save, ws_send)",
+    ("stage",)
+)
+TOKENS_TOTAL = REGISTRY.counter("llm_tokens_total", "LLM 입력/출력 토큰 수 (추정치)", ("direction",))
+SESSION_TOKENS = REGISTRY.histogram(
+    "interview_session_tokens", "면접 세션당 LLM 입력/출력 토큰 수 (추정치, 면접 종료 시 기록)", ("direction",), TOKEN_BUCKETS
+)
+FALLBACKS_TOTAL = REGISTRY.counter("interview_fallback_total", "LLM 실패로 기본 질문을 사용한 횟수", ("reason",))
+LLM_RETRIES_TOTAL = REGISTRY.counter("llm_retries_total", "일시적인 오류로 LLM 호출을 재시도한 횟수", ("reason",))
+SPECULATION_TOTAL = REGISTRY.counter(
+    "interview_speculation_total", "추측 실행 결과 재사용 (reply: 응답, context: 검색 결과, miss: 버림, reply_error)", ("outcome",)
+)
+LLM_HEDGES_TOTAL = REGISTRY.counter("llm_hedges_total", "응답이 늦어 보낸 헤지 요청 수(sent), 그중 먼저 끝난 수(won), 스케줄러 대기열이 가득 차 보내지 않은 수(rejected)", ("outcome",))
+WS_DISCONNECTS_TOTAL = REGISTRY.counter(
+    "websocket_disconnects_total", "서버가 끊은 WebSocket 연결 (slow_consumer, send_timeout, send_error, heartbeat_timeout, replaced)", ("reason",)
+)
+TURN_SCORES_TOTAL = REGISTRY.counter("interview_turn_scores_total", "답변별 채점 결과 (ok, invalid: 형식 오류, error: 호출 실패)", ("outcome",))
+RESPONSE_CACHE_TOTAL = REGISTRY.counter("interview_response_cache_total", "면접관 응답 의미 캐시 조회 결과 (hit, miss, error: 임베딩 등 조회 실패)", ("outcome",))
+SESSION_RESUMES_TOTAL = REGISTRY.counter(
+    "interview_resumes_total", "다시 연결한 클라이언트의 이력 동기화 (delta: 빠진 턴만, reset: 전체 이력, not_found: 세션 없음)", ("outcome",)
+)
+REPLAYED_TURNS_TOTAL = REGISTRY.counter("interview_replayed_turns_total", "이력 동기화로 다시 보낸 대화 턴 수")
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (UTF-8 4바이트당 1토큰 - 한국어는 대략 글자당 0.75토큰)"""
+    return max(1, len(text.encode("utf-8")) // 4) if text else 0
+
+
+class Trace:
+    """한 턴의 단계별 소요 시간 기록 (세션 추적이 켜졌을 때 파일로 저장)"""
+
+    def __init__(self, session_id: str, turn: int):
+        self.session_id = session_id
+        self.turn = turn
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self.attributes: Dict = {}
+
+    def add(self, stage: str, seconds: float, started: Optional[float] = None):
+        self.spans.append({
+            "stage": stage,
+            "offset_ms": round(((started or time.perf_counter() - seconds) - self.started) * 1000, 3),
+            "duration_ms": round(seconds * 1000, 3),
+        })
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "turn": self.turn,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "spans": self.spans,
+            **self.attributes,
+        }
+
+
+# 현재 처리 중인 턴의 추적 기록 (없으면 지표만 기록)
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def observe(stage: str, seconds: float, started: Optional[float] = None):
+    """단계 소요 시간을 히스토그램과 (있으면) 현재 턴 추적 기록에 남김"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds, started)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """with span("prompt_build"): ... 블록의 소요 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started, started)
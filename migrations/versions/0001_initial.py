@@ -0,0 +1,83 @@
+"""초기 스키마 - 프로필, 면접, 대화 턴, 분석 결과
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001_initial'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'profiles',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('type', sa.String(length=32), nullable=False),
+        sa.Column('institution', sa.String(length=255), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_profiles_user_id', 'profiles', ['user_id'])
+
+    op.create_table(
+        'interviews',
+        sa.Column('session_id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('profile_id', sa.String(length=64), nullable=True),
+        sa.Column('interview_type', sa.String(length=32), nullable=False),
+        sa.Column('institution', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('total_exchanges', sa.Integer(), nullable=False),
+        sa.Column('duration_minutes', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('session_id'),
+    )
+    op.create_index('ix_interviews_user_started', 'interviews', ['user_id', 'started_at'])
+
+    op.create_table(
+        'turns',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('session_id', sa.String(length=64), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=16), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['interviews.session_id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_turns_session_seq', 'turns', ['session_id', 'seq'])
+
+    op.create_table(
+        'analyses',
+        sa.Column('job_id', sa.String(length=64), nullable=False),
+        sa.Column('session_id', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_analyses_session_id', 'analyses', ['session_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analyses_session_id', table_name='analyses')
+    op.drop_table('analyses')
+    op.drop_index('ix_turns_session_seq', table_name='turns')
+    op.drop_table('turns')
+    op.drop_index('ix_interviews_user_started', table_name='interviews')
+    op.drop_table('interviews')
+    op.drop_index('ix_profiles_user_id', table_name='profiles')
+    op.drop_table('profiles')
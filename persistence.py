@@ -0,0 +1,446 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (JSON, DateTime, ForeignKey, Index, Integer, String, Text, create_engine, insert, inspect,
+                        select, update)
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ProfileRecord(Base):
+    __tablename__ = "profiles"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64), index=True)
+    type: Mapped[str] = mapped_column(String(32))
+    institution: Mapped[str] = mapped_column(String(255))
+    data: Mapped[Dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
+class InterviewRecord(Base):
+    __tablename__ = "interviews"
+    # 사용자별 지난 면접 목록 (최신순) 조회용
+    __table_args__ = (Index("ix_interviews_user_started", "user_id", "started_at"),)
+
+    session_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64))
+    profile_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    interview_type: Mapped[str] = mapped_column(String(32))
+    institution: Mapped[str] = mapped_column(String(255))
+    status: Mapped[str] = mapped_column(String(16), default="in_progress")  # 'in_progress', 'ended'
+    started_at: Mapped[datetime] = mapped_column(DateTime)
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    total_exchanges: Mapped[int] = mapped_column(Integer, default=0)
+    duration_minutes: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TurnRecord(Base):
+    __tablename__ = "turns"
+    __table_args__ = (Index("ix_turns_session_seq", "session_id", "seq"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(String(64), ForeignKey("interviews.session_id"))
+    seq: Mapped[int] = mapped_column(Integer)
+    role: Mapped[str] = mapped_column(String(16))
+    content: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class AnalysisRecord(Base):
+    __tablename__ = "analyses"
+
+    job_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    session_id: Mapped[str] = mapped_column(String(64), index=True)
+    status: Mapped[str] = mapped_column(String(16))
+    result: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+def is_transient_db_error(error: Exception) -> bool:
+    """연결 끊김, 잠금 대기 초과처럼 다시 시도하면 성공할 수 있는 DB 오류인지 판단
+
+    제약 조건 위반(IntegrityError), 잘못된 값(DataError) 등은 같은 행을 다시 넣어도 계속 실패합니다.
+    """
+    return isinstance(error, (sa_exc.OperationalError, sa_exc.InterfaceError,
+                              sa_exc.DisconnectionError, sa_exc.TimeoutError))
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+class InterviewRepository:
+    """프로필, 대화록, 분석 결과 영구 저장소 인터페이스 (기본 구현은 아무것도 저장하지 않음)"""
+
+    def start(self):
+        """테이블 준비 및 쓰기 버퍼 시작 (이벤트 루프 안에서 호출)"""
+        pass
+
+    async def stop(self):
+        """남은 쓰기를 모두 반영하고 연결 정리"""
+        pass
+
+    async def save_profile(self, profile_id: str, user_id: str, profile: Dict):
+        pass
+
+    async def get_profile(self, profile_id: str) -> Optional[Dict]:
+        return None
+
+    async def record_interview_start(self, session_id: str, user_id: str, profile: Dict, started_at: datetime):
+        pass
+
+    def record_turn(self, session_id: str, seq: int, role: str, content: str, timestamp: str):
+        """대화 한 턴 기록 (쓰기 버퍼에 넣고 바로 반환)"""
+        pass
+
+    async def record_interview_end(self, snapshot: Dict):
+        pass
+
+    async def save_analysis(self, job: Dict):
+        pass
+
+    async def get_analysis(self, job_id: str) -> Optional[Dict]:
+        return None
+
+    async def list_interviews(self, user_id: str, limit: int = 20, before: Optional[datetime] = None) -> List[Dict]:
+        return []
+
+    async def get_transcript(self, session_id: str) -> List[Dict]:
+        return []
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+class SQLAlchemyRepository(InterviewRepository):
+    """SQLAlchemy 영구 저장소 - 개발은 SQLite, 운영은 Postgres(DATABASE_URL)
+
+    대화 턴은 매 턴 DB 왕복을 기다리지 않도록 쓰기 버퍼(write-behind)에 쌓았다가
+    PERSIST_BATCH_SIZE 개 또는 PERSIST_FLUSH_INTERVAL_SECONDS 마다 한 번의 executemany 로
+    넣습니다. DB 호출은 동기 드라이버를 쓰므로 모두 스레드에서 실행합니다.
+
+    일시적인 DB 오류면 배치를 버퍼에 되돌리고 지수 백오프 후 다시 시도하되, 같은 배치가
+    PERSIST_MAX_RETRIES 번 넘게 실패하면 포기합니다. 제약 조건 위반처럼 다시 시도해도 실패할
+    오류면 배치를 한 행씩 넣어 나머지 턴은 저장하고, 넣을 수 없는 행만 포기합니다. 포기한 행은
+    PERSIST_DEAD_LETTER_PATH (JSON Lines) 에 오류와 함께 남겨 나중에 확인할 수 있게 합니다.
+
+    스키마는 alembic 마이그레이션(migrations/)으로 관리하며(alembic upgrade head),
+    개발용 SQLite 에서만 시작할 때 테이블을 바로 만듭니다.
+    """
+
+    def __init__(self, url: str, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        self.url = url
+        engine_args: Dict[str, Any] = {}
+        if url.startswith("sqlite"):
+            engine_args["connect_args"] = {"check_same_thread": False}
+            if url in ("sqlite://", "sqlite:///:memory:"):
+                # 메모리 DB 는 연결마다 따로 생기므로 모든 스레드가 한 연결을 공유
+                engine_args["poolclass"] = StaticPool
+        self.engine = create_engine(url, pool_pre_ping=True, **engine_args)
+        self._sessions = sessionmaker(self.engine, expire_on_commit=False)
+        self.batch_size = batch_size or int(os.getenv('PERSIST_BATCH_SIZE', 200))
+        self.flush_interval = flush_interval or float(os.getenv('PERSIST_FLUSH_INTERVAL_SECONDS', 0.5))
+        # DB 장애가 길어질 때 버퍼가 무한히 커지지 않도록 제한 (넘치면 오래된 턴부터 버림)
+        self.max_pending = int(os.getenv('PERSIST_MAX_PENDING', 100000))
+        # 일시 오류 재시도 횟수와 백오프 (초)
+        self.max_retries = int(os.getenv('PERSIST_MAX_RETRIES', 8))
+        self.retry_base_delay = float(os.getenv('PERSIST_RETRY_BASE_DELAY_SECONDS', 0.5))
+        self.retry_max_delay = float(os.getenv('PERSIST_RETRY_MAX_DELAY_SECONDS', 30))
+        self.dead_letter_path = os.getenv('PERSIST_DEAD_LETTER_PATH', 'persist_dead_letter.jsonl')
+
+        self._pending: List[Dict] = []
+        self._failures = 0
+        self._retry_at = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self.turns_written = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.flush_errors = 0
+        self.dropped_turns = 0
+        self.dead_lettered_turns = 0
+
+    def start(self):
+        if self.engine.dialect.name == "sqlite":
+            Base.metadata.create_all(self.engine)
+        elif not inspect(self.engine).has_table("alembic_version"):
+            print("경고: 영구 저장소 스키마가 마이그레이션되지 않았습니다. 'alembic upgrade head' 를 실행해주세요.")
+        if self._flusher is None or self._flusher.done():
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        # 진행 중인 배치가 끝나도록 취소하지 않고 깨워서 종료
+        if self._flusher:
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        # 종료 전 마지막 시도는 백오프를 기다리지 않음
+        await self._flush(force=True)
+        self.engine.dispose()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # 쓰기 버퍼
+    def record_turn(self, session_id: str, seq: int, role: str, content: str, timestamp: str):
+        self._pending.append({
+            "session_id": session_id,
+            "seq": seq,
+            "role": role,
+            "content": content,
+            "created_at": _parse_time(timestamp),
+        })
+        if len(self._pending) > self.max_pending:
+            overflow = len(self._pending) - self.max_pending
+            del self._pending[:overflow]
+            self.dropped_turns += overflow
+            print(f"경고: 대화 기록 버퍼가 가득 차 {overflow}개 턴을 버렸습니다.")
+        if len(self._pending) >= self.batch_size and self._wakeup:
+            self._wakeup.set()
+
+    async def _flush_loop(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self, force: bool = False):
+        if not force and time.monotonic() < self._retry_at:
+            return
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            started = time.perf_counter()
+            try:
+                await self._run(self._insert_turns, batch)
+            except Exception as e:
+                self.flush_errors += 1
+                if is_transient_db_error(e):
+                    if not self._retry_later(batch, e):
+                        return
+                    continue
+                # 다시 넣어도 실패할 행이 섞여 있으면 한 행씩 넣어 나머지는 저장
+                print(f"대화 기록 저장 오류, 한 턴씩 다시 저장합니다: {e}")
+                written, rejected, remaining = await self._run(self._insert_each, batch)
+                self.turns_written += written
+                if rejected:
+                    await self._dead_letter(rejected)
+                if remaining and not self._retry_later(remaining[0][0], remaining[0][1]):
+                    return
+                continue
+            self._failures = 0
+            self.turns_written += len(batch)
+            self.batches += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    def _retry_later(self, rows: List[Dict], error: Exception) -> bool:
+        """일시 오류 - 행을 버퍼 앞에 되돌리고 백오프를 걸면 False, 재시도 한도를 넘어 포기하면 True"""
+        self._failures += 1
+        if self._failures > self.max_retries:
+            self._failures = 0
+            print(f"경고: 대화 기록 저장이 {self.max_retries}번 넘게 실패해 {len(rows)}개 턴을 포기합니다: {error}")
+            self._write_dead_letter([(row, error) for row in rows])
+            return True
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (self._failures - 1)))
+        print(f"대화 기록 저장 오류, {delay:.1f}초 후 재시도 ({self._failures}/{self.max_retries}): {error}")
+        self._retry_at = time.monotonic() + delay
+        self._pending = rows + self._pending
+        return False
+
+    def _insert_turns(self, rows: List[Dict]):
+        with self._sessions.begin() as db:
+            db.execute(insert(TurnRecord), rows)
+
+    def _insert_each(self, rows: List[Dict]):
+        """한 행씩 저장 - (저장한 수, [(넣을 수 없는 행, 오류)], 일시 오류로 멈춘 경우 남은 ([행], 오류))"""
+        written, rejected = 0, []
+        for index, row in enumerate(rows):
+            try:
+                self._insert_turns([row])
+            except Exception as e:
+                if is_transient_db_error(e):
+                    return written, rejected, (rows[index:], e)
+                rejected.append((row, e))
+            else:
+                written += 1
+        return written, rejected, None
+
+    async def _dead_letter(self, rejected: List):
+        print(f"경고: 저장할 수 없는 대화 턴 {len(rejected)}개를 건너뜁니다: {rejected[0][1]}")
+        await self._run(self._write_dead_letter, rejected)
+
+    def _write_dead_letter(self, rejected: List):
+        """포기한 턴을 오류와 함께 PERSIST_DEAD_LETTER_PATH 에 기록"""
+        self.dead_lettered_turns += len(rejected)
+        if not self.dead_letter_path:
+            return
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for row, error in rejected:
+                    created_at = row.get("created_at")
+                    record = {
+                        **row,
+                        "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+                        "error": f"{type(error).__name__}: {error}".splitlines()[0],
+                        "failed_at": datetime.now().isoformat(),
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            print(f"경고: 저장하지 못한 대화 턴 기록 실패: {e}")
+
+    # 프로필
+    async def save_profile(self, profile_id: str, user_id: str, profile: Dict):
+        def write():
+            with self._sessions.begin() as db:
+                db.merge(ProfileRecord(
+                    id=profile_id,
+                    user_id=user_id,
+                    type=profile.get("type", ""),
+                    institution=profile.get("institution", ""),
+                    data=profile,
+                    created_at=_parse_time(profile.get("createdAt")) or datetime.now(),
+                ))
+        await self._run(write)
+
+    async def get_profile(self, profile_id: str) -> Optional[Dict]:
+        def read():
+            with self._sessions() as db:
+                record = db.get(ProfileRecord, profile_id)
+                return record.data if record else None
+        return await self._run(read)
+
+    # 면접
+    async def record_interview_start(self, session_id: str, user_id: str, profile: Dict, started_at: datetime):
+        def write():
+            with self._sessions.begin() as db:
+                db.merge(InterviewRecord(
+                    session_id=session_id,
+                    user_id=user_id,
+                    profile_id=profile.get("id"),
+                    interview_type=profile.get("type", ""),
+                    institution=profile.get("institution", ""),
+                    status="in_progress",
+                    started_at=started_at,
+                ))
+        await self._run(write)
+
+    async def record_interview_end(self, snapshot: Dict):
+        def write():
+            with self._sessions.begin() as db:
+                db.execute(
+                    update(InterviewRecord)
+                    .where(InterviewRecord.session_id == snapshot["session_id"])
+                    .values(
+                        status="ended",
+                        ended_at=datetime.now(),
+                        total_exchanges=snapshot.get("total_exchanges", 0),
+                        duration_minutes=snapshot.get("duration_minutes", 0),
+                    )
+                )
+        await self._run(write)
+
+    async def list_interviews(self, user_id: str, limit: int = 20, before: Optional[datetime] = None) -> List[Dict]:
+        """사용자의 지난 면접 목록 (최신순, before 이전 시작분부터 - ix_interviews_user_started 사용)"""
+        def read():
+            query = select(InterviewRecord).where(InterviewRecord.user_id == user_id)
+            if before is not None:
+                query = query.where(InterviewRecord.started_at < before)
+            query = query.order_by(InterviewRecord.started_at.desc()).limit(limit)
+            with self._sessions() as db:
+                return [
+                    {
+                        "session_id": record.session_id,
+                        "profile_id": record.profile_id,
+                        "interview_type": record.interview_type,
+                        "institution": record.institution,
+                        "status": record.status,
+                        "started_at": record.started_at.isoformat(),
+                        "ended_at": record.ended_at.isoformat() if record.ended_at else None,
+                        "total_exchanges": record.total_exchanges,
+                        "duration_minutes": record.duration_minutes,
+                    }
+                    for record in db.scalars(query)
+                ]
+        return await self._run(read)
+
+    async def get_transcript(self, session_id: str) -> List[Dict]:
+        def read():
+            query = select(TurnRecord).where(TurnRecord.session_id == session_id).order_by(TurnRecord.seq)
+            with self._sessions() as db:
+                return [
+                    {"role": record.role, "content": record.content, "timestamp": record.created_at.isoformat()}
+                    for record in db.scalars(query)
+                ]
+        return await self._run(read)
+
+    # 분석 결과
+    async def save_analysis(self, job: Dict):
+        def write():
+            with self._sessions.begin() as db:
+                db.merge(AnalysisRecord(
+                    job_id=job["job_id"],
+                    session_id=job["session_id"],
+                    status=job["status"],
+                    result=job.get("result"),
+                    error=job.get("error"),
+                    created_at=_parse_time(job["created_at"]),
+                    finished_at=_parse_time(job.get("finished_at")),
+                ))
+        await self._run(write)
+
+    async def get_analysis(self, job_id: str) -> Optional[Dict]:
+        def read():
+            with self._sessions() as db:
+                record = db.get(AnalysisRecord, job_id)
+                if record is None:
+                    return None
+                return {
+                    "job_id": record.job_id,
+                    "session_id": record.session_id,
+                    "status": record.status,
+                    "result": record.result,
+                    "error": record.error,
+                }
+        return await self._run(read)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "dialect": self.engine.dialect.name,
+            "pending_turns": len(self._pending),
+            "turns_written": self.turns_written,
+            "batches": self.batches,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "flush_errors": self.flush_errors,
+            "dropped_turns": self.dropped_turns,
+            "dead_lettered_turns": self.dead_lettered_turns,
+        }
+
+
+def create_repository() -> InterviewRepository:
+    """DATABASE_URL 환경 변수에 따라 영구 저장소 생성 ('none' 이면 저장하지 않음)"""
+    url = os.getenv('DATABASE_URL', 'sqlite:///donga.db')
+    if url.lower() in ("", "none"):
+        return InterviewRepository()
+    print(f"✅ 영구 저장소 사용: {url.split('@')[-1]}")
+    return SQLAlchemyRepository(url)
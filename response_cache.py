@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import itertools
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from metrics import RESPONSE_CACHE_TOTAL
+from speculation import normalize_answer
+
+
+class CacheLookup:
+    """한 번의 캐시 조회 - 놓치면 LLM 응답을 같은 키로 저장할 때 다시 사용"""
+
+    def __init__(self, prefix: str, answer: str, vector: np.ndarray):
+        self.prefix = prefix
+        self.answer = answer
+        self.vector = vector
+
+
+class CacheEntry:
+    def __init__(self, prefix: str, answer: str, vector: np.ndarray, reply: str):
+        self.prefix = prefix
+        self.answer = answer
+        self.vector = vector
+        self.reply = reply
+        self.created = time.monotonic()
+        self.hits = 0
+
+
+class SemanticResponseCache:
+    """면접관 응답 의미 캐시
+
+    키는 (프롬프트 앞부분 해시, 정규화한 지원자 답변 임베딩) 입니다. 앞부분은 고정 프롬프트와
+    지금까지의 대화 이력이라 같은 프로필로 시작한 모의 면접의 첫 답변처럼 대화 흐름이 같을 때만
+    일치하고, 그 안에서 답변 임베딩의 코사인 유사도가 RESPONSE_CACHE_THRESHOLD 이상이면 저장된
+    응답을 돌려줍니다. 항목은 RESPONSE_CACHE_TTL_SECONDS 뒤 만료되고, 전체
+    RESPONSE_CACHE_MAX_ENTRIES 개를 넘으면 가장 오래 사용하지 않은 것부터 지웁니다.
+    캐시는 프로필에서 responseCache 를 켠 세션에만 쓰며, 워커 프로세스마다 따로 둡니다.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray]):
+        self.encode = encode
+        self.threshold = float(os.getenv('RESPONSE_CACHE_THRESHOLD', 0.92))
+        self.ttl = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 86400))
+        self.max_entries = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+        self.max_per_prefix = int(os.getenv('RESPONSE_CACHE_MAX_PER_PREFIX', 50))
+
+        # 항목 ID -> 항목 (오래 사용하지 않은 순서), 앞부분 해시 -> 항목 ID 목록
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._prefixes: Dict[str, List[int]] = {}
+        self._ids = itertools.count()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def prefix_key(system_instruction: Optional[str], messages: List[Dict], documents: Optional[str] = None) -> str:
+        """고정 프롬프트 + 답변 앞까지의 메시지 (+ 검색할 업로드 문서 조합)로 앞부분 해시 계산"""
+        digest = hashlib.sha256((system_instruction or "").encode("utf-8"))
+        digest.update(f"\x1d{documents or ''}".encode("utf-8"))
+        for message in messages:
+            digest.update(f"\x1e{message['role']}\x1f{message['content']}".encode("utf-8"))
+        return digest.hexdigest()
+
+    async def lookup(self, prefix: str, answer: str) -> Tuple[CacheLookup, Optional[str]]:
+        """비슷한 답변에 대해 저장된 응답 조회 (없으면 None)"""
+        answer = normalize_answer(answer)
+        vector = (await asyncio.get_running_loop().run_in_executor(None, self.encode, [answer]))[0]
+        query = CacheLookup(prefix, answer, vector)
+
+        now = time.monotonic()
+        best: Optional[Tuple[float, int]] = None
+        for entry_id in list(self._prefixes.get(prefix, ())):
+            entry = self._entries[entry_id]
+            if now - entry.created > self.ttl:
+                self._remove(entry_id)
+                self.expired += 1
+                continue
+            score = 1.0 if entry.answer == answer else float(entry.vector @ vector)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, entry_id)
+
+        if best is None:
+            self.misses += 1
+            RESPONSE_CACHE_TOTAL.inc(outcome="miss")
+            return query, None
+
+        entry = self._entries[best[1]]
+        self._entries.move_to_end(best[1])
+        entry.hits += 1
+        self.hits += 1
+        RESPONSE_CACHE_TOTAL.inc(outcome="hit")
+        return query, entry.reply
+
+    def store(self, query: CacheLookup, reply: str):
+        """LLM 이 새로 만든 응답 저장"""
+        entry_id = next(self._ids)
+        self._entries[entry_id] = CacheEntry(query.prefix, query.answer, query.vector, reply)
+        ids = self._prefixes.setdefault(query.prefix, [])
+        ids.append(entry_id)
+        if len(ids) > self.max_per_prefix:
+            self._remove(ids[0])
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        ids = self._prefixes.get(entry.prefix)
+        if ids is not None:
+            ids.remove(entry_id)
+            if not ids:
+                del self._prefixes[entry.prefix]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "prefixes": len(self._prefixes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "threshold": self.threshold,
+        }
@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def chunk_text(text: str, size: int, overlap: int) -> List[str]:
+    """문단/문장 경계를 우선으로 size 자 안팎의 조각으로 나누고, 앞 조각 끝 overlap 자를 겹침"""
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?。다요])\s+|\n+", text) if s and s.strip()]
+    step = max(size - overlap, 1)
+    chunks: List[str] = []
+    current = ""
+    for sentence in sentences:
+        # 한 문장이 너무 길면 글자 수로 자름
+        while len(sentence) > size:
+            head, sentence = sentence[:size], sentence[step:]
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(head)
+        if current and len(current) + len(sentence) + 1 > size:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class HashingEmbedder:
+    """외부 모델 없이 쓰는 로컬 임베딩 - 문자 2~3-gram 을 고정 차원으로 해싱 (한국어 형태 변화에 강함)"""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            normalized = re.sub(r"\s+", " ", text.lower())
+            for n in (2, 3):
+                for i in range(len(normalized) - n + 1):
+                    gram = normalized[i:i + n]
+                    if gram.strip():
+                        digest = hashlib.md5(gram.encode("utf-8")).digest()
+                        matrix[row, int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers 다국어 모델 임베딩 (모델은 처음 사용할 때 로드)"""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False),
+            dtype=np.float32
+        )
+
+
+def create_embedder():
+    """RETRIEVAL_EMBEDDER 환경 변수('auto', 'sentence-transformers', 'hashing')에 따라 임베딩 생성기 선택"""
+    choice = os.getenv('RETRIEVAL_EMBEDDER', 'auto').lower()
+    if choice in ("auto", "sentence-transformers"):
+        model_name = os.getenv('RETRIEVAL_MODEL', 'paraphrase-multilingual-MiniLM-L12-v2')
+        try:
+            embedder = SentenceTransformerEmbedder(model_name)
+            print(f"✅ 문서 검색 임베딩: sentence-transformers ({model_name})")
+            return embedder
+        except Exception as e:
+            if choice != "auto":
+                raise
+            print(f"경고: sentence-transformers 를 사용할 수 없어 해싱 임베딩을 사용합니다. ({e})")
+    return HashingEmbedder()
+
+
+class DocumentIndex:
+    """한 지원자의 업로드 문서 조각과 임베딩 행렬"""
+
+    def __init__(self, chunks: List[Tuple[str, str]], matrix: np.ndarray):
+        self.chunks = chunks  # (파일 이름, 조각 텍스트)
+        self.matrix = matrix  # (조각 수, 차원) - 행마다 L2 정규화
+
+    def search(self, query: np.ndarray, k: int, min_score: float) -> List[Dict]:
+        if not self.chunks:
+            return []
+        scores = self.matrix @ query
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"name": self.chunks[i][0], "text": self.chunks[i][1], "score": round(float(scores[i]), 4)}
+            for i in top if scores[i] >= min_score
+        ]
+
+
+class RetrievalIndex:
+    """업로드 문서 검색 인덱스 관리자
+
+    프로필 저장 시 업로드 문서를 조각내 임베딩 행렬(NumPy)을 한 번 만들고, 같은 파일 조합을 쓰는
+    모든 세션이 재사용합니다. 매 턴 지원자의 최근 답변과 가장 가까운 top-k 조각만 프롬프트에
+    넣으므로 문서 전체를 붙이지 않고도 200자 미리보기 이상의 내용을 활용할 수 있습니다.
+    임베딩 계산은 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    """
+
+    def __init__(self, embedder=None):
+        self._embedder = embedder
+        self.top_k = int(os.getenv('RETRIEVAL_TOP_K', 3))
+        self.chunk_chars = int(os.getenv('RETRIEVAL_CHUNK_CHARS', 500))
+        self.chunk_overlap = int(os.getenv('RETRIEVAL_CHUNK_OVERLAP', 100))
+        self.min_score = float(os.getenv('RETRIEVAL_MIN_SCORE', 0.1))
+        self.max_indexes = int(os.getenv('RETRIEVAL_MAX_INDEXES', 1000))
+
+        # 파일 ID 조합 해시 -> DocumentIndex (오래 사용하지 않은 순서)
+        self._indexes: "OrderedDict[str, DocumentIndex]" = OrderedDict()
+        self._building: Dict[str, asyncio.Task] = {}
+        self.builds = 0
+        self.build_ms_total = 0.0
+        self.last_build_ms = 0.0
+        self.queries = 0
+        self._query_ms: deque = deque(maxlen=1000)
+
+    @property
+    def embedder(self):
+        # 모델 로드는 느리므로 처음 검색 인덱스를 만들 때 생성
+        if self._embedder is None:
+            self._embedder = create_embedder()
+        return self._embedder
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # 모델 로드와 임베딩 계산 모두 스레드에서 실행
+        return self.embedder.encode(texts)
+
+    @staticmethod
+    def index_key(file_ids: List[str]) -> Optional[str]:
+        """파일 ID 조합으로 인덱스 키 생성 (파일이 없으면 None)"""
+        file_ids = sorted(file_id for file_id in file_ids if file_id)
+        if not file_ids:
+            return None
+        return hashlib.sha256("\x1e".join(file_ids).encode("utf-8")).hexdigest()
+
+    def has(self, key: Optional[str]) -> bool:
+        return key is not None and key in self._indexes
+
+    async def build(self, key: str, documents: List[Tuple[str, str]]) -> DocumentIndex:
+        """(파일 이름, 전체 텍스트) 목록으로 인덱스 생성 - 같은 키를 동시에 요청하면 한 번만 만듦"""
+        if key in self._indexes:
+            self._indexes.move_to_end(key)
+            return self._indexes[key]
+        running = self._building.get(key)
+        if running is None:
+            running = asyncio.ensure_future(self._build(key, documents))
+            self._building[key] = running
+            running.add_done_callback(lambda _: self._building.pop(key, None))
+        return await running
+
+    async def _build(self, key: str, documents: List[Tuple[str, str]]) -> DocumentIndex:
+        started = time.perf_counter()
+        chunks = [
+            (name, chunk)
+            for name, text in documents
+            for chunk in chunk_text(text, self.chunk_chars, self.chunk_overlap)
+        ]
+        if chunks:
+            matrix = await asyncio.get_running_loop().run_in_executor(
+                None, self._encode, [chunk for _, chunk in chunks]
+            )
+        else:
+            matrix = np.zeros((0, 1), dtype=np.float32)
+        index = DocumentIndex(chunks, matrix)
+
+        self._indexes[key] = index
+        while len(self._indexes) > self.max_indexes:
+            self._indexes.popitem(last=False)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self.builds += 1
+        self.build_ms_total += elapsed
+        self.last_build_ms = elapsed
+        print(f"✅ 문서 검색 인덱스 생성: {key[:8]} - 조각 {len(chunks)}개, {elapsed:.1f}ms")
+        return index
+
+    async def query(self, key: Optional[str], text: str, k: Optional[int] = None) -> List[Dict]:
+        """지원자 답변과 관련된 문서 조각 top-k (인덱스가 없으면 빈 목록)"""
+        index = self._indexes.get(key) if key else None
+        if index is None or not index.chunks or not text.strip():
+            return []
+        self._indexes.move_to_end(key)
+
+        started = time.perf_counter()
+        query = await asyncio.get_running_loop().run_in_executor(None, self._encode, [text])
+        results = index.search(query[0], k or self.top_k, self.min_score)
+        self.queries += 1
+        self._query_ms.append((time.perf_counter() - started) * 1000)
+        return results
+
+    def stats(self) -> Dict:
+        query_ms = sorted(self._query_ms)
+        return {
+            "embedder": self._embedder.name if self._embedder else None,
+            "indexes": len(self._indexes),
+            "builds": self.builds,
+            "avg_build_ms": round(self.build_ms_total / self.builds, 2) if self.builds else 0.0,
+            "last_build_ms": round(self.last_build_ms, 2),
+            "queries": self.queries,
+            "avg_query_ms": round(sum(query_ms) / len(query_ms), 2) if query_ms else 0.0,
+            "p95_query_ms": round(query_ms[min(len(query_ms) - 1, int(len(query_ms) * 0.95))], 2) if query_ms else 0.0,
+        }
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic_core import core_schema
+
+
+class Turn:
+    """대화 이력의 한 턴 - 역할, 내용, 시각(epoch 초)
+
+    턴마다 키 세 개짜리 dict 와 ISO 시각 문자열을 두지 않도록 __slots__ 로 값만 보관하고,
+    역할 문자열은 intern 해 모든 턴이 공유합니다. JSON 으로는 [역할, 내용, 시각] 배열로 저장합니다.
+    turn["role"], turn["timestamp"](ISO) 처럼 dict 로도 읽을 수 있고, 예전 형식의 dict 도 받습니다.
+    """
+
+    __slots__ = ("role", "content", "ts")
+
+    def __init__(self, role: str, content: str, ts: Optional[float] = None):
+        self.role = sys.intern(role)
+        self.content = content
+        self.ts = time.time() if ts is None else ts
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.ts).isoformat()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "timestamp":
+            return self.timestamp
+        if key in ("role", "content"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, str]:
+        """분석 작업, API 응답용 dict"""
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+    def __repr__(self) -> str:
+        return f"Turn({self.role!r}, {self.content[:30]!r}, {self.ts})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Turn) and (self.role, self.content, self.ts) == (other.role, other.content, other.ts)
+
+    @classmethod
+    def parse(cls, value: Any) -> "Turn":
+        if isinstance(value, Turn):
+            return value
+        if isinstance(value, (list, tuple)) and len(value) == 3:
+            return cls(value[0], value[1], float(value[2]))
+        if isinstance(value, dict):
+            # 예전 형식: {"role", "content", "timestamp": ISO 문자열}
+            timestamp = value.get("timestamp")
+            ts = datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+            return cls(value["role"], value["content"], ts)
+        raise ValueError(f"대화 턴 형식이 올바르지 않습니다: {value!r}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.parse,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda turn: [turn.role, turn.content, turn.ts]),
+        )
+
+
+class ProfileRegistry:
+    """세션이 함께 쓰는 개인화 프로필 (워커마다)
+
+    같은 내용의 프로필은 내용 해시(profile_key)별로 dict 하나만 두고 세션은 참조만 가집니다.
+    SESSION_PROFILE_CACHE_SIZE 개를 넘으면 가장 오래 사용하지 않은 것부터 목록에서 빼며,
+    이미 참조하는 세션에는 영향이 없습니다. 세션이 참조하는 dict 는 수정하지 않아야 합니다.
+    """
+
+    def __init__(self, max_profiles: Optional[int] = None):
+        self.max_profiles = max_profiles or int(os.getenv('SESSION_PROFILE_CACHE_SIZE', 10000))
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+        self.shared = 0
+        self.added = 0
+
+    @staticmethod
+    def key_for(profile: Dict) -> str:
+        encoded = json.dumps(profile, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+    def intern(self, profile: Dict, key: Optional[str] = None) -> Tuple[str, Dict]:
+        """(프로필 키, 공유 dict) - 같은 내용이 이미 있으면 그 dict 를 돌려줌"""
+        key = key or self.key_for(profile)
+        shared = self._profiles.get(key)
+        if shared is not None:
+            self._profiles.move_to_end(key)
+            self.shared += 1
+            return key, shared
+        self._profiles[key] = profile
+        self.added += 1
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return key, profile
+
+    def get(self, key: str) -> Optional[Dict]:
+        profile = self._profiles.get(key)
+        if profile is not None:
+            self._profiles.move_to_end(key)
+        return profile
+
+    def stats(self) -> Dict[str, Any]:
+        return {"profiles": len(self._profiles), "added": self.added, "shared": self.shared}
@@ -0,0 +1,345 @@
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+
+from session_records import ProfileRegistry
+
+
+class SessionStore:
+    """면접 세션과 프로필 저장소 인터페이스
+
+    세션은 conversation_history 와 프로필만 담은 직렬화 형태로 보관되며,
+    LLM 요청은 매 턴 이 이력으로 다시 구성되므로 어느 워커가 처리해도 됩니다.
+    개인화 프로필은 세션마다 복사하지 않고 내용이 같은 세션끼리 공유하며(attach_profile),
+    세션에는 프로필 키(profile_key)만 저장합니다.
+    """
+
+    shared_profiles: ProfileRegistry
+
+    async def get_session(self, session_id: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def save_session(self, session: Any):
+        raise NotImplementedError
+
+    async def delete_session(self, session_id: str):
+        raise NotImplementedError
+
+    async def count_sessions(self) -> int:
+        raise NotImplementedError
+
+    async def attach_profile(self, session: Any, profile: Dict):
+        """세션에 개인화 프로필 연결 - 같은 내용의 프로필이 있으면 그 객체를 공유"""
+        key, shared = self.shared_profiles.intern(profile)
+        session.attach_profile(key, shared)
+
+    async def get_profile(self, profile_id: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def save_profile(self, profile_id: str, profile: Any):
+        raise NotImplementedError
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def save_job(self, job: Dict):
+        raise NotImplementedError
+
+    async def list_jobs(self, statuses: Iterable[str]) -> List[Dict]:
+        """상태가 statuses 중 하나인 분석 작업 목록 (재시작 전에 끝나지 못한 작업 복구용)"""
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """유휴 세션 정리 - 제거한 세션 수 반환"""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 상태 및 축출 통계"""
+        return {}
+
+    async def close(self):
+        """연결 등 리소스 정리"""
+        pass
+
+
+def estimate_session_bytes(session: Any) -> int:
+    """세션이 차지하는 메모리의 대략적인 크기 (대화 이력 - 공유 프로필과 intern 된 역할 문자열은 제외)"""
+    size = sys.getsizeof(session) + sys.getsizeof(session.conversation_history)
+    for turn in session.conversation_history:
+        size += sys.getsizeof(turn) + sys.getsizeof(turn.content) + sys.getsizeof(turn.ts)
+    return size
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 메모리 저장소 - 단일 워커 개발 환경용
+
+    탭을 닫아 버려진 세션이 무한히 쌓이지 않도록, 마지막 접근 후 idle_ttl 초가 지난 세션은
+    sweep() 에서 제거하고, 세션 수(max_sessions)나 추정 메모리(max_bytes)가 한도를 넘으면
+    가장 오래 사용되지 않은 세션부터 축출(LRU)합니다.
+    """
+
+    def __init__(self, idle_ttl: Optional[float] = None, max_sessions: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv('SESSION_IDLE_TTL_SECONDS', 1800))
+        self.max_sessions = max_sessions or int(os.getenv('SESSION_MAX_COUNT', 1000))
+        self.max_bytes = max_bytes or int(os.getenv('SESSION_MAX_BYTES', 256 * 1024 * 1024))
+
+        # session_id -> session (오래 사용하지 않은 순서)
+        self.sessions: "OrderedDict[str, Any]" = OrderedDict()
+        self.profiles: Dict[str, Any] = {}
+        # 분석 작업 결과 (오래된 것부터 JOB_MAX_COUNT 개를 넘으면 제거)
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_jobs = int(os.getenv('JOB_MAX_COUNT', 10000))
+        self._last_access: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+
+        # 세션이 축출될 때 호출 (요약 갱신 취소 등)
+        self.on_evict: Optional[Callable[[str], None]] = None
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+        self.shared_profiles = ProfileRegistry()
+
+    async def get_session(self, session_id: str) -> Optional[Any]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        if time.monotonic() - self._last_access[session_id] > self.idle_ttl:
+            self._remove(session_id)
+            self.evicted_idle += 1
+            return None
+        self._touch(session_id)
+        return session
+
+    async def save_session(self, session: Any):
+        session_id = session.session_id
+        self.sessions[session_id] = session
+        self._touch(session_id)
+
+        size = estimate_session_bytes(session)
+        self._total_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+        self._enforce_limits(keep=session_id)
+
+    async def delete_session(self, session_id: str):
+        self._remove(session_id, evicted=False)
+
+    async def count_sessions(self) -> int:
+        return len(self.sessions)
+
+    async def sweep(self) -> int:
+        deadline = time.monotonic() - self.idle_ttl
+        # LRU 순서이므로 앞에서부터 만료된 세션만 확인
+        expired = []
+        for session_id in self.sessions:
+            if self._last_access[session_id] > deadline:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            self._remove(session_id)
+        self.evicted_idle += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        count = len(self.sessions)
+        return {
+            "sessions": count,
+            "estimated_bytes": self._total_bytes,
+            "estimated_bytes_per_session": self._total_bytes // count if count else 0,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl,
+            "evicted_idle": self.evicted_idle,
+            "evicted_lru": self.evicted_lru,
+            "shared_profiles": self.shared_profiles.stats(),
+        }
+
+    def _touch(self, session_id: str):
+        self._last_access[session_id] = time.monotonic()
+        self.sessions.move_to_end(session_id)
+
+    def _enforce_limits(self, keep: str):
+        while len(self.sessions) > 1 and (
+            len(self.sessions) > self.max_sessions or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self.sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evicted_lru += 1
+
+    def _remove(self, session_id: str, evicted: bool = True):
+        if self.sessions.pop(session_id, None) is None:
+            return
+        self._last_access.pop(session_id, None)
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+        if evicted:
+            print(f"세션 축출: {session_id}")
+        if self.on_evict:
+            self.on_evict(session_id)
+
+    async def get_profile(self, profile_id: str) -> Optional[Any]:
+        return self.profiles.get(profile_id)
+
+    async def save_profile(self, profile_id: str, profile: Any):
+        self.profiles[profile_id] = profile
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def save_job(self, job: Dict):
+        self.jobs[job["job_id"]] = dict(job)
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+
+    async def list_jobs(self, statuses: Iterable[str]) -> List[Dict]:
+        statuses = set(statuses)
+        return [dict(job) for job in self.jobs.values() if job["status"] in statuses]
+
+
+class RedisSessionStore(SessionStore):
+    """Redis 저장소 - 여러 uvicorn 워커와 서버 재시작 사이에서 세션 공유
+
+    유휴 세션은 키 만료(idle_ttl)로 정리되며, 조회할 때마다 만료 시간이 갱신됩니다.
+    전체 메모리 한도는 Redis 의 maxmemory / maxmemory-policy(allkeys-lru) 설정을 따릅니다.
+    공유 프로필은 {prefix}:session-profile:{프로필 키} 에 한 번만 저장하고, 세션을 저장할 때마다
+    세션보다 길게(idle_ttl 의 2배) 만료 시간을 갱신합니다. 워커는 읽은 프로필을 메모리에 두고 공유합니다.
+    """
+
+    def __init__(self, client, session_model: Type[BaseModel], profile_model: Type[BaseModel],
+                 key_prefix: str = "donga", idle_ttl: Optional[float] = None):
+        self.client = client
+        self.session_model = session_model
+        self.profile_model = profile_model
+        self.key_prefix = key_prefix
+        self.idle_ttl = int(idle_ttl if idle_ttl is not None else float(os.getenv('SESSION_IDLE_TTL_SECONDS', 1800)))
+        self.job_ttl = int(os.getenv('JOB_RESULT_TTL_SECONDS', 86400))
+        self.shared_profiles = ProfileRegistry()
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:session:{session_id}"
+
+    def _profile_key(self, profile_id: str) -> str:
+        return f"{self.key_prefix}:profile:{profile_id}"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:job:{job_id}"
+
+    def _shared_profile_key(self, profile_key: str) -> str:
+        return f"{self.key_prefix}:session-profile:{profile_key}"
+
+    async def attach_profile(self, session: Any, profile: Dict):
+        await super().attach_profile(session, profile)
+        await self._write_shared_profile(session)
+
+    async def _write_shared_profile(self, session: Any):
+        await self.client.set(
+            self._shared_profile_key(session.profile_key),
+            json.dumps(session.personalized_profile, ensure_ascii=False), ex=2 * self.idle_ttl
+        )
+
+    async def get_session(self, session_id: str) -> Optional[Any]:
+        data = await self.client.getex(self._session_key(session_id), ex=self.idle_ttl)
+        if data is None:
+            return None
+        raw = json.loads(data)
+        # 예전 형식은 세션 안에 프로필 전체가 있음 - 공유 프로필로 옮겨 다음 저장부터 키만 저장
+        legacy_profile = raw.pop("personalized_profile", None)
+        session = self.session_model.model_validate(raw)
+        if legacy_profile is not None:
+            await self.attach_profile(session, legacy_profile)
+        elif session.profile_key:
+            profile = self.shared_profiles.get(session.profile_key)
+            if profile is None:
+                profile_data = await self.client.get(self._shared_profile_key(session.profile_key))
+                if profile_data is None:
+                    print(f"경고: 세션의 공유 프로필이 만료되었습니다: {session_id}")
+                    return None
+                _, profile = self.shared_profiles.intern(json.loads(profile_data), session.profile_key)
+            session.attach_profile(session.profile_key, profile)
+        return session
+
+    async def save_session(self, session: Any):
+        data = session.model_dump_json(exclude_none=True)
+        if not session.profile_key:
+            await self.client.set(self._session_key(session.session_id), data, ex=self.idle_ttl)
+            return
+        # 세션 저장과 공유 프로필 만료 시간 갱신을 한 번의 왕복으로
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self._session_key(session.session_id), data, ex=self.idle_ttl)
+        pipe.expire(self._shared_profile_key(session.profile_key), 2 * self.idle_ttl)
+        _, refreshed = await pipe.execute()
+        if not refreshed:
+            await self._write_shared_profile(session)
+
+    async def delete_session(self, session_id: str):
+        await self.client.delete(self._session_key(session_id))
+
+    async def count_sessions(self) -> int:
+        count = 0
+        async for _ in self.client.scan_iter(match=self._session_key("*"), count=500):
+            count += 1
+        return count
+
+    async def get_profile(self, profile_id: str) -> Optional[Any]:
+        data = await self.client.get(self._profile_key(profile_id))
+        if data is None:
+            return None
+        return self.profile_model.model_validate_json(data)
+
+    async def save_profile(self, profile_id: str, profile: Any):
+        await self.client.set(self._profile_key(profile_id), profile.model_dump_json(exclude_none=True))
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        data = await self.client.get(self._job_key(job_id))
+        return json.loads(data) if data else None
+
+    async def save_job(self, job: Dict):
+        await self.client.set(self._job_key(job["job_id"]), json.dumps(job, ensure_ascii=False), ex=self.job_ttl)
+
+    async def list_jobs(self, statuses: Iterable[str]) -> List[Dict]:
+        statuses = set(statuses)
+        keys = [key async for key in self.client.scan_iter(match=self._job_key("*"), count=500)]
+        jobs = []
+        for start in range(0, len(keys), 500):
+            for data in await self.client.mget(keys[start:start + 500]):
+                job = json.loads(data) if data else None
+                if job and job["status"] in statuses:
+                    jobs.append(job)
+        return jobs
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "idle_ttl_seconds": self.idle_ttl,
+            "eviction": "redis-key-expiry",
+            "shared_profiles": self.shared_profiles.stats(),
+        }
+
+    async def close(self):
+        await self.client.close()
+
+
+def create_session_store(session_model: Type[BaseModel], profile_model: Type[BaseModel]) -> SessionStore:
+    """SESSION_STORE 환경 변수('memory' 또는 'redis')에 따라 저장소 생성"""
+    backend = os.getenv('SESSION_STORE', 'memory').lower()
+
+    if backend == "redis":
+        import redis.asyncio as redis
+
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        client = redis.from_url(redis_url, decode_responses=True)
+        print(f"✅ Redis 세션 저장소 사용: {redis_url}")
+        return RedisSessionStore(
+            client,
+            session_model=session_model,
+            profile_model=profile_model,
+            key_prefix=os.getenv('REDIS_KEY_PREFIX', 'donga')
+        )
+
+    return InMemorySessionStore()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import re
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from metrics import SPECULATION_TOTAL
+
+
+def normalize_answer(text: str) -> str:
+    """공백 차이만 있는 답변은 같은 답변으로 봄"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class Speculation:
+    """작성 중인 답변 초안(typing_partial)으로 미리 계산한 다음 턴 재료"""
+
+    def __init__(self, draft: str, history_len: int, summarized_exchanges: int):
+        self.draft = normalize_answer(draft)
+        # 초안을 받았을 때의 세션 상태 - 최종 답변 때 상태가 같아야 재사용
+        self.history_len = history_len
+        self.summarized_exchanges = summarized_exchanges
+        self.context: Optional[str] = None  # 초안 기준 문서 검색 결과
+        self.reply: Optional[asyncio.Task] = None  # 초안 기준 면접관 응답 (SPECULATIVE_GENERATE)
+        self.started = time.perf_counter()
+
+    def cancel(self):
+        if self.reply is not None and not self.reply.done():
+            self.reply.cancel()
+
+
+class SpeculationManager:
+    """지원자가 답변을 작성하는 동안 다음 턴을 미리 준비하는 추측 실행 관리자
+
+    typing_partial 초안이 SPECULATIVE_DEBOUNCE_SECONDS 동안 바뀌지 않으면 prepare(session_id, 초안)으로
+    문서 검색과 (SPECULATIVE_GENERATE=true 면) 면접관 응답 생성을 미리 시작합니다. 최종 답변이 오면
+    resolve() 가 세션 상태와 답변을 비교해 재사용 여부를 정합니다.
+    - reply: 최종 답변이 마지막 초안과 같음 -> 미리 생성한 응답을 그대로 사용
+    - context: 최종 답변이 초안을 이어 쓴 것이고 SPECULATIVE_MIN_OVERLAP 이상 겹침 -> 검색 결과만 재사용
+    - miss: 초안과 달라졌거나 그 사이 대화/요약이 바뀜 -> 버리고 평소처럼 처리
+    추측 결과는 이 워커의 메모리에만 있으므로 초안과 답변이 같은 연결(WebSocket)로 와야 재사용됩니다.
+    """
+
+    def __init__(self, prepare: Callable[[str, str], Awaitable[Optional[Speculation]]]):
+        self.prepare = prepare
+        self.enabled = os.getenv('SPECULATIVE_ENABLED', 'false').lower() == 'true'
+        self.generate = os.getenv('SPECULATIVE_GENERATE', 'true').lower() == 'true'
+        self.debounce = float(os.getenv('SPECULATIVE_DEBOUNCE_SECONDS', 0.8))
+        self.min_chars = int(os.getenv('SPECULATIVE_MIN_CHARS', 20))
+        self.min_overlap = float(os.getenv('SPECULATIVE_MIN_OVERLAP', 0.8))
+
+        # 세션 ID -> 디바운스 대기/준비 중인 태스크, 준비가 끝난 추측 결과
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._results: Dict[str, Speculation] = {}
+        self.drafts = 0
+        self.prepared = 0
+        self.outcomes: Dict[str, int] = {"reply": 0, "context": 0, "miss": 0}
+
+    def submit_draft(self, session_id: str, draft: str):
+        """작성 중인 답변 초안 등록 - 마지막 초안만 디바운스 후 준비"""
+        if not self.enabled or len(normalize_answer(draft)) < self.min_chars:
+            return
+        self.drafts += 1
+        current = self._results.get(session_id)
+        if current is not None and current.draft == normalize_answer(draft):
+            return
+        running = self._pending.pop(session_id, None)
+        if running is not None:
+            running.cancel()
+        task = asyncio.create_task(self._prepare_after_debounce(session_id, draft))
+        self._pending[session_id] = task
+        task.add_done_callback(
+            lambda t: self._pending.pop(session_id, None) if self._pending.get(session_id) is t else None
+        )
+
+    async def _prepare_after_debounce(self, session_id: str, draft: str):
+        await asyncio.sleep(self.debounce)
+        try:
+            speculation = await self.prepare(session_id, draft)
+        except Exception as e:
+            print(f"추측 실행 준비 오류: {session_id} - {e}")
+            return
+        if speculation is None:
+            return
+        if speculation.reply is not None:
+            # 결과를 쓰지 않고 버려도 "예외를 확인하지 않음" 경고가 나지 않도록
+            speculation.reply.add_done_callback(lambda t: t.cancelled() or t.exception())
+        previous = self._results.pop(session_id, None)
+        if previous is not None:
+            previous.cancel()
+        self._results[session_id] = speculation
+        self.prepared += 1
+
+    def resolve(self, session_id: str, history_len: int, summarized_exchanges: int,
+                user_response: str) -> Tuple[Optional[Speculation], Optional[str]]:
+        """최종 답변과 추측 결과를 비교해 (추측, 재사용 수준) 반환 - 재사용하지 않는 결과는 취소"""
+        running = self._pending.pop(session_id, None)
+        if running is not None:
+            running.cancel()
+        speculation = self._results.pop(session_id, None)
+        if speculation is None:
+            if running is not None:
+                # 초안은 받았지만 준비가 끝나기 전에 최종 답변이 옴
+                self.outcomes["miss"] += 1
+                SPECULATION_TOTAL.inc(outcome="miss")
+            return None, None
+
+        outcome = "miss"
+        final = normalize_answer(user_response)
+        if speculation.history_len == history_len:
+            if (final == speculation.draft and speculation.reply is not None
+                    and speculation.summarized_exchanges == summarized_exchanges):
+                outcome = "reply"
+            elif final.startswith(speculation.draft) and len(speculation.draft) >= self.min_overlap * len(final):
+                outcome = "context"
+        if outcome != "reply":
+            speculation.cancel()
+
+        self.outcomes[outcome] += 1
+        SPECULATION_TOTAL.inc(outcome=outcome)
+        return speculation, None if outcome == "miss" else outcome
+
+    async def reply(self, speculation: Speculation) -> Optional[str]:
+        """미리 생성한 응답 (생성에 실패했으면 None - 평소처럼 다시 생성)"""
+        try:
+            return await speculation.reply
+        except Exception as e:
+            print(f"추측 응답 사용 불가, 다시 생성: {e}")
+            SPECULATION_TOTAL.inc(outcome="reply_error")
+            return None
+
+    def discard(self, session_id: str):
+        """세션 종료/축출 시 추측 결과 정리"""
+        running = self._pending.pop(session_id, None)
+        if running is not None:
+            running.cancel()
+        speculation = self._results.pop(session_id, None)
+        if speculation is not None:
+            speculation.cancel()
+
+    def stats(self) -> Dict:
+        resolved = sum(self.outcomes.values())
+        hits = self.outcomes["reply"] + self.outcomes["context"]
+        return {
+            "enabled": self.enabled,
+            "generate": self.generate,
+            "drafts": self.drafts,
+            "prepared": self.prepared,
+            "pending": len(self._pending),
+            "reply_hits": self.outcomes["reply"],
+            "context_hits": self.outcomes["context"],
+            "misses": self.outcomes["miss"],
+            "hit_rate": round(hits / resolved, 3) if resolved else 0.0,
+        }
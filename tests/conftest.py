@@ -0,0 +1,9 @@
+import os
+
+# 외부 서비스 없이 실행되도록 모듈을 불러오기 전에 기본 환경 설정
+os.environ.setdefault('LLM_BACKEND', 'fake')
+os.environ.setdefault('DATABASE_URL', 'none')
+os.environ.setdefault('SESSION_STORE', 'memory')
+os.environ.setdefault('RETRIEVAL_EMBEDDER', 'hashing')
+os.environ.setdefault('CONTEXT_SUMMARY', 'false')
+os.environ.setdefault('TURN_SCORING', 'false')
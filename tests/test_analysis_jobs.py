@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from analysis_jobs import AnalysisJobQueue
+from session_store import InMemorySessionStore
+
+
+def make_queue(store, analyzed):
+    async def analyze(snapshot):
+        analyzed.append(snapshot["session_id"])
+        return {"session_id": snapshot["session_id"]}
+
+    return AnalysisJobQueue(analyze, lambda snapshot, error: {}, store, concurrency=1, max_retries=0)
+
+
+async def wait_finished(queue, count: int):
+    for _ in range(200):
+        if queue.completed + queue.failed >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("분석 작업이 끝나지 않았습니다")
+
+
+@pytest.mark.asyncio
+async def test_start_requeues_unfinished_jobs():
+    store = InMemorySessionStore()
+    for job_id, status, created_at in (("j1", "running", "2024-01-01T00:00:01"),
+                                       ("j2", "queued", "2024-01-01T00:00:00"),
+                                       ("j3", "done", "2024-01-01T00:00:02")):
+        await store.save_job({"job_id": job_id, "session_id": f"s-{job_id}", "status": status, "attempts": 0,
+                              "created_at": created_at, "snapshot": {"session_id": f"s-{job_id}"}})
+
+    analyzed = []
+    queue = make_queue(store, analyzed)
+    queue.start()
+    await wait_finished(queue, 2)
+    await queue.stop()
+
+    assert analyzed == ["s-j2", "s-j1"]
+    assert queue.stats()["recovered"] == 2
+    assert (await store.get_job("j1"))["status"] == "done"
+    assert (await store.get_job("j2"))["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_job_submitted_right_after_start_runs_once():
+    store = InMemorySessionStore()
+    analyzed = []
+    queue = make_queue(store, analyzed)
+    queue.start()
+    job = await queue.submit({"session_id": "s1"})
+    result = await queue.wait(job["job_id"], timeout=2)
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert result["status"] == "done"
+    assert analyzed == ["s1"]
+    assert queue.stats()["recovered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_jobs_left_queued_by_stop_resume_on_next_start():
+    store = InMemorySessionStore()
+    analyzed = []
+    queue = make_queue(store, analyzed)
+    queue.concurrency = 0
+    queue.start()
+    await queue.submit({"session_id": "s1"})
+    await queue.stop()
+
+    queue.concurrency = 1
+    queue.start()
+    await wait_finished(queue, 1)
+    await queue.stop()
+    assert analyzed == ["s1"]
+
+
+@pytest.mark.asyncio
+async def test_redis_store_lists_unfinished_jobs():
+    import fakeredis.aioredis
+
+    from ai_interviewer_system_lite import InterviewProfile, InterviewSession
+    from session_store import RedisSessionStore
+
+    store = RedisSessionStore(fakeredis.aioredis.FakeRedis(decode_responses=True), InterviewSession, InterviewProfile)
+    for job_id, status in (("j1", "queued"), ("j2", "running"), ("j3", "failed")):
+        await store.save_job({"job_id": job_id, "status": status})
+
+    jobs = await store.list_jobs(("queued", "running"))
+    assert sorted(job["job_id"] for job in jobs) == ["j1", "j2"]
@@ -0,0 +1,111 @@
+import asyncio
+import sys
+from collections import Counter
+
+import pytest
+
+from answer_analysis import AnswerAnalyzer, CharNgramVectorizer
+
+QUESTION = "과학 동아리에서 어떤 실험을 했나요?"
+ITEMS = [
+    (QUESTION, "저는 과학 동아리에서 물 로켓의 발사 각도와 비행 거리의 관계를 실험했습니다. 각도를 5도씩 바꿔 세 번씩 발사했습니다.",
+     ["물리", "로켓"]),
+    ("지원 동기를 말해주세요.", "그냥 열심히 하고 싶어서 지원했습니다. 아마 잘 할 수 있을 것 같고 뭔가 배우고 싶습니다.", []),
+    (QUESTION, "네", []),
+    (QUESTION, "주말에는 친구들과 축구를 하고 맛있는 음식을 먹으러 다니는 것을 좋아합니다 정말로요", []),
+    ("리더십을 발휘한 경험이 있나요?", "학생회장으로 축제를 준비하며 20명의 부원과 일정을 조율했던 경험이 있습니다.", ["리더십"]),
+]
+
+
+def fallback_analyzer() -> AnswerAnalyzer:
+    analyzer = AnswerAnalyzer()
+    analyzer._vectorizer = CharNgramVectorizer()
+    return analyzer
+
+
+def test_features_flag_short_vague_and_off_topic_answers():
+    specific, vague, short, off_topic, leadership = fallback_analyzer().features(ITEMS)
+
+    assert specific["flags"] == []
+    assert specific["specificity"] == 0.9
+    assert specific["keyword_overlap"] == 0.5  # 로켓만 언급
+    assert specific["relevance"] > off_topic["relevance"]
+    assert vague["flags"] == ["vague"]
+    assert vague["keyword_overlap"] is None
+    assert short == {"chars": 1, "words": 1, "specificity": 0.02, "keyword_overlap": None, "relevance": 0.0,
+                     "flags": ["too_short"]}
+    assert off_topic["flags"] == ["vague", "off_topic"]
+    assert leadership["keyword_overlap"] == 0.0  # 키워드를 직접 말하지 않음
+
+
+def test_keyword_mention_is_not_off_topic():
+    answer = "주말에는 친구들과 축구를 하고 로켓 영상을 보면서 쉬는 것을 좋아합니다 정말로요"
+    [features] = fallback_analyzer().features([(QUESTION, answer, ["로켓"])])
+    assert "off_topic" not in features["flags"]
+
+
+def test_whitespace_is_normalized_before_counting():
+    analyzer = fallback_analyzer()
+    [spaced, plain] = analyzer.features([(QUESTION, "  실험을   직접  했습니다  ", []), (QUESTION, "실험을 직접 했습니다", [])])
+    assert spaced == plain
+
+
+def test_guidance_and_summary():
+    analyzer = fallback_analyzer()
+    features = analyzer.features(ITEMS)
+    assert analyzer.guidance(features[0]) == ""
+    guidance = analyzer.guidance(features[3])
+    assert guidance.startswith("[답변 사전 분석]")
+    assert "구체적인 사례" in guidance and "질문의 핵심" in guidance
+
+    summary = analyzer.summarize(features)
+    assert summary["answers"] == 5
+    assert (summary["too_short"], summary["vague"], summary["off_topic"]) == (1, 2, 1)
+    assert summary["keyword_overlap"] == 0.25
+    assert analyzer.summarize([]) == {"answers": 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_are_analyzed_in_one_batch():
+    analyzer = fallback_analyzer()
+    results = await asyncio.gather(*(analyzer.analyze(*item) for item in ITEMS))
+
+    assert [result["flags"] for result in results] == [features["flags"] for features in analyzer.features(ITEMS)]
+    assert analyzer.stats()["batches"] == 2  # gather 한 번 + 비교용 features 한 번
+    assert analyzer.stats()["answers"] == 2 * len(ITEMS)
+
+
+@pytest.mark.asyncio
+async def test_batch_error_is_raised_to_every_caller():
+    analyzer = fallback_analyzer()
+
+    def broken(texts):
+        raise RuntimeError("벡터화 실패")
+    analyzer._vectorizer.encode = broken
+    results = await asyncio.gather(*(analyzer.analyze(*item) for item in ITEMS[:2]), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_fallback_is_used_without_scikit_learn(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sklearn.feature_extraction.text", None)
+    analyzer = AnswerAnalyzer()
+    assert isinstance(analyzer.vectorizer, CharNgramVectorizer)
+    assert analyzer.stats()["vectorizer"] == "CharNgramVectorizer"
+
+
+def test_fallback_ngrams_match_scikit_learn_char_wb():
+    text = pytest.importorskip("sklearn.feature_extraction.text")
+    analyze = text.HashingVectorizer(analyzer="char_wb", ngram_range=(2, 3)).build_analyzer()
+    vectorizer = CharNgramVectorizer()
+    for sample in ["물 로켓  실험", "A 단어와  ab, 5도씩!", "네"]:
+        expected = Counter(analyze(sample))
+        weights = vectorizer.encode([sample])[0]
+        assert set(weights) == set(expected)
+        # 정규화 전 개수 비율이 같음
+        scale = weights[next(iter(expected))] / expected[next(iter(expected))]
+        assert all(weights[gram] == pytest.approx(count * scale) for gram, count in expected.items())
+
+
+def test_fallback_features_match_scikit_learn():
+    pytest.importorskip("sklearn")
+    assert fallback_analyzer().features(ITEMS) == AnswerAnalyzer().features(ITEMS)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+
+from connection_manager import ConnectionManager, InProcessEventBus
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._unblocked = asyncio.Event()
+        if not blocked:
+            self._unblocked.set()
+
+    async def send_text(self, text: str):
+        await self._unblocked.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def settle(condition, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def make_manager(bus=None, **settings) -> ConnectionManager:
+    manager = ConnectionManager(bus or InProcessEventBus(), max_queue=settings.pop("max_queue", 8))
+    for name, value in settings.items():
+        setattr(manager, name, value)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_bus_delivers_to_socket_held_by_another_manager():
+    bus = InProcessEventBus()
+    rest_worker, ws_worker = make_manager(bus), make_manager(bus)
+    await rest_worker.start()
+    await ws_worker.start()
+    websocket = FakeWebSocket()
+    ws_worker.connect("s1", websocket)
+
+    await rest_worker.publish("s1", {"type": "analysis_ready", "job_id": "j1"})
+    await settle(lambda: websocket.sent)
+
+    assert websocket.sent == [{"type": "analysis_ready", "job_id": "j1"}]
+    assert ws_worker.stats()["delivered_from_bus"] == 1
+    assert rest_worker.stats()["bus"]["published"] == 1
+    await rest_worker.close()
+    await ws_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_local_socket_is_served_without_the_bus():
+    bus = InProcessEventBus()
+    manager = make_manager(bus)
+    await manager.start()
+    websocket = FakeWebSocket()
+    manager.connect("s1", websocket)
+
+    await manager.publish("s1", {"type": "ai_question", "content": "질문"})
+    await manager.publish("unknown", {"type": "ai_question", "content": "버려짐"})
+    await settle(lambda: websocket.sent)
+
+    assert websocket.sent == [{"type": "ai_question", "content": "질문"}]
+    assert bus.published == 1  # 연결이 없는 세션만 버스로
+    assert manager.delivered_from_bus == 0
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_full_send_queue_aborts_slow_consumer():
+    manager = make_manager(max_queue=2)
+    websocket = FakeWebSocket(blocked=True)
+    connection = manager.connect("s1", websocket)
+
+    assert manager.send(connection, json.dumps({"n": 0}))
+    await asyncio.sleep(0.01)  # 송신 태스크가 첫 프레임을 꺼내 전송 중에 멈춤
+    assert manager.send(connection, json.dumps({"n": 1}))
+    assert manager.send(connection, json.dumps({"n": 2}))
+    assert not manager.send(connection, json.dumps({"n": 3}))
+    await settle(lambda: websocket.closed_with is not None)
+
+    assert connection.closed
+    assert "s1" not in manager
+    assert websocket.closed_with == 1013
+    assert manager.stats()["disconnects"] == {"slow_consumer": 1}
+    assert not manager.send(connection, json.dumps({"n": 4}))
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_bus_message_for_overflowing_socket_is_dropped():
+    bus = InProcessEventBus()
+    rest_worker, ws_worker = make_manager(bus), make_manager(bus, max_queue=1)
+    await rest_worker.start()
+    await ws_worker.start()
+    websocket = FakeWebSocket(blocked=True)
+    connection = ws_worker.connect("s1", websocket)
+
+    for n in range(3):
+        await rest_worker.publish("s1", {"n": n})
+        await asyncio.sleep(0.01)
+
+    assert connection.closed
+    assert ws_worker.delivered_from_bus == 2
+    assert ws_worker.disconnects == {"slow_consumer": 1}
+    await rest_worker.close()
+    await ws_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_new_connection_replaces_previous_one():
+    manager = make_manager()
+    first, second = FakeWebSocket(), FakeWebSocket()
+    old = manager.connect("s1", first)
+    manager.connect("s1", second)
+    await settle(lambda: first.closed_with is not None)
+
+    assert old.closed
+    assert len(manager) == 1
+    assert manager.disconnects == {"replaced": 1}
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_silent_client_times_out_heartbeat():
+    manager = make_manager(ping_interval=0.02, ping_timeout=0.05)
+    websocket = FakeWebSocket()
+    connection = manager.connect("s1", websocket)
+    connection.touch(pong=True)
+
+    await settle(lambda: connection.closed)
+    assert manager.disconnects == {"heartbeat_timeout": 1}
+    assert {"type": "ping"} in websocket.sent
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_long_turn_does_not_trip_heartbeat():
+    manager = make_manager(ping_interval=0.02, ping_timeout=0.05)
+    websocket = FakeWebSocket()
+    connection = manager.connect("s1", websocket)
+    connection.touch(pong=True)
+
+    # 수신 루프가 턴 처리를 기다리는 동안 (pong 을 읽지 못함)
+    with connection.processing():
+        await asyncio.sleep(0.2)
+    assert not connection.closed
+    assert len([frame for frame in websocket.sent if frame == {"type": "ping"}]) >= 2
+
+    # 처리가 끝난 뒤에도 응답이 없으면 그때부터 시간 제한 적용
+    await settle(lambda: connection.closed)
+    assert manager.disconnects == {"heartbeat_timeout": 1}
+    await manager.close()
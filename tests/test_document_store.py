@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from document_store import CHUNK_SIZE, PREVIEW_CHARS, DocumentStore, UploadTooLarge
+
+
+class ChunkedUpload:
+    """UploadFile 처럼 read(size) 로 조금씩 읽히는 업로드 (읽기 요청 크기 기록)"""
+
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.content_type = "text/plain"
+        self.data = data
+        self.offset = 0
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(upload_dir=str(tmp_path), workers=1)
+    yield store
+    store.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_large_upload_is_streamed_in_chunks_and_raw_file_removed(store, tmp_path):
+    data = ("자기소개서 문단입니다. " * 200_000).encode("utf-8")
+    upload = ChunkedUpload("자기소개서.txt", data)
+    metadata = await store.save_upload(upload)
+
+    assert len(upload.reads) > 2
+    assert all(size == CHUNK_SIZE for size in upload.reads)
+    assert metadata["size"] == len(data)
+    assert len(metadata["preview"]) <= PREVIEW_CHARS + 3
+    assert sorted(os.listdir(tmp_path)) == sorted([f"{metadata['id']}.json", f"{metadata['id']}.txt"])
+    assert (await store.get_text(metadata["id"])).startswith("자기소개서 문단입니다.")
+
+
+@pytest.mark.asyncio
+async def test_upload_over_limit_is_rejected_and_removed(tmp_path):
+    store = DocumentStore(upload_dir=str(tmp_path), max_bytes=CHUNK_SIZE)
+    with pytest.raises(UploadTooLarge):
+        await store.save_upload(ChunkedUpload("big.txt", b"x" * (CHUNK_SIZE * 2)))
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_documents_unused_past_ttl(store, tmp_path):
+    old = await store.save_text("old.txt", "text/plain", "오래된 문서")
+    recent = await store.save_text("recent.txt", "text/plain", "최근 문서")
+    expired_at = time.time() - store.ttl - 10
+    for suffix in (".json", ".txt"):
+        os.utime(tmp_path / f"{old['id']}{suffix}", (expired_at, expired_at))
+    (tmp_path / "stale.raw.pdf").write_bytes(b"%PDF")
+    os.utime(tmp_path / "stale.raw.pdf", (expired_at, expired_at))
+
+    assert await store.sweep(force=True) == 1
+    assert await store.get(old["id"]) is None
+    assert await store.get_text(old["id"]) == ""
+    assert (await store.get(recent["id"]))["name"] == "recent.txt"
+    assert not (tmp_path / "stale.raw.pdf").exists()
+    assert store.stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reading_a_document_refreshes_its_ttl(store, tmp_path):
+    metadata = await store.save_text("notes.txt", "text/plain", "문서")
+    expired_at = time.time() - store.ttl - 10
+    os.utime(tmp_path / f"{metadata['id']}.json", (expired_at, expired_at))
+
+    await store.get_text(metadata["id"])
+    assert await store.sweep(force=True) == 0
+
+
+def test_profile_keeps_only_the_uploaded_file_id(monkeypatch, tmp_path):
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setenv("STARTUP_WARMUP", "false")
+    import backend_api_lite
+
+    with TestClient(backend_api_lite.app) as client:
+        text = "로봇 동아리에서 센서를 보정한 경험을 적었습니다. " * 20_000
+        uploaded = client.post("/api/interview/files",
+                               files={"file": ("report.txt", text.encode("utf-8"), "text/plain")}).json()
+        profile = {"type": "science_high", "institution": "한국과학고", "fields": ["물리"], "keywords": [],
+                   "additionalStyle": "", "uploadedFiles": [{"id": uploaded["id"], "name": "report.txt"}]}
+        profile_id = client.post("/api/interview/profile", json={"profile": profile}).json()["profile_id"]
+
+        orchestrator = backend_api_lite.interview_orchestrator
+        stored = client.portal.call(orchestrator.get_profile, profile_id)
+        [file] = stored.uploadedFiles
+        assert file.id == uploaded["id"]
+        assert file.content is None
+        assert file.chars == len(text.strip())
+        assert len(file.preview) <= PREVIEW_CHARS + 3
+        assert len(stored.model_dump_json()) < 5000
@@ -0,0 +1,87 @@
+import pytest
+
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile
+
+ANSWERS = [
+    "저는 과학 동아리에서 물 로켓의 발사 각도와 비행 거리의 관계를 실험했습니다.",
+    "각도를 5도씩 바꿔가며 세 번씩 발사해 평균 거리를 비교했습니다.",
+    "45도 근처에서 가장 멀리 날았지만 바람 때문에 측정값의 편차가 컸습니다.",
+    "다음에는 실내에서 공기 저항을 줄인 조건으로 다시 실험해 보고 싶습니다.",
+]
+
+
+def make_profile() -> InterviewProfile:
+    return InterviewProfile(type="science_high", institution="한국과학고", fields=["물리"],
+                            keywords=["유체역학"], additionalStyle="차분하게", difficulty="middle")
+
+
+def record_requests(orchestrator: InterviewOrchestrator) -> list:
+    """면접관 턴 요청의 (메시지, system instruction) 기록"""
+    requests = []
+    backend = orchestrator.llm.backend
+    generate = backend.generate
+
+    async def recording(messages, system_instruction=None):
+        if system_instruction is not None:
+            requests.append((messages, system_instruction))
+        return await generate(messages, system_instruction)
+
+    backend.generate = recording
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_interview_runs_end_to_end_with_fake_backend():
+    orchestrator = InterviewOrchestrator()
+    assert orchestrator.llm.name == "fake"
+    requests = record_requests(orchestrator)
+
+    opening = await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    assert "한국과학고" in opening
+    replies = [await orchestrator.process_response("s1", answer) for answer in ANSWERS]
+    assert all(reply and not reply.startswith("❌") for reply in replies)
+
+    result = await orchestrator.end_interview("s1")
+    assert result["total_exchanges"] == len(ANSWERS)
+    assert await orchestrator.session_store.get_session("s1") is None
+    assert len(requests) == len(ANSWERS)
+
+
+@pytest.mark.asyncio
+async def test_static_prefix_is_sent_as_system_instruction():
+    orchestrator = InterviewOrchestrator()
+    requests = record_requests(orchestrator)
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    for answer in ANSWERS[:2]:
+        await orchestrator.process_response("s1", answer)
+
+    static_prefix = orchestrator.personalized_prompt_manager.generate_static_prefix("science_high", "middle")
+    # 모든 턴이 같은 고정 프롬프트를 쓰고, 지원자별 정보는 system instruction 이 아닌 첫 메시지에 들어감
+    assert {instruction for _, instruction in requests} == {static_prefix}
+    assert "한국과학고" not in static_prefix
+    first_messages = requests[0][0]
+    assert first_messages[-1]["content"].startswith("[개인화 정보]")
+    assert "한국과학고" in first_messages[-1]["content"]
+    # 두 번째 턴도 이전 질의응답과 함께 개인화 정보를 계속 전달
+    assert "한국과학고" in requests[1][0][0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_history_is_windowed_to_recent_exchanges():
+    orchestrator = InterviewOrchestrator()
+    orchestrator.context_window_turns = 2
+    orchestrator.context_summary_enabled = False
+    requests = record_requests(orchestrator)
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    for answer in ANSWERS:
+        await orchestrator.process_response("s1", answer)
+
+    # 마지막 턴: 앞선 질의응답 3개 중 최근 2개만 그대로 보내고 그 앞은 요약 자리로 대체
+    messages = requests[-1][0]
+    assert len(messages) == 2 + 2 * 2 + 1
+    assert "[이전 대화 요약]" in messages[0]["content"]
+    assert "한국과학고" in messages[0]["content"]
+    sent = "\n".join(message["content"] for message in messages)
+    assert ANSWERS[0] not in sent
+    assert ANSWERS[1] in sent and ANSWERS[2] in sent and ANSWERS[3] in sent
+    assert len((await orchestrator.session_store.get_session("s1")).conversation_history) == 1 + 2 * len(ANSWERS)
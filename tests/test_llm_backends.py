@@ -0,0 +1,32 @@
+import pytest
+
+from llm_backends import FakeBackend, create_llm_backend
+
+API_KEYS = ("GOOGLE_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY")
+
+
+@pytest.fixture
+def no_api_keys(monkeypatch):
+    for name in API_KEYS:
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize("choice", [None, "auto", "AUTO"])
+def test_auto_without_api_keys_refuses_to_start(monkeypatch, no_api_keys, choice):
+    if choice is None:
+        monkeypatch.delenv("LLM_BACKEND", raising=False)
+    else:
+        monkeypatch.setenv("LLM_BACKEND", choice)
+    with pytest.raises(RuntimeError, match="LLM_BACKEND=fake"):
+        create_llm_backend(executor=None)
+
+
+def test_provider_without_its_key_refuses_to_start(monkeypatch, no_api_keys):
+    monkeypatch.setenv("LLM_BACKEND", "gemini")
+    with pytest.raises(RuntimeError, match="GOOGLE_API_KEY"):
+        create_llm_backend(executor=None)
+
+
+def test_fake_backend_only_when_explicit(monkeypatch, no_api_keys):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    assert isinstance(create_llm_backend(executor=None), FakeBackend)
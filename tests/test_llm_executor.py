@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_executor import LLMExecutor
+from llm_scheduler import LLMScheduler
+
+
+@pytest.fixture
+def executor():
+    executor = LLMExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("조건이 충족되지 않았습니다")
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_holds_a_scheduler_slot_until_it_returns(executor):
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0)
+    executor.on_abandon = scheduler.hold
+    started, finish = threading.Event(), threading.Event()
+
+    def blocking_call():
+        started.set()
+        finish.wait(5)
+        return "늦은 응답"
+
+    ticket = scheduler.submit("u1", "key", 10)
+    call = asyncio.ensure_future(executor.run(blocking_call))
+    await wait_until(started.is_set)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(call, 0.01)
+    scheduler.release(ticket)
+
+    # 호출자는 떠났지만 스레드는 아직 실행 중이므로 다음 호출은 허가되지 않음
+    waiting = scheduler.submit("u2", "key", 10)
+    assert not waiting.granted
+    assert executor.stats()["abandoned"] == 1
+    assert scheduler.stats()["held"] == 1
+
+    finish.set()
+    await wait_until(lambda: waiting.granted)
+    assert executor.stats()["abandoned"] == 0
+    assert scheduler.stats()["held"] == 0
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_before_it_starts_is_not_abandoned(executor):
+    finish = threading.Event()
+    busy = [asyncio.ensure_future(executor.run(finish.wait, 5)) for _ in range(2)]
+    await wait_until(lambda: executor.stats()["in_flight"] == 2)
+
+    queued = asyncio.ensure_future(executor.run(lambda: "실행되지 않음"))
+    await wait_until(lambda: executor.stats()["queue_depth"] == 1)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    assert executor.stats()["queue_depth"] == 0
+    assert executor.stats()["abandoned"] == 0
+    finish.set()
+    await asyncio.gather(*busy)
+
+
+@pytest.mark.asyncio
+async def test_closing_a_stream_early_stops_the_producer_thread(executor):
+    produced = []
+
+    def chunks():
+        for index in range(100):
+            produced.append(index)
+            time.sleep(0.005)
+            yield index
+
+    stream = executor.stream(chunks)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+
+    await wait_until(lambda: executor.stats()["in_flight"] == 0 and executor.stats()["abandoned"] == 0)
+    assert len(produced) < 100
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from llm_backends import LLMBackend
+from llm_resilience import HEDGE_USER_ID, ResilientBackend
+from llm_scheduler import LLMScheduler
+
+
+class SlowBackend(LLMBackend):
+    """호출 순서마다 정해진 지연 뒤 응답하는 백엔드"""
+
+    name = "slow"
+
+    def __init__(self, delays):
+        super().__init__("slow")
+        self.delays = list(delays)
+        self.calls = 0
+
+    async def generate(self, messages, system_instruction=None):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return f"응답 {self.calls}"
+
+
+def hedging_backend(backend, scheduler):
+    resilient = ResilientBackend(backend, max_retries=0, scheduler=scheduler)
+    resilient.hedge_enabled = True
+    resilient.hedge_min_samples = 1
+    resilient._latencies.append(0.02)
+    return resilient
+
+
+MESSAGES = [{"role": "user", "content": "자기소개를 해주세요."}]
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_a_scheduler_slot():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0)
+    backend = SlowBackend([0.2])
+    resilient = hedging_backend(backend, scheduler)
+
+    # 원래 요청은 호출한 쪽이 슬롯을 받은 상태 - 헤지 요청은 빈 슬롯이 없어 보내지 못함
+    ticket = scheduler.submit("u1", resilient.key_id, 10)
+    assert await resilient.generate(MESSAGES) == "응답 1"
+    scheduler.release(ticket)
+
+    assert backend.calls == 1
+    assert resilient.hedges == 1 and resilient.hedge_wins == 0
+    # 원래 요청이 끝나면 대기 중이던 헤지 요청은 대기열에서 빠짐
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admitted_hedge_is_charged_and_can_win():
+    scheduler = LLMScheduler(max_concurrency=2, rpm=0, tpm=0)
+    backend = SlowBackend([0.5, 0.01])
+    resilient = hedging_backend(backend, scheduler)
+    admitted, charged = [], []
+    original_submit = scheduler.submit
+
+    def submit(user_id, key, tokens):
+        admitted.append((user_id, tokens))
+        return original_submit(user_id, key, tokens)
+
+    scheduler.submit = submit
+    scheduler.charge = lambda key, tokens: charged.append(tokens)
+    ticket = scheduler.submit("u1", resilient.key_id, 10)
+    assert await resilient.generate(MESSAGES) == "응답 2"
+    scheduler.release(ticket)
+
+    assert [user_id for user_id, _ in admitted] == ["u1", HEDGE_USER_ID]
+    assert resilient.hedge_wins == 1
+    # 헤지 요청은 입력 토큰으로 허가를 받고 응답 뒤 출력 토큰을 청구
+    assert admitted[1][1] > 0
+    assert len(charged) == 1 and charged[0] > 0
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_not_sent_when_the_queue_is_full():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0, max_queue=0)
+    backend = SlowBackend([0.1])
+    resilient = hedging_backend(backend, scheduler)
+
+    assert await resilient.generate(MESSAGES) == "응답 1"
+    assert backend.calls == 1
+    assert resilient.hedges == 0
+    assert resilient.stats()["resilience"]["hedges_rejected"] == 1
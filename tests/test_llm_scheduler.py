@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from llm_scheduler import LLMOverloaded, LLMScheduler
+
+
+def granted_users(tickets):
+    return [ticket.user_id for ticket in tickets if ticket.granted]
+
+
+@pytest.mark.asyncio
+async def test_users_are_admitted_round_robin():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0)
+    flood = [scheduler.submit("flooder", "key", 10) for _ in range(4)]
+    other = scheduler.submit("candidate", "key", 10)
+
+    assert granted_users(flood + [other]) == ["flooder"]
+    # 한 사용자가 먼저 네 건을 보냈어도 다른 사용자의 호출은 다섯 번째가 아니라 두 번째 차례
+    assert [ticket.position for ticket in flood[1:]] == [1, 3, 4]
+    assert other.position == 2
+
+    scheduler.release(flood[0])
+    assert flood[1].granted
+    scheduler.release(flood[1])
+    assert other.granted
+    assert [ticket.position for ticket in flood[2:]] == [1, 2]
+
+    scheduler.release(other)
+    assert flood[2].granted
+    assert scheduler.stats()["admitted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_releasing_a_waiting_ticket_removes_it_from_the_queue():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0)
+    first = scheduler.submit("u1", "key", 10)
+    second = scheduler.submit("u2", "key", 10)
+    third = scheduler.submit("u3", "key", 10)
+
+    scheduler.release(second)
+    assert third.position == 1
+    scheduler.release(first)
+    assert third.granted
+    assert scheduler.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0, max_queue=2)
+    for user_id in ("u1", "u2", "u3"):
+        scheduler.submit(user_id, "key", 10)
+
+    with pytest.raises(LLMOverloaded) as error:
+        scheduler.submit("u4", "key", 10)
+    assert error.value.retry_after == 1.0
+    assert scheduler.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after_follows_the_request_rate_limit():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=30, tpm=0, max_queue=3)
+    for user_id in ("u1", "u2", "u3", "u4"):
+        scheduler.submit(user_id, "key", 10)
+
+    with pytest.raises(LLMOverloaded) as error:
+        scheduler.submit("u5", "key", 10)
+    # 대기 3건을 분당 30건으로 처리하는 시간
+    assert error.value.retry_after == 6.0
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_retry_after():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0, max_wait=0.05)
+    scheduler.submit("u1", "key", 10)
+    waiting = scheduler.submit("u2", "key", 10)
+
+    with pytest.raises(LLMOverloaded) as error:
+        await scheduler.acquire(waiting)
+    assert error.value.retry_after == 1.0
+    assert scheduler.stats()["timed_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_reports_positions_until_granted():
+    scheduler = LLMScheduler(max_concurrency=1, rpm=0, tpm=0)
+    first = scheduler.submit("u1", "key", 10)
+    second = scheduler.submit("u2", "key", 10)
+    third = scheduler.submit("u3", "key", 10)
+    positions = []
+
+    async def on_wait(position):
+        positions.append(position)
+
+    waiter = asyncio.create_task(scheduler.acquire(third, on_wait))
+    await asyncio.sleep(0.01)
+    scheduler.release(first)
+    await asyncio.sleep(0.01)
+    scheduler.release(second)
+    await asyncio.wait_for(waiter, 1)
+
+    assert third.granted
+    assert positions == [2, 1]
+
+
+def test_key_limits_override_global_limits(monkeypatch):
+    monkeypatch.setenv("LLM_KEY_LIMITS", '{"gemini:ab12cd34": {"rpm": 2000}, "gemini:ffff0000": {"tpm": 500}}')
+    monkeypatch.setenv("LLM_TPM_GEMINI_AB12CD34", "9000")
+    scheduler = LLMScheduler(max_concurrency=1, rpm=60, tpm=1000)
+
+    assert scheduler.limits("gemini:ab12cd34") == (2000, 9000)  # JSON 의 rpm, 환경 변수의 tpm
+    assert scheduler.limits("gemini:ffff0000") == (60, 500)
+    assert scheduler.limits("openai:12345678") == (60, 1000)  # 지정하지 않은 키는 전역 값
+
+
+def test_invalid_key_limits_are_ignored(monkeypatch):
+    monkeypatch.setenv("LLM_KEY_LIMITS", '["gemini:ab12cd34"]')
+    scheduler = LLMScheduler(max_concurrency=1, rpm=60, tpm=0)
+    assert scheduler.key_limits == {}
+    assert scheduler.limits("gemini:ab12cd34") == (60, 0)
+
+
+@pytest.mark.asyncio
+async def test_each_key_is_rate_limited_with_its_own_bucket():
+    scheduler = LLMScheduler(max_concurrency=4, rpm=1, tpm=0,
+                             key_limits={"fast": {"rpm": 600}, "unlimited": {"rpm": 0}})
+    slow = [scheduler.submit("u1", "slow", 10) for _ in range(2)]
+    fast = [scheduler.submit("u2", "fast", 10) for _ in range(2)]
+    free = [scheduler.submit("u3", "unlimited", 10) for _ in range(2)]
+
+    # 전역 한도(분당 1건)의 키는 두 번째 호출부터 기다리지만 다른 키는 자기 한도로 진행
+    assert [ticket.granted for ticket in slow] == [True, False]
+    for ticket in slow[:1] + fast[:1] + free[:1]:
+        scheduler.release(ticket)
+    for _ in range(50):
+        if fast[1].granted:
+            break
+        await asyncio.sleep(0.01)
+    assert fast[1].granted
+    assert not slow[1].granted
+
+    limits = scheduler.stats()["key_limits"]
+    assert limits["slow"] == {"rpm": 1, "tpm": 0}
+    assert limits["fast"] == {"rpm": 600, "tpm": 0}
+    assert limits["unlimited"] == {"rpm": 0, "tpm": 0}
+    for ticket in slow + fast + free:
+        scheduler.release(ticket)
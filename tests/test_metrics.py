@@ -0,0 +1,104 @@
+from fastapi.testclient import TestClient
+
+from metrics import REGISTRY, MetricsRegistry, Trace, current_trace, estimate_tokens, observe
+
+
+def sample_lines(text: str, name: str):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "단계 시간", ("stage",), buckets=(0.1, 1.0, 10.0))
+    for value in (0.05, 0.1, 0.5, 3.0, 30.0):
+        histogram.observe(value, stage="llm_total")
+
+    assert sample_lines(registry.render(), "stage_seconds") == [
+        'stage_seconds_bucket{stage="llm_total",le="0.1"} 2',
+        'stage_seconds_bucket{stage="llm_total",le="1"} 3',
+        'stage_seconds_bucket{stage="llm_total",le="10"} 4',
+        'stage_seconds_bucket{stage="llm_total",le="+Inf"} 5',
+        'stage_seconds_sum{stage="llm_total"} 33.65',
+        'stage_seconds_count{stage="llm_total"} 5',
+    ]
+
+
+def test_histogram_keeps_label_values_apart():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "단계 시간", ("stage",), buckets=(1.0,))
+    histogram.observe(0.5, stage="retrieval")
+    histogram.observe(2.0, stage="llm_total")
+    histogram.observe(2.0, stage="llm_total")
+
+    lines = sample_lines(registry.render(), "stage_seconds_count")
+    assert lines == ['stage_seconds_count{stage="llm_total"} 2', 'stage_seconds_count{stage="retrieval"} 1']
+
+
+def test_render_is_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("tokens_total", "토큰 수", ("direction",)).inc(120, direction="input")
+    registry.counter("fallback_total", "기본 질문 사용").inc()
+    registry.gauge("queue_depth", "대기 중인 호출 수", lambda: 3)
+
+    assert registry.render() == (
+        "# HELP tokens_total 토큰 수\n"
+        "# TYPE tokens_total counter\n"
+        'tokens_total{direction="input"} 120\n'
+        "# HELP fallback_total 기본 질문 사용\n"
+        "# TYPE fallback_total counter\n"
+        "fallback_total 1\n"
+        "# HELP queue_depth 대기 중인 호출 수\n"
+        "# TYPE queue_depth gauge\n"
+        "queue_depth 3\n"
+    )
+
+
+def test_registry_returns_existing_metric_and_skips_failing_gauge():
+    registry = MetricsRegistry()
+    first = registry.counter("retries_total", "재시도", ("reason",))
+    assert registry.counter("retries_total", "재시도", ("reason",)) is first
+
+    def broken():
+        raise RuntimeError("아직 초기화 전")
+    registry.gauge("in_flight", "실행 중", broken)
+    assert "in_flight" not in registry.render()
+
+
+def test_observe_records_histogram_and_current_trace():
+    trace = Trace("s1", turn=3)
+    token = current_trace.set(trace)
+    try:
+        observe("test_stage", 0.002)
+    finally:
+        current_trace.reset(token)
+
+    [span] = trace.spans
+    assert span["stage"] == "test_stage"
+    assert span["duration_ms"] == 2.0
+    assert trace.to_dict()["turn"] == 3
+    assert 'interview_stage_seconds_bucket{stage="test_stage",le="0.005"} 1' in REGISTRY.render()
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert estimate_tokens("가" * 4) == 3  # 한글 한 글자 3바이트
+
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setenv("STARTUP_WARMUP", "false")
+    import backend_api_lite
+
+    with TestClient(backend_api_lite.app) as client:
+        observe("prompt_build", 0.0004)
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert body.endswith("\n")
+    assert "# TYPE interview_stage_seconds histogram" in body
+    assert 'interview_stage_seconds_bucket{stage="prompt_build",le="0.001"}' in body
+    assert 'interview_stage_seconds_bucket{stage="prompt_build",le="+Inf"}' in body
+    assert "# TYPE llm_executor_queue_depth gauge" in body
+    assert "active_websockets 0" in body
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from persistence import Base, SQLAlchemyRepository
+
+PROFILE = {"id": "p1", "type": "science_high", "institution": "과학고", "createdAt": "2026-01-01T09:00:00"}
+
+
+def make_repository(tmp_path, **kwargs) -> SQLAlchemyRepository:
+    """테이블만 만들고 백그라운드 저장 태스크는 띄우지 않음 (테스트가 _flush 를 직접 호출)"""
+    repository = SQLAlchemyRepository("sqlite://", **kwargs)
+    Base.metadata.create_all(repository.engine)
+    repository.dead_letter_path = str(tmp_path / "dead_letter.jsonl")
+    repository.retry_base_delay = 0
+    return repository
+
+
+async def start_interview(repository, session_id="s1", user_id="u1", started_at=None):
+    await repository.record_interview_start(session_id, user_id, PROFILE, started_at or datetime(2026, 1, 1, 9))
+
+
+def record_turns(repository, session_id, count, start=0):
+    for seq in range(start, start + count):
+        repository.record_turn(session_id, seq, "user" if seq % 2 else "assistant", f"턴 {seq}",
+                               f"2026-01-01T09:{seq:02d}:00")
+
+
+@pytest.mark.asyncio
+async def test_turns_are_written_in_batches(tmp_path):
+    repository = make_repository(tmp_path, batch_size=3)
+    await start_interview(repository)
+
+    record_turns(repository, "s1", 7)
+    await repository._flush()
+
+    stats = repository.stats()
+    assert stats["turns_written"] == 7
+    assert stats["batches"] == 3
+    assert stats["pending_turns"] == 0
+    transcript = await repository.get_transcript("s1")
+    assert [turn["content"] for turn in transcript] == [f"턴 {seq}" for seq in range(7)]
+    await repository.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_batch_wakes_flusher(tmp_path):
+    repository = make_repository(tmp_path, batch_size=2, flush_interval=60)
+    repository.start()
+    await start_interview(repository)
+
+    record_turns(repository, "s1", 2)
+    for _ in range(100):
+        if repository.turns_written == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert repository.turns_written == 2
+    await repository.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_buffered_turns(tmp_path):
+    repository = make_repository(tmp_path, batch_size=100, flush_interval=60)
+    repository.start()
+    await start_interview(repository)
+
+    record_turns(repository, "s1", 3)
+    await repository.stop()
+    assert repository.turns_written == 3
+
+
+@pytest.mark.asyncio
+async def test_list_interviews_newest_first_per_user(tmp_path):
+    repository = make_repository(tmp_path)
+    base = datetime(2026, 1, 1, 9)
+    for day in range(5):
+        await start_interview(repository, f"u1-{day}", "u1", base + timedelta(days=day))
+    await start_interview(repository, "u2-0", "u2", base + timedelta(days=10))
+
+    listed = await repository.list_interviews("u1", limit=3)
+    assert [item["session_id"] for item in listed] == ["u1-4", "u1-3", "u1-2"]
+
+    older = await repository.list_interviews("u1", limit=3, before=base + timedelta(days=2))
+    assert [item["session_id"] for item in older] == ["u1-1", "u1-0"]
+    assert [item["session_id"] for item in await repository.list_interviews("u2")] == ["u2-0"]
+    await repository.stop()
+
+
+def test_list_interviews_query_uses_user_started_index():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM interviews WHERE user_id = 'u1' "
+            "AND started_at < '2026-01-02' ORDER BY started_at DESC LIMIT 20"
+        )).fetchall()
+    details = " ".join(str(row[-1]) for row in plan)
+    assert "ix_interviews_user_started" in details
+    assert "TEMP B-TREE" not in details  # 정렬도 인덱스 순서로 처리
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_round_trip(tmp_path):
+    repository = SQLAlchemyRepository(f"sqlite:///{tmp_path / 'donga.db'}")
+    repository.start()
+    await repository.save_profile("p1", "u1", PROFILE)
+    await start_interview(repository)
+    record_turns(repository, "s1", 2)
+    await repository.record_interview_end({"session_id": "s1", "total_exchanges": 1, "duration_minutes": 3})
+    await repository.save_analysis({"job_id": "j1", "session_id": "s1", "status": "done",
+                                    "result": {"score": 87}, "created_at": "2026-01-01T10:00:00"})
+    await repository.stop()
+
+    reopened = SQLAlchemyRepository(f"sqlite:///{tmp_path / 'donga.db'}")
+    reopened.start()
+    assert await reopened.get_profile("p1") == PROFILE
+    transcript = await reopened.get_transcript("s1")
+    assert transcript == [
+        {"role": "assistant", "content": "턴 0", "timestamp": "2026-01-01T09:00:00"},
+        {"role": "user", "content": "턴 1", "timestamp": "2026-01-01T09:01:00"},
+    ]
+    interview = (await reopened.list_interviews("u1"))[0]
+    assert interview["status"] == "ended"
+    assert interview["total_exchanges"] == 1
+    assert interview["duration_minutes"] == 3
+    analysis = await reopened.get_analysis("j1")
+    assert analysis["status"] == "done"
+    assert analysis["result"] == {"score": 87}
+    await reopened.stop()
+
+
+@pytest.mark.asyncio
+async def test_poison_turn_does_not_block_other_turns(tmp_path):
+    repository = make_repository(tmp_path, batch_size=10)
+    await start_interview(repository)
+
+    record_turns(repository, "s1", 2)
+    repository.record_turn("s1", None, "user", "잘못된 턴", "2026-01-01T09:30:00")  # seq NOT NULL 위반
+    record_turns(repository, "s1", 2, start=2)
+    await repository._flush()
+
+    assert repository.stats()["pending_turns"] == 0
+    assert repository.turns_written == 4
+    assert repository.dead_lettered_turns == 1
+    transcript = await repository.get_transcript("s1")
+    assert [turn["content"] for turn in transcript] == ["턴 0", "턴 1", "턴 2", "턴 3"]
+
+    with open(repository.dead_letter_path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 1
+    assert rows[0]["content"] == "잘못된 턴"
+    assert rows[0]["error"].startswith("IntegrityError")
+
+    # 이후 턴은 평소처럼 배치로 저장
+    record_turns(repository, "s1", 1, start=4)
+    await repository._flush()
+    assert repository.turns_written == 5
+    await repository.stop()
+
+
+def operational_error():
+    return sa_exc.OperationalError("INSERT INTO turns", {}, Exception("database is locked"))
+
+
+@pytest.mark.asyncio
+async def test_transient_error_backs_off_and_keeps_turns(tmp_path):
+    repository = make_repository(tmp_path, batch_size=10)
+    repository.retry_base_delay = 60
+    await start_interview(repository)
+    insert_turns = repository._insert_turns
+    calls = []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise operational_error()
+        insert_turns(rows)
+    repository._insert_turns = flaky
+
+    record_turns(repository, "s1", 3)
+    await repository._flush()
+    assert calls == [3]
+    assert repository.stats()["pending_turns"] == 3
+    assert repository.flush_errors == 1
+
+    await repository._flush()  # 백오프 중에는 다시 시도하지 않음
+    assert calls == [3]
+
+    await repository._flush(force=True)
+    assert calls == [3, 3]
+    assert repository.turns_written == 3
+    assert repository.dead_lettered_turns == 0
+    await repository.stop()
+
+
+@pytest.mark.asyncio
+async def test_transient_error_gives_up_after_retry_cap(tmp_path):
+    repository = make_repository(tmp_path, batch_size=2)
+    repository.max_retries = 2
+    await start_interview(repository)
+    insert_turns = repository._insert_turns
+    failing = {"s1"}
+
+    def fail_while_down(rows):
+        if rows[0]["session_id"] in failing:
+            raise operational_error()
+        insert_turns(rows)
+    repository._insert_turns = fail_while_down
+
+    record_turns(repository, "s1", 2)
+    for _ in range(3):
+        await repository._flush(force=True)
+
+    assert repository.dead_lettered_turns == 2
+    assert repository.stats()["pending_turns"] == 0
+    with open(repository.dead_letter_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+    # 포기한 뒤에는 재시도 횟수가 초기화되어 새 턴이 바로 저장됨
+    failing.clear()
+    record_turns(repository, "s1", 2, start=2)
+    await repository._flush(force=True)
+    assert repository.turns_written == 2
+    await repository.stop()
+
+
+def test_alembic_initial_migration_matches_models(tmp_path):
+    from alembic import command
+    from alembic.autogenerate import compare_metadata
+    from alembic.config import Config
+    from alembic.migration import MigrationContext
+
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = Config(os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+    command.downgrade(config, "base")
@@ -0,0 +1,96 @@
+import fakeredis.aioredis
+import pytest
+
+import ai_interviewer_system_lite as interviewer
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile, InterviewSession
+from session_records import Turn
+from session_store import RedisSessionStore
+
+
+def make_profile(**overrides) -> InterviewProfile:
+    data = {
+        "type": "science_high",
+        "institution": "한국과학고",
+        "fields": ["물리"],
+        "keywords": ["센서"],
+        "additionalStyle": "",
+    }
+    data.update(overrides)
+    return InterviewProfile(**data)
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def store(redis_client):
+    return RedisSessionStore(redis_client, InterviewSession, InterviewProfile)
+
+
+@pytest.mark.asyncio
+async def test_session_round_trip(store):
+    session = InterviewSession(session_id="s1", user_id="u1", interview_type="science_high")
+    await store.attach_profile(session, make_profile().model_dump(mode="json"))
+    session.conversation_history.append(Turn("assistant", "자기소개를 해주세요."))
+    await store.save_session(session)
+
+    loaded = await store.get_session("s1")
+    assert loaded.user_id == "u1"
+    assert [turn.content for turn in loaded.conversation_history] == ["자기소개를 해주세요."]
+    assert loaded.personalized_profile["institution"] == "한국과학고"
+    assert await store.count_sessions() == 1
+
+    await store.delete_session("s1")
+    assert await store.get_session("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_sessions_with_same_profile_share_one_blob(store, redis_client):
+    profile = make_profile().model_dump(mode="json")
+    for session_id in ("s1", "s2"):
+        session = InterviewSession(session_id=session_id, user_id="u1", interview_type="science_high")
+        await store.attach_profile(session, profile)
+        await store.save_session(session)
+
+    assert len([key async for key in redis_client.scan_iter(match="donga:session-profile:*")]) == 1
+    assert "institution" not in await redis_client.get("donga:session:s1")
+
+    # 다른 워커(빈 프로필 캐시)도 공유 프로필을 읽어 세션을 복원
+    other = RedisSessionStore(redis_client, InterviewSession, InterviewProfile)
+    loaded = await other.get_session("s2")
+    assert loaded.personalized_profile == (await store.get_session("s1")).personalized_profile
+
+
+@pytest.mark.asyncio
+async def test_profile_round_trip(store):
+    await store.save_profile("p1", make_profile())
+    assert (await store.get_profile("p1")).institution == "한국과학고"
+    assert await store.get_profile("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_two_orchestrators_continue_the_same_session(monkeypatch, redis_client):
+    monkeypatch.setattr(
+        interviewer, "create_session_store",
+        lambda session_model, profile_model: RedisSessionStore(redis_client, session_model, profile_model)
+    )
+    first, second = InterviewOrchestrator(), InterviewOrchestrator()
+    profile = make_profile()
+
+    await first.save_profile("p1", profile)
+    assert (await second.get_profile("p1")).institution == profile.institution
+
+    opening = await first.start_personalized_interview("s1", "u1", profile)
+    reply = await second.process_response("s1", "로봇 대회에서 센서 보정을 맡았습니다.")
+    await first.process_response("s1", "온도에 따라 값이 달라져서 보정표를 만들었습니다.")
+
+    session = await second.session_store.get_session("s1")
+    assert [turn.role for turn in session.conversation_history] == ["assistant", "user", "assistant", "user", "assistant"]
+    assert session.conversation_history[0].content == opening
+    assert session.conversation_history[2].content == reply
+
+    result = await second.end_interview("s1")
+    assert result["total_exchanges"] == 2
+    assert await first.session_store.get_session("s1") is None
@@ -0,0 +1,183 @@
+import math
+
+import numpy as np
+import pytest
+
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile
+from metrics import RESPONSE_CACHE_TOTAL
+from response_cache import SemanticResponseCache
+
+
+def unit(degrees: float) -> np.ndarray:
+    radians = math.radians(degrees)
+    return np.array([math.cos(radians), math.sin(radians)], dtype=np.float32)
+
+
+# 답변 -> 임베딩 (기준 답변과의 코사인 유사도: cos(각도))
+VECTORS = {
+    "물 로켓 실험": unit(0),
+    "물 로켓으로 실험": unit(15),   # 0.966
+    "물 로켓을 쏘아 봄": unit(30),  # 0.866
+    "전혀 다른 답변": unit(90),
+}
+
+
+def make_cache(**settings) -> SemanticResponseCache:
+    cache = SemanticResponseCache(lambda texts: np.stack([VECTORS[text] for text in texts]))
+    cache.threshold = 0.92
+    for name, value in settings.items():
+        setattr(cache, name, value)
+    return cache
+
+
+async def store(cache: SemanticResponseCache, prefix: str, answer: str, reply: str):
+    query, _ = await cache.lookup(prefix, answer)
+    cache.store(query, reply)
+
+
+@pytest.mark.asyncio
+async def test_similar_answer_above_threshold_hits():
+    cache = make_cache()
+    await store(cache, "p", "물 로켓 실험", "각도는 어떻게 정했나요?")
+
+    assert (await cache.lookup("p", "물 로켓으로 실험"))[1] == "각도는 어떻게 정했나요?"
+    assert (await cache.lookup("p", "물 로켓을 쏘아 봄"))[1] is None
+    assert (await cache.lookup("p", "전혀 다른 답변"))[1] is None
+    # 공백만 다른 답변은 같은 답변
+    assert (await cache.lookup("p", "  물 로켓   실험 "))[1] == "각도는 어떻게 정했나요?"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 3)  # 저장 전 조회 포함
+
+
+@pytest.mark.asyncio
+async def test_lower_threshold_accepts_looser_matches():
+    cache = make_cache(threshold=0.85)
+    await store(cache, "p", "물 로켓 실험", "질문")
+    assert (await cache.lookup("p", "물 로켓을 쏘아 봄"))[1] == "질문"
+
+
+@pytest.mark.asyncio
+async def test_best_match_wins():
+    cache = make_cache(threshold=0.8)
+    await store(cache, "p", "물 로켓을 쏘아 봄", "먼 답변의 질문")
+    await store(cache, "p", "물 로켓으로 실험", "가까운 답변의 질문")
+    assert (await cache.lookup("p", "물 로켓 실험"))[1] == "가까운 답변의 질문"
+
+
+@pytest.mark.asyncio
+async def test_same_answer_with_different_prefix_misses():
+    cache = make_cache()
+    await store(cache, "p1", "물 로켓 실험", "질문")
+    assert (await cache.lookup("p2", "물 로켓 실험"))[1] is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_removed():
+    cache = make_cache(ttl=60)
+    await store(cache, "p", "물 로켓 실험", "질문")
+    next(iter(cache._entries.values())).created -= 61
+
+    assert (await cache.lookup("p", "물 로켓 실험"))[1] is None
+    stats = cache.stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+    assert stats["prefixes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    await store(cache, "a", "물 로켓 실험", "A")
+    await store(cache, "b", "물 로켓 실험", "B")
+    assert (await cache.lookup("a", "물 로켓 실험"))[1] == "A"  # a 를 최근 사용으로
+
+    await store(cache, "c", "물 로켓 실험", "C")
+    assert (await cache.lookup("b", "물 로켓 실험"))[1] is None
+    assert (await cache.lookup("a", "물 로켓 실험"))[1] == "A"
+    assert (await cache.lookup("c", "물 로켓 실험"))[1] == "C"
+
+
+@pytest.mark.asyncio
+async def test_entries_per_prefix_are_capped():
+    cache = make_cache(max_per_prefix=1)
+    await store(cache, "p", "물 로켓 실험", "첫 번째")
+    await store(cache, "p", "전혀 다른 답변", "두 번째")
+    assert cache.stats()["entries"] == 1
+    assert (await cache.lookup("p", "물 로켓 실험"))[1] is None
+
+
+def test_prefix_key_covers_instruction_history_and_documents():
+    messages = [{"role": "assistant", "content": "자기소개 해주세요."}]
+    key = SemanticResponseCache.prefix_key("지시문", messages, "doc1")
+    assert key == SemanticResponseCache.prefix_key("지시문", list(messages), "doc1")
+    assert key != SemanticResponseCache.prefix_key("다른 지시문", messages, "doc1")
+    assert key != SemanticResponseCache.prefix_key("지시문", messages + [{"role": "user", "content": "네"}], "doc1")
+    assert key != SemanticResponseCache.prefix_key("지시문", messages, "doc2")
+
+
+# 오케스트레이터 - 반복 연습 모드 세션
+
+ANSWER = "저는 과학 동아리에서 물 로켓의 발사 각도와 비행 거리의 관계를 실험했습니다."
+
+
+def make_profile(institution: str = "한국과학고") -> InterviewProfile:
+    return InterviewProfile(type="science_high", institution=institution, fields=["물리"], keywords=[],
+                            additionalStyle="", responseCache=True)
+
+
+def count_llm_calls(orchestrator: InterviewOrchestrator) -> list:
+    calls = []
+    backend = orchestrator.llm.backend
+    generate = backend.generate
+
+    async def counting(messages, system_instruction=None):
+        calls.append(messages)
+        return await generate(messages, system_instruction)
+
+    backend.generate = counting
+    return calls
+
+
+def cache_outcome(outcome: str) -> float:
+    return RESPONSE_CACHE_TOTAL._values.get((outcome,), 0.0)
+
+
+@pytest.mark.asyncio
+async def test_same_flow_hits_and_different_prefix_misses():
+    orchestrator = InterviewOrchestrator()
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    await orchestrator.start_personalized_interview("s2", "u2", make_profile())
+    await orchestrator.start_personalized_interview("s3", "u3", make_profile("다른과학고"))
+    calls = count_llm_calls(orchestrator)
+
+    first = await orchestrator.process_response("s1", ANSWER)
+    assert len(calls) == 1
+    # 같은 프로필로 시작한 면접의 같은 첫 답변은 저장된 응답 재사용
+    assert await orchestrator.process_response("s2", ANSWER) == first
+    assert len(calls) == 1
+    # 기관이 달라 앞부분(대화 이력)이 다르면 LLM 호출
+    await orchestrator.process_response("s3", ANSWER)
+    assert len(calls) == 2
+
+    stats = orchestrator.response_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_cache_error_falls_back_to_llm():
+    orchestrator = InterviewOrchestrator()
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    calls = count_llm_calls(orchestrator)
+
+    def broken(texts):
+        raise RuntimeError("임베딩 모델 로드 실패")
+    orchestrator.response_cache.encode = broken
+    errors = cache_outcome("error")
+
+    reply = await orchestrator.process_response("s1", ANSWER)
+    assert reply and not reply.startswith("❌")
+    assert len(calls) == 1
+    assert cache_outcome("error") == errors + 1
+    assert orchestrator.response_cache.stats()["entries"] == 0
+    session = await orchestrator.session_store.get_session("s1")
+    assert [turn.role for turn in session.conversation_history][-2:] == ["user", "assistant"]
@@ -0,0 +1,92 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from retrieval_index import DocumentIndex, HashingEmbedder, RetrievalIndex, chunk_text
+
+
+class CountingEmbedder(HashingEmbedder):
+    """해싱 임베딩 + 호출 횟수 기록"""
+
+    def __init__(self):
+        super().__init__(dim=256)
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return super().encode(texts)
+
+
+def test_chunks_respect_size_and_keep_overlap():
+    text = " ".join(f"{i}번째 문장은 실험 과정을 설명합니다." for i in range(40))
+    chunks = chunk_text(text, size=120, overlap=30)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    # 다음 조각은 앞 조각의 끝부분으로 시작
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.startswith(previous[-30:].strip())
+
+
+def test_sentence_longer_than_chunk_is_split_by_characters():
+    chunks = chunk_text("가" * 250, size=100, overlap=20)
+    assert [len(chunk) for chunk in chunks] == [100, 100, 90]
+
+
+def test_search_returns_top_k_in_score_order_above_min_score():
+    matrix = np.eye(4, dtype=np.float32)
+    index = DocumentIndex([("a", "0"), ("a", "1"), ("b", "2"), ("b", "3")], matrix)
+    query = np.array([0.1, 0.9, 0.5, 0.0], dtype=np.float32)
+
+    assert [hit["text"] for hit in index.search(query, k=2, min_score=0.0)] == ["1", "2"]
+    assert [hit["text"] for hit in index.search(query, k=4, min_score=0.2)] == ["1", "2"]
+    assert DocumentIndex([], np.zeros((0, 1), dtype=np.float32)).search(query, 3, 0.0) == []
+
+
+def test_index_key_ignores_order_and_missing_ids():
+    assert RetrievalIndex.index_key(["b", "a", None]) == RetrievalIndex.index_key(["a", "b"])
+    assert RetrievalIndex.index_key([None, ""]) is None
+
+
+@pytest.mark.asyncio
+async def test_query_finds_the_chunk_related_to_the_answer():
+    retrieval = RetrievalIndex(CountingEmbedder())
+    retrieval.chunk_chars, retrieval.chunk_overlap, retrieval.min_score = 60, 0, 0.0
+    documents = [("보고서.txt", "물 로켓의 발사 각도를 바꿔가며 비행 거리를 측정했습니다.\n"
+                               "도서관 봉사활동에서 어린이 과학 교실을 운영했습니다.\n"
+                               "아두이노로 온도 센서를 보정하는 프로그램을 만들었습니다.")]
+    key = RetrievalIndex.index_key(["f1"])
+    await retrieval.build(key, documents)
+
+    hits = await retrieval.query(key, "온도 센서 보정은 어떻게 하셨나요?", k=1)
+    assert [hit["text"] for hit in hits] == ["아두이노로 온도 센서를 보정하는 프로그램을 만들었습니다."]
+    assert hits[0]["name"] == "보고서.txt"
+    assert await retrieval.query(None, "센서") == []
+    assert await retrieval.query(key, "   ") == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_builds_of_the_same_key_share_one_index():
+    embedder = CountingEmbedder()
+    retrieval = RetrievalIndex(embedder)
+    documents = [("a.txt", "첫 번째 문서입니다.")]
+
+    first, second = await asyncio.gather(retrieval.build("k", documents), retrieval.build("k", documents))
+    assert first is second
+    assert await retrieval.build("k", documents) is first
+    assert embedder.calls == 1
+    assert retrieval.stats()["builds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_index_is_evicted():
+    retrieval = RetrievalIndex(CountingEmbedder())
+    retrieval.max_indexes = 2
+    for key in ("k1", "k2"):
+        await retrieval.build(key, [(key, f"{key} 문서의 내용입니다.")])
+    await retrieval.query("k1", "문서")
+    await retrieval.build("k3", [("k3", "k3 문서의 내용입니다.")])
+
+    assert retrieval.has("k1") and retrieval.has("k3")
+    assert not retrieval.has("k2")
@@ -0,0 +1,112 @@
+import json
+import sys
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from ai_interviewer_system_lite import InterviewSession
+from session_records import ProfileRegistry, Turn
+from session_store import InMemorySessionStore
+
+PROFILE = {"type": "science_high", "institution": "한국과학고", "fields": ["물리"], "keywords": ["센서"]}
+
+
+def make_session(session_id: str = "s1") -> InterviewSession:
+    session = InterviewSession(session_id=session_id, user_id="u1", interview_type="science_high")
+    session.conversation_history.append(Turn("assistant", "자기소개 해주세요.", 1700000000.0))
+    session.conversation_history.append(Turn("user", "안녕하세요, 지원자입니다.", 1700000012.5))
+    return session
+
+
+def test_turns_are_stored_as_role_content_ts_arrays():
+    data = json.loads(make_session().model_dump_json())
+    assert data["conversation_history"] == [
+        ["assistant", "자기소개 해주세요.", 1700000000.0],
+        ["user", "안녕하세요, 지원자입니다.", 1700000012.5],
+    ]
+
+
+def test_session_round_trip_keeps_turns():
+    session = make_session()
+    restored = InterviewSession.model_validate_json(session.model_dump_json())
+    assert restored.conversation_history == session.conversation_history
+    assert all(isinstance(turn, Turn) for turn in restored.conversation_history)
+
+
+def test_legacy_dict_turns_are_accepted():
+    timestamp = datetime(2026, 1, 1, 9, 30).isoformat()
+    session = InterviewSession.model_validate({
+        "session_id": "s1", "user_id": "u1", "interview_type": "science_high",
+        "conversation_history": [{"role": "user", "content": "예전 형식", "timestamp": timestamp}],
+    })
+    [turn] = session.conversation_history
+    assert turn.role == "user"
+    assert turn["timestamp"] == timestamp
+
+
+def test_invalid_turn_is_rejected():
+    with pytest.raises(ValidationError):
+        InterviewSession.model_validate({
+            "session_id": "s1", "user_id": "u1", "interview_type": "science_high",
+            "conversation_history": [["user", "시각 없음"]],
+        })
+
+
+def test_turn_reads_like_a_dict():
+    turn = Turn("user", "답변", 1700000000.0)
+    assert turn["role"] == "user"
+    assert turn["content"] == "답변"
+    assert turn["timestamp"] == datetime.fromtimestamp(1700000000.0).isoformat()
+    assert turn.get("missing", "기본값") == "기본값"
+    with pytest.raises(KeyError):
+        turn["ts"]
+    assert turn.to_dict() == {"role": "user", "content": "답변", "timestamp": turn.timestamp}
+
+
+def test_turn_has_no_instance_dict_and_shares_role_strings():
+    role = "".join(["assis", "tant"])
+    turn = Turn(role, "질문")
+    assert not hasattr(turn, "__dict__")
+    assert turn.role is sys.intern("assistant")
+    assert Turn.parse(["assistant", "질문", 1.0]).role is turn.role
+
+
+def test_same_profile_content_is_interned_once():
+    registry = ProfileRegistry()
+    key, first = registry.intern(dict(PROFILE))
+    same_key, second = registry.intern({name: PROFILE[name] for name in reversed(list(PROFILE))})
+
+    assert same_key == key  # 키 순서와 무관
+    assert second is first
+    other_key, other = registry.intern({**PROFILE, "institution": "다른과학고"})
+    assert other_key != key and other is not first
+    assert registry.stats() == {"profiles": 2, "added": 2, "shared": 1}
+
+
+def test_least_recently_used_profile_is_dropped_but_references_survive():
+    registry = ProfileRegistry(max_profiles=2)
+    key_a, profile_a = registry.intern({**PROFILE, "institution": "A"})
+    key_b, _ = registry.intern({**PROFILE, "institution": "B"})
+    assert registry.get(key_a) is profile_a  # A 를 최근 사용으로
+
+    registry.intern({**PROFILE, "institution": "C"})
+    assert registry.get(key_b) is None
+    assert registry.get(key_a) is profile_a
+    # 목록에서 빠져도 세션이 가진 참조는 그대로
+    assert profile_a["institution"] == "A"
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_one_profile_and_store_only_its_key():
+    store = InMemorySessionStore()
+    first, second = make_session("s1"), make_session("s2")
+    await store.attach_profile(first, dict(PROFILE))
+    await store.attach_profile(second, json.loads(json.dumps(PROFILE)))
+
+    assert first.personalized_profile is second.personalized_profile
+    assert first.profile_key == second.profile_key == ProfileRegistry.key_for(PROFILE)
+    data = json.loads(first.model_dump_json())
+    assert data["profile_key"] == first.profile_key
+    assert "한국과학고" not in json.dumps(data, ensure_ascii=False)
+    assert store.stats()["shared_profiles"]["shared"] == 1
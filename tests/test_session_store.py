@@ -0,0 +1,98 @@
+import pytest
+
+from ai_interviewer_system_lite import InterviewSession
+from session_records import Turn
+from session_store import InMemorySessionStore
+
+
+def make_session(session_id: str, turns: int = 1) -> InterviewSession:
+    session = InterviewSession(session_id=session_id, user_id="u1", interview_type="science_high")
+    for index in range(turns):
+        session.conversation_history.append(Turn("assistant" if index % 2 == 0 else "user", "답변 " * 50))
+    return session
+
+
+def expire(store: InMemorySessionStore, session_id: str):
+    """마지막 접근 시각을 idle_ttl 보다 이전으로 돌림"""
+    store._last_access[session_id] -= store.idle_ttl + 1
+
+
+@pytest.mark.asyncio
+async def test_idle_session_expires_on_get():
+    store = InMemorySessionStore(idle_ttl=60)
+    evicted = []
+    store.on_evict = evicted.append
+    await store.save_session(make_session("s1"))
+
+    expire(store, "s1")
+    assert await store.get_session("s1") is None
+    assert evicted == ["s1"]
+    assert store.stats()["evicted_idle"] == 1
+    assert store.stats()["estimated_bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_only_idle_sessions():
+    store = InMemorySessionStore(idle_ttl=60)
+    for session_id in ("s1", "s2", "s3"):
+        await store.save_session(make_session(session_id))
+    expire(store, "s1")
+    expire(store, "s2")
+
+    assert await store.sweep() == 2
+    assert list(store.sessions) == ["s3"]
+    assert store.stats()["evicted_idle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_refreshes_idle_deadline():
+    store = InMemorySessionStore(idle_ttl=60)
+    await store.save_session(make_session("s1"))
+    store._last_access["s1"] -= 50
+
+    assert await store.get_session("s1") is not None
+    store._last_access["s1"] -= 50
+    assert await store.get_session("s1") is not None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_session_is_evicted_over_count_limit():
+    store = InMemorySessionStore(idle_ttl=60, max_sessions=2)
+    evicted = []
+    store.on_evict = evicted.append
+    await store.save_session(make_session("s1"))
+    await store.save_session(make_session("s2"))
+    # s1 을 다시 사용했으므로 가장 오래 사용하지 않은 세션은 s2
+    await store.get_session("s1")
+    await store.save_session(make_session("s3"))
+
+    assert list(store.sessions) == ["s1", "s3"]
+    assert evicted == ["s2"]
+    assert store.stats()["evicted_lru"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_evicted_over_byte_budget_but_newest_is_kept():
+    one_session = InMemorySessionStore(idle_ttl=60)
+    await one_session.save_session(make_session("probe", turns=4))
+    budget = one_session.stats()["estimated_bytes"] * 2
+
+    store = InMemorySessionStore(idle_ttl=60, max_bytes=budget)
+    for session_id in ("s1", "s2", "s3"):
+        await store.save_session(make_session(session_id, turns=4))
+    assert list(store.sessions) == ["s2", "s3"]
+    assert store.stats()["estimated_bytes"] <= budget
+
+    # 한 세션만으로 한도를 넘어도 방금 저장한 세션은 축출하지 않음
+    await store.save_session(make_session("big", turns=40))
+    assert list(store.sessions) == ["big"]
+
+
+@pytest.mark.asyncio
+async def test_delete_does_not_count_as_eviction():
+    store = InMemorySessionStore(idle_ttl=60)
+    await store.save_session(make_session("s1"))
+    await store.delete_session("s1")
+
+    assert await store.count_sessions() == 0
+    assert store.stats()["evicted_idle"] == store.stats()["evicted_lru"] == 0
@@ -0,0 +1,83 @@
+import asyncio
+import importlib.util
+import os
+import statistics
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_import_time_benchmark():
+    spec = importlib.util.spec_from_file_location("import_time", os.path.join(ROOT, "benchmarks", "import_time.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_backend_import_is_within_budget_and_lazy():
+    benchmark = load_import_time_benchmark()
+    env = {**os.environ, "LLM_BACKEND": "fake", "PYTHONDONTWRITEBYTECODE": "1"}
+    benchmark.run_once(env)  # 바이트코드 컴파일이 섞일 수 있는 첫 실행은 버림
+    runs = [benchmark.run_once(env) for _ in range(3)]
+
+    loaded = sorted({name for _, names, _ in runs for name in names})
+    assert loaded == [], f"import 시점에 불러온 무거운 모듈: {loaded}"
+    assert "google.generativeai" in benchmark.FORBIDDEN
+    median = statistics.median(elapsed for elapsed, _, _ in runs)
+    budget = float(os.getenv('IMPORT_BUDGET_MS', 800))
+    assert median < budget, f"import backend_api_lite {median:.1f}ms > {budget:.0f}ms"
+
+
+def slow_warm_up(gate: threading.Event, fail: bool = False):
+    async def warm_up(self):
+        while not gate.is_set():
+            await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("임베딩 모델 다운로드 실패")
+        return {"prompts_ms": 0.0}
+    return warm_up
+
+
+def wait_ready(client: TestClient):
+    for _ in range(200):
+        response = client.get("/api/health/ready")
+        if response.status_code == 200:
+            return response
+        client.portal.call(asyncio.sleep, 0.01)
+    return response
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_ready_only_after_warm_up(monkeypatch, fail):
+    import ai_interviewer_system_lite
+    import backend_api_lite
+
+    gate = threading.Event()
+    monkeypatch.setenv("STARTUP_WARMUP", "true")
+    monkeypatch.setattr(ai_interviewer_system_lite.InterviewOrchestrator, "warm_up", slow_warm_up(gate, fail))
+
+    with TestClient(backend_api_lite.app) as client:
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+        assert response.headers["retry-after"] == "1"
+        # 프로세스는 살아 있고 헬스 체크도 준비 전임을 알림
+        assert client.get("/api/health/live").status_code == 200
+        assert client.get("/api/health").json()["ready"] is False
+
+        gate.set()
+        response = wait_ready(client)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        if fail:
+            # warm-up 이 실패해도 첫 요청에서 다시 준비하므로 요청은 받음
+            assert "임베딩 모델" in body["warmup_error"]
+        else:
+            assert body["warmup"] == {"prompts_ms": 0.0}
+
+    assert backend_api_lite.readiness["ready"] is False
+    backend_api_lite.readiness.pop("warmup_error", None)
@@ -0,0 +1,64 @@
+import pytest
+
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile
+
+ANSWERS = [
+    "로봇 대회에서 센서 보정을 맡아 온도에 따른 오차를 줄였습니다.",
+    "실험을 반복하면서 측정값을 표로 정리해 보정식을 만들었습니다.",
+]
+
+
+async def start_interview() -> InterviewOrchestrator:
+    """답변 두 번까지 진행한 면접 (대화 이력 5턴)"""
+    orchestrator = InterviewOrchestrator()
+    profile = InterviewProfile(type="science_high", institution="한국과학고", fields=["물리"],
+                               keywords=["센서"], additionalStyle="")
+    await orchestrator.start_personalized_interview("s1", "u1", profile)
+    for answer in ANSWERS:
+        await orchestrator.process_turn("s1", answer)
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_process_turn_returns_the_turn_number():
+    interview = await start_interview()
+    result = await interview.process_turn("s1", "다음에는 습도도 함께 측정해 보고 싶습니다.")
+
+    assert result["seq"] == 7
+    turns = (await interview.get_turns_since("s1", 6))["turns"]
+    assert [(turn["seq"], turn["role"], turn["content"]) for turn in turns] == [(7, "assistant", result["content"])]
+
+
+@pytest.mark.asyncio
+async def test_only_missed_turns_are_replayed():
+    interview = await start_interview()
+    replay = await interview.get_turns_since("s1", 3)
+
+    assert replay["reset"] is False
+    assert replay["seq"] == 5
+    assert [(turn["seq"], turn["role"]) for turn in replay["turns"]] == [(4, "user"), (5, "assistant")]
+    assert replay["turns"][0]["content"] == ANSWERS[1]
+
+
+@pytest.mark.asyncio
+async def test_up_to_date_client_gets_no_turns():
+    interview = await start_interview()
+    replay = await interview.get_turns_since("s1", 5)
+    assert replay == {"seq": 5, "turns": [], "reset": False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("last_seq", [6, 99, -1])
+async def test_unknown_position_resets_to_full_history(last_seq):
+    interview = await start_interview()
+    replay = await interview.get_turns_since("s1", last_seq)
+
+    assert replay["reset"] is True
+    assert [turn["seq"] for turn in replay["turns"]] == [1, 2, 3, 4, 5]
+    assert replay["turns"][1]["content"] == ANSWERS[0]
+
+
+@pytest.mark.asyncio
+async def test_missing_session_returns_none():
+    interview = await start_interview()
+    assert await interview.get_turns_since("missing", 0) is None
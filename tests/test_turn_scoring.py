@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from ai_interviewer_system_lite import InterviewOrchestrator, InterviewProfile
+from turn_scoring import add_to_totals, aggregate_scores, compose_feedback, parse_turn_score
+
+AREAS = ["논리성", "창의성"]
+ANSWERS = [
+    "저는 과학 동아리에서 물 로켓의 발사 각도와 비행 거리의 관계를 실험했습니다.",
+    "각도를 5도씩 바꿔가며 세 번씩 발사해 평균 거리를 비교했습니다.",
+    "45도 근처에서 가장 멀리 날았지만 바람 때문에 측정값의 편차가 컸습니다.",
+]
+
+
+def test_parse_turn_score_reads_fenced_json_and_clamps_invalid_scores():
+    text = '채점 결과입니다.\n```json\n{"scores": {"논리성": "4", "창의성": 9}, "comment": " 근거가 분명함 "}\n```'
+    assert parse_turn_score(text, AREAS) == {"scores": {"논리성": 4, "창의성": None}, "comment": "근거가 분명함"}
+
+
+@pytest.mark.parametrize("text", ["점수 없음", '{"comment": "없음"}', '{"scores": {"논리성": null, "창의성": true}}'])
+def test_parse_turn_score_rejects_unscored_output(text):
+    with pytest.raises(ValueError):
+        parse_turn_score(text, AREAS)
+
+
+def test_totals_skip_unrated_areas_and_average_per_area():
+    totals = {}
+    add_to_totals(totals, {"논리성": 4, "창의성": None})
+    add_to_totals(totals, {"논리성": 3, "창의성": 5})
+    assert totals == {"논리성": [7.0, 2], "창의성": [5.0, 1]}
+
+    aggregate = aggregate_scores(totals, AREAS + ["협업"], scored_turns=2)
+    assert aggregate["areas"] == {"논리성": 3.5, "창의성": 5.0, "협업": None}
+    assert aggregate["overall"] == 4.25
+    assert aggregate["scored_turns"] == 2
+
+
+def test_feedback_without_scores_keeps_basic_feedback():
+    aggregate = aggregate_scores({}, AREAS, scored_turns=0)
+    assert aggregate["overall"] is None
+    feedback = compose_feedback(aggregate, [], "답변이 짧습니다.")
+    assert feedback.startswith("채점된 답변이 없어")
+    assert feedback.endswith("답변이 짧습니다.")
+
+
+def test_feedback_lists_strengths_and_turn_comments():
+    aggregate = aggregate_scores({"논리성": [9.0, 2], "창의성": [4.0, 2]}, AREAS, scored_turns=2)
+    feedback = compose_feedback(aggregate, [{"turn": 1, "comment": "구체적임"}, {"turn": 2, "comment": ""}])
+    assert "**논리성**: 4.5 / 5" in feedback
+    assert "**강점**: 논리성 / **보완할 점**: 창의성" in feedback
+    assert "1. 구체적임" in feedback
+    assert "2. " not in feedback
+
+
+# 오케스트레이터 - 답변마다 백그라운드 채점, 종료 시 누적값 집계
+
+def make_orchestrator():
+    orchestrator = InterviewOrchestrator()
+    orchestrator.turn_scoring_enabled = True
+    backend = orchestrator.llm.backend
+    generate_json = backend.generate_json
+    scored = []
+    gate = asyncio.Event()
+    gate.set()
+
+    async def scoring(messages, schema, system_instruction=None):
+        await gate.wait()
+        scored.append(messages[-1]["content"])
+        return await generate_json(messages, schema, system_instruction)
+
+    backend.generate_json = scoring
+    return orchestrator, scored, gate
+
+
+def make_profile() -> InterviewProfile:
+    return InterviewProfile(type="science_high", institution="한국과학고", fields=["물리"], keywords=[],
+                            additionalStyle="")
+
+
+async def wait_for_scoring(orchestrator: InterviewOrchestrator):
+    while orchestrator._scoring_tasks:
+        await asyncio.gather(*orchestrator._scoring_tasks.values())
+
+
+@pytest.mark.asyncio
+async def test_answers_are_scored_incrementally():
+    orchestrator, scored, _ = make_orchestrator()
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+
+    for count, answer in enumerate(ANSWERS, start=1):
+        await orchestrator.process_response("s1", answer)
+        await wait_for_scoring(orchestrator)
+        session = await orchestrator.session_store.get_session("s1")
+        assert session.scored_answers == count
+        assert [entry["turn"] for entry in session.turn_scores] == list(range(1, count + 1))
+    # 답변마다 한 번씩만 채점
+    assert len(scored) == len(ANSWERS)
+
+    session = await orchestrator.session_store.get_session("s1")
+    expected = {}
+    for entry in session.turn_scores:
+        add_to_totals(expected, entry["scores"])
+    assert session.score_totals == expected
+
+    result = await orchestrator.end_interview("s1")
+    assert len(scored) == len(ANSWERS)  # 종료 시 다시 채점하지 않음
+    assert result["scores"]["scored_turns"] == len(ANSWERS)
+    focus_areas = orchestrator.personalized_prompt_manager.get_focus_areas("science_high")
+    assert result["scores"] == aggregate_scores(expected, focus_areas, len(ANSWERS))
+    assert "**전체 평균**" in result["ai_feedback"]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_scoring_is_cancelled_and_finished_at_interview_end():
+    orchestrator, scored, gate = make_orchestrator()
+    await orchestrator.start_personalized_interview("s1", "u1", make_profile())
+    await orchestrator.process_response("s1", ANSWERS[0])
+    await wait_for_scoring(orchestrator)
+
+    gate.clear()  # 두 번째 답변 채점이 LLM 응답을 기다리는 중에 면접 종료
+    await orchestrator.process_response("s1", ANSWERS[1])
+    task = orchestrator._scoring_tasks["s1"]
+    await asyncio.sleep(0.01)
+    assert not task.done()
+
+    snapshot = await orchestrator.finish_interview("s1")
+    assert task.cancelled() or task.cancelling()
+    assert "s1" not in orchestrator._scoring_tasks
+    assert snapshot["scored_answers"] == 1
+
+    gate.set()
+    result = await orchestrator.analyze_interview(snapshot)
+    # 취소된 채점은 반영되지 않고, 남은 답변만 종료 시 채점
+    assert [entry["turn"] for entry in result["turn_scores"]] == [1, 2]
+    assert result["scores"]["scored_turns"] == 2
+    assert len(scored) == 2
+    assert task.cancelled()
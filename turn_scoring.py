@@ -0,0 +1,128 @@
+import json
+import re
+from typing import Dict, List, Optional
+
+# 평가 영역별 점수 범위
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def score_schema(focus_areas: List[str]) -> Dict:
+    """한 답변의 평가 결과 JSON Schema - 영역별 1~5점(판단할 근거가 없으면 null)과 짧은 평"""
+    return {
+        "type": "object",
+        "properties": {
+            "scores": {
+                "type": "object",
+                "properties": {
+                    area: {"type": ["integer", "null"], "minimum": MIN_SCORE, "maximum": MAX_SCORE}
+                    for area in focus_areas
+                },
+                "required": list(focus_areas),
+            },
+            "comment": {"type": "string"},
+        },
+        "required": ["scores", "comment"],
+    }
+
+
+def build_scoring_prompt(focus_areas: List[str], question: str, answer: str) -> str:
+    """면접관 질문과 지원자 답변 한 쌍을 평가 영역별로 채점하는 프롬프트"""
+    return f"""
+        다음은 면접 중 면접관의 질문 하나와 그에 대한 지원자의 답변입니다.
+
+        면접관: {question}
+        지원자: {answer}
+
+        이 답변만 보고 평가 영역({", ".join(focus_areas)})별로 {MIN_SCORE}~{MAX_SCORE}점을 매기고,
+        답변에서 판단할 근거가 없는 영역은 null 로 두세요. comment 에는 이 답변의 강점이나
+        보완할 점을 한 문장으로 적어주세요.
+
+        다른 설명 없이 아래 JSON Schema 를 따르는 JSON 하나만 출력하세요:
+        {json.dumps(score_schema(focus_areas), ensure_ascii=False)}
+        """
+
+
+def parse_turn_score(text: str, focus_areas: List[str]) -> Dict:
+    """LLM 출력에서 {"scores": {영역: 점수 또는 None}, "comment": 평} 추출
+
+    코드 블록(```json)이나 앞뒤 설명이 붙어 있어도 첫 JSON 객체를 읽고, 범위를 벗어나거나
+    숫자가 아닌 점수는 None 으로 둡니다. 채점된 영역이 하나도 없으면 ValueError.
+    """
+    match = _JSON_OBJECT.search(text or "")
+    if not match:
+        raise ValueError("채점 결과에서 JSON 을 찾을 수 없습니다.")
+    data = json.loads(match.group(0))
+    raw_scores = data.get("scores") if isinstance(data, dict) else None
+    if not isinstance(raw_scores, dict):
+        raise ValueError("채점 결과에 scores 항목이 없습니다.")
+
+    scores: Dict[str, Optional[int]] = {}
+    for area in focus_areas:
+        value = raw_scores.get(area)
+        if isinstance(value, str) and value.strip().isdigit():
+            value = int(value.strip())
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and MIN_SCORE <= value <= MAX_SCORE:
+            scores[area] = int(round(value))
+        else:
+            scores[area] = None
+    if all(value is None for value in scores.values()):
+        raise ValueError("채점된 평가 영역이 없습니다.")
+    return {"scores": scores, "comment": str(data.get("comment") or "").strip()}
+
+
+def add_to_totals(totals: Dict[str, List[float]], scores: Dict[str, Optional[int]]):
+    """영역별 누적 [합계, 채점 수]에 한 답변의 점수 반영"""
+    for area, value in scores.items():
+        if value is None:
+            continue
+        total = totals.setdefault(area, [0.0, 0])
+        total[0] += value
+        total[1] += 1
+
+
+def aggregate_scores(totals: Dict[str, List[float]], focus_areas: List[str], scored_turns: int) -> Dict:
+    """누적값으로 영역별 평균과 전체 평균 계산 (답변 수와 무관하게 영역 수만큼만 계산)"""
+    areas = {}
+    for area in focus_areas:
+        total, count = totals.get(area, (0.0, 0))
+        areas[area] = round(total / count, 2) if count else None
+    rated = [value for value in areas.values() if value is not None]
+    return {
+        "areas": areas,
+        "overall": round(sum(rated) / len(rated), 2) if rated else None,
+        "scale": [MIN_SCORE, MAX_SCORE],
+        "scored_turns": scored_turns,
+    }
+
+
+def compose_feedback(aggregate: Dict, turn_scores: List[Dict], basic_feedback: Optional[str] = None) -> str:
+    """영역별 평균 점수, 답변별 평과 (있으면) 답변 사전 분석 기반 기본 피드백으로 면접 분석 결과 텍스트 구성"""
+    if aggregate["overall"] is None:
+        message = "채점된 답변이 없어 영역별 평가를 만들지 못했습니다. 더 구체적인 답변으로 면접을 진행해보세요."
+        return f"{message}\n\n{basic_feedback}" if basic_feedback else message
+
+    rated = {area: value for area, value in aggregate["areas"].items() if value is not None}
+    lines = ["**면접 분석 결과**", ""]
+    for area, value in aggregate["areas"].items():
+        lines.append(f"- **{area}**: {value:.1f} / {MAX_SCORE}" if value is not None else f"- **{area}**: 평가 근거 부족")
+    lines.append(f"- **전체 평균**: {aggregate['overall']:.1f} / {MAX_SCORE} ({aggregate['scored_turns']}개 답변 채점)")
+
+    strongest = max(rated, key=rated.get)
+    weakest = min(rated, key=rated.get)
+    lines.append("")
+    if strongest != weakest:
+        lines.append(f"**강점**: {strongest} / **보완할 점**: {weakest}")
+
+    comments = [entry for entry in turn_scores if entry.get("comment")]
+    if comments:
+        lines.append("")
+        lines.append("**답변별 평가**")
+        for entry in comments:
+            lines.append(f"{entry['turn']}. {entry['comment']}")
+    if basic_feedback:
+        lines.append("")
+        lines.append(f"**답변 습관**: {basic_feedback}")
+    return "\n".join(lines)